@@ -1,2 +1,2 @@
 __all__ = ['gbif_extra', 'phylosophos_core', 'phylosophos_initialize_update', 
-'ps_analsis', 'ps_initialize', 'ps_update']
+'ps_analsis', 'ps_benchmark', 'ps_cache', 'ps_changelog', 'ps_index', 'ps_initialize', 'ps_mapper', 'ps_normalize', 'ps_profile', 'ps_progress', 'ps_server', 'ps_snapshot', 'ps_update']
@@ -18,11 +18,11 @@ import numpy
 import os
 import ssl
 import sys
-import tarfile
-import zipfile
 
 from urllib import request
 
+from phylosophos import ps_initialize, ps_progress, ps_update
+
 ####
 
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -46,23 +46,13 @@ def gbif_tax_update(ustat, fdir, rdir):
 		else:
 			print("## GBIF taxonomy file found in local system")
 
-	# Unzip & processing step
-
-	try:
-		os.makedirs(fdir+"gbif_taxdump")
-	except:
-		pass
-	gbif_tar = zipfile.ZipFile(fdir+tar_gbif_file)
-	gbif_tar.extractall(path=fdir+"gbif_taxdump\\")
-	gbif_tar.close()
-	print("## GBIF taxonomy file unzip successful")
-
-	# Extraction step
+	# Extraction step (Taxon.tsv is read straight from the archive)
 
 	taxid_raw = {}
 	accepted_names = {}
+	taxid_progress = ps_progress.progress_start("## GBIF taxonomy node extraction")
 
-	with open(fdir+"gbif_taxdump\\"+"Taxon.tsv", encoding="UTF-8", errors='ignore') as inp_f:
+	for tar_member, inp_f in ps_update.archive_member_lines(fdir+tar_gbif_file, ["Taxon.tsv"], encoding="UTF-8", errors='ignore'):
 		inp_f.readline()
 		for line in inp_f:
 			ssl = line.rstrip('\n').split('\t')
@@ -83,9 +73,9 @@ def gbif_tax_update(ustat, fdir, rdir):
 			if ssl[14] == "accepted":
 				accepted_names[taxid_raw[ssl[0]][3]] = ssl[0]
 			#
-			if len(taxid_raw) % 1000 == 0:
-				print(ssl[0], ssl[7][0:min(20, len(ssl[7]))], "        ", end='\r')
+			ps_progress.progress_update(taxid_progress, len(taxid_raw), ssl[7])
 
+	ps_progress.progress_end(taxid_progress)
 	print("## GBIF taxonomy node extraction completed", len(taxid_raw), len(accepted_names),  "        ")
 	taxid_key = list(taxid_raw.keys())
 
@@ -95,8 +85,10 @@ def gbif_tax_update(ustat, fdir, rdir):
 	taxid_parent_dict = {}
 	taxid_genus_dict = {}
 	taxid_temp = {}
+	taxid_progress = ps_progress.progress_start("## GBIF taxonomy node classification", len(taxid_key))
 
 	for i_1 in range(len(taxid_key)):
+		ps_progress.progress_update(taxid_progress, i_1+1, taxid_key[i_1])
 		if len(taxid_raw[taxid_key[i_1]][3]) >= 1:
 			taxid_temp[taxid_raw[taxid_key[i_1]][0]] = taxid_raw[taxid_key[i_1]][3]
 			if taxid_raw[taxid_key[i_1]][4] == "accepted":
@@ -113,44 +105,40 @@ def gbif_tax_update(ustat, fdir, rdir):
 				if taxid_raw[taxid_key[i_1]][2] not in taxid_names_dict:
 					taxid_names_dict[taxid_raw[taxid_key[i_1]][2]] = ["", []]
 				taxid_names_dict[taxid_raw[taxid_key[i_1]][2]][1].append(taxid_raw[taxid_key[i_1]][3])
-				print(i_1, taxid_key[i_1], "        ", end='\r')
 
+	ps_progress.progress_end(taxid_progress)
 	print("## GBIF taxonomy node classification completed", len(taxid_names_dict), "                                ")
 	names_key = list(taxid_names_dict.keys())
 
+	taxid_level_code = {"root":1, "kingdom":2, "phylum":3, "class":4, "order":5, "family":6, "genus":7, "species":8}
+
+	def taxid_level(node_id):
+		if taxid_raw[node_id][5] in taxid_level_code:
+			return taxid_level_code[taxid_raw[node_id][5]]
+		return 0
+
+	def taxid_step(node_id): # The walk ends at the root "-" (rank code 2 for the topmost node, 1 for the root)
+		if taxid_raw[node_id][1] == "":
+			return [[node_id, "-"], [2, 1], None]
+		return [[node_id], [taxid_level(node_id)], taxid_raw[node_id][1]]
+
+	lineage_dict = {}
+	taxid_progress = ps_progress.progress_start("## GBIF taxonomy lineage", len(names_key))
+
 	for i_2 in range(len(names_key)):
 		#
 		if taxid_names_dict[names_key[i_2]][0] == "":
 			taxid_names_dict[names_key[i_2]][0] += taxid_temp[names_key[i_2]]
 		#
-		taxid_level_code = {"root":1, "kingdom":2, "phylum":3, "class":4, "order":5, "family":6, "genus":7, "species":8}
-		par_sub = [[taxid_raw[names_key[i_2]][0]], [0]]
-		if taxid_raw[names_key[i_2]][5] in taxid_level_code:
-			par_sub[1][-1] += taxid_level_code[taxid_raw[names_key[i_2]][5]]
-		#
 		if names_key[i_2] == "-":
-			taxid_parent_dict[names_key[i_2]] = par_sub
-			taxid_parent_dict[names_key[i_2]][1].append(1)
-			print(i_2, names_key[i_2], taxid_raw[names_key[i_2]][3][:min(40, len(taxid_raw[names_key[i_2]][3]))], "                ", end='\r')
-			pass
+			par_sub = ["-", "1", max(taxid_level("-"), 1)]
 		else:
-			p_det = 0
-			while p_det < 1:
-				if taxid_raw[par_sub[0][-1]][1] == "":
-					par_sub[0].append("-")
-					par_sub[1].append(2)
-					p_det += 1
-				else:
-					if taxid_raw[par_sub[0][-1]][5] in taxid_level_code:
-						par_sub[1].append(taxid_level_code[taxid_raw[par_sub[0][-1]][5]])
-					else:
-						par_sub[1].append(0)
-					par_sub[0].append(taxid_raw[par_sub[0][-1]][1])
-			par_sub[1].append(1)
-			taxid_parent_dict[names_key[i_2]] = par_sub
-			print(i_2, names_key[i_2], taxid_raw[names_key[i_2]][3][:min(40, len(taxid_raw[names_key[i_2]][3]))], "                ", end='\r')
+			par_sub = ps_update.lineage_memo(names_key[i_2], taxid_step, lineage_dict)
+			par_sub = [par_sub[0], par_sub[1], max(par_sub[2], taxid_level(names_key[i_2]))]
+		taxid_parent_dict[names_key[i_2]] = par_sub
+		ps_progress.progress_update(taxid_progress, i_2+1, taxid_raw[names_key[i_2]][3])
 		#
-		if max(par_sub[1]) >= 2:
+		if par_sub[2] >= 2:
 			ssl = []
 			if len(taxid_names_dict[names_key[i_2]][0]) >= 1:
 				ssl.append(taxid_names_dict[names_key[i_2]][0].split()[0])
@@ -162,6 +150,7 @@ def gbif_tax_update(ustat, fdir, rdir):
 					taxid_genus_dict[ssl[i_4]] = []
 				taxid_genus_dict[ssl[i_4]].append(names_key[i_2])
 
+	ps_progress.progress_end(taxid_progress)
 	print("## GBIF taxonomy parent mapping completed",  "        ")
 
 	#
@@ -175,8 +164,8 @@ def gbif_tax_update(ustat, fdir, rdir):
 			res_f.write(taxid_names_dict[names_key[i_3]][0] + '\t')
 			res_f.write('|'.join(taxid_names_dict[names_key[i_3]][1]) + '\t')
 			res_f.write(taxid_raw[names_key[i_3]][5] + '\t')
-			res_f.write('|'.join(taxid_parent_dict[names_key[i_3]][0]) + '\t')
-			res_f.write('|'.join([str(j) for j in taxid_parent_dict[names_key[i_3]][1]][1:]) + '\n')
+			res_f.write(taxid_parent_dict[names_key[i_3]][0] + '\t')
+			res_f.write(taxid_parent_dict[names_key[i_3]][1] + '\n')
 
 	genus_key = list(taxid_genus_dict.keys())
 
@@ -201,6 +190,7 @@ def gbif_update():
 	
 	update_stat = int(sys.argv[1])
 	gbif_tax_update(update_stat, ef_path, pp_path)
+	ps_initialize.phylosophos_snapshot_build(pp_path)
 
 
 
@@ -25,7 +25,7 @@ import sys
 
 ## CUSTOM LIBRARIES
 
-from phylosophos import ps_analysis, ps_initialize
+from phylosophos import ps_analysis, ps_cache, ps_index, ps_initialize
 
 #### GLOBAL PARAMETERS
 
@@ -41,20 +41,31 @@ def phylosophos():
 
 	# Initialization
 
-	ref_type, input_type, input_file_name, default_cutoff, mc_stat = ps_initialize.phylosophos_initialization(sys.argv)
+	ref_type, input_type, input_file_name, default_cutoff, mc_stat, job_count, cache_size, resume_file, remap_file, profile_stat = ps_initialize.phylosophos_initialization(sys.argv)
 
 	# Input files import
 
-	input_list = ps_initialize.phylosophos_input_import(input_type, input_file_name)
+	input_list = []
+	if len(remap_file) == 0:
+		input_list = ps_initialize.phylosophos_input_import(input_type, input_file_name)
 
 	# Reference files import
 
 	tax_ref_list, ref_names_dict, ref_genus_dict, ref_raw_names = ps_initialize.phylosophos_ref_import(ref_path)
+	ref_index_dict = ps_index.phylosophos_index_build(tax_ref_list, ref_names_dict, ref_genus_dict, ref_raw_names, default_cutoff)
+
+	map_cache = ps_cache.cache_load(ref_path, tax_ref_list, cache_size)
 
 	# Core analysis & export
 
-	for i_1 in input_list:
-		ps_analysis.phylosophos_core_analysis(i_1, tax_ref_list, ref_names_dict, ref_genus_dict, ref_raw_names, ref_type, default_cutoff, mc_stat)
+	if len(remap_file) >= 1:
+		ps_analysis.phylosophos_remap_analysis(remap_file, tax_ref_list, ref_names_dict, ref_genus_dict, ref_raw_names, ref_index_dict, ref_type, default_cutoff, mc_stat, job_count, map_cache, profile_stat)
+	else:
+		for i_1 in input_list:
+			ps_analysis.phylosophos_core_analysis(i_1, tax_ref_list, ref_names_dict, ref_genus_dict, ref_raw_names, ref_index_dict, ref_type, default_cutoff, mc_stat, job_count, map_cache, resume_file, profile_stat)
+
+	ps_cache.cache_report(map_cache)
+	ps_cache.cache_save(ref_path, map_cache)
 
 	#
 
@@ -17,6 +17,7 @@
 ## Base library
 
 import datetime
+import multiprocessing
 import numpy
 import os
 import ssl
@@ -28,14 +29,54 @@ from urllib import request
 
 ## Custom library
 
-from phylosophos import ps_update
-
-#### Function definition
+from phylosophos import ps_changelog, ps_initialize, ps_progress, ps_update
 
 #### Global path parameters
 
 ef_path = "external_files\\"
 pp_path = "pp_ref\\"
+col_file_name = "latest_dwca.zip" # Change it as appropriate
+eol_file_name = "dhv21.zip" # Change it as appropriate
+
+#### Function definition
+
+def reference_build(build_args): # Runs one reference builder; returns [reference type, elapsed time, error message]
+	ref_type, update_stat, ef_dir, pp_dir, build_parallel = build_args
+	if build_parallel == True: # Progress lines of concurrent builders must not overwrite each other
+		ps_progress.progress_mode = "log"
+	time_start = datetime.datetime.now()
+	try:
+		if ref_type == "ncbi":
+			ps_update.ncbi_tax_update_new(update_stat, ef_dir, pp_dir)
+		elif ref_type == "col":
+			ps_update.col_tax_update_new(update_stat, ef_dir, pp_dir, col_file_name)
+		elif ref_type == "eol":
+			ps_update.eol_tax_update_new(update_stat, ef_dir, pp_dir, eol_file_name)
+	except Exception as build_err:
+		return [ref_type, datetime.datetime.now()-time_start, repr(build_err)]
+	return [ref_type, datetime.datetime.now()-time_start, ""]
+
+def reference_build_all(ref_list, update_stat, ef_dir, pp_dir, build_parallel):
+	time_start = datetime.datetime.now()
+	build_args = [[j, update_stat, ef_dir, pp_dir, build_parallel] for j in ref_list]
+	build_res = {}
+	if build_parallel == True: # One process per reference: downloads & parsing of different references overlap
+		with multiprocessing.Pool(len(build_args)) as build_pool:
+			for rba_1 in build_pool.imap_unordered(reference_build, build_args):
+				build_res[rba_1[0]] = rba_1
+				print("## Reference build finished:", rba_1[0], rba_1[1])
+	else:
+		for rba_2 in build_args:
+			build_res[rba_2[0]] = reference_build(rba_2)
+
+	print("#### Reference build summary ####")
+	for rba_3 in ref_list:
+		if len(build_res[rba_3][2]) == 0:
+			print("##", rba_3, build_res[rba_3][1], "completed")
+		else:
+			print("##", rba_3, build_res[rba_3][1], "- ERROR OCCURRED:", build_res[rba_3][2])
+	print("## Total elapsed time:", datetime.datetime.now()-time_start, "(parallel)" if build_parallel == True else "(serial)")
+	return build_res
 
 #### Main part
 
@@ -44,9 +85,15 @@ def initialize_update():
 
 	# Parameter setup
 	update_stat = 0
-	if len(sys.argv) >= 2:
-		if int(sys.argv[1]) != 0:
-			update_stat += 1
+	build_parallel = False
+	build_changelog = False
+	for iu_1 in sys.argv[1:]:
+		if iu_1.lower() in ["-p", "-parallel"]:
+			build_parallel = True
+		elif iu_1.lower() in ["-changelog"]:
+			build_changelog = True
+		elif int(iu_1) != 0:
+			update_stat = 1
 
 	# Path setup
 	if "external_files" not in os.listdir(base_path):
@@ -69,11 +116,11 @@ def initialize_update():
 
 	# Archiving previous dictionary
 	pdir_flist = os.listdir(base_path + pp_path)
+	prev_path = ""
+	update_stamp = ps_changelog.changelog_stamp(base_path + pp_path) # yymmdd; a later update of the same day gets yymmdd-2, ...
 	if len(pdir_flist) > 1:
-		prev_path = ""
-		if str(datetime.datetime.now())[2:10].replace("-", "") not in os.listdir(base_path + pp_path + "previous\\"):
-			os.mkdir(base_path + pp_path + "previous\\" + str(datetime.datetime.now())[2:10].replace("-", ""))
-		prev_path = base_path + pp_path + "previous\\" + str(datetime.datetime.now())[2:10].replace("-", "") + "\\"
+		os.mkdir(base_path + pp_path + "previous\\" + update_stamp)
+		prev_path = base_path + pp_path + "previous\\" + update_stamp + "\\"
 		for i_1 in range(len(pdir_flist)):
 			if "_dict.txt" in pdir_flist[i_1]:
 				os.rename(base_path + pp_path + pdir_flist[i_1], prev_path + pdir_flist[i_1])
@@ -82,9 +129,18 @@ def initialize_update():
 		print("#### No previous reference files found: initialize ####")
 
 	# Update protocol
-	ps_update.ncbi_tax_update_new(update_stat, base_path+ef_path, base_path+pp_path)
-	ps_update.col_tax_update_new(update_stat, base_path+ef_path, base_path+pp_path, "latest_dwca.zip") # Change it as appropriate
-	ps_update.eol_tax_update_new(update_stat, base_path+ef_path, base_path+pp_path, "dhv21.zip") # Change it as appropriate
+	build_res = reference_build_all(["ncbi", "col", "eol"], update_stat, base_path+ef_path, base_path+pp_path, build_parallel)
+
+	# Unchanged references are kept as they were (with their snapshots); changelog of the differences if requested
+	if len(prev_path) >= 1:
+		for iu_2 in ["ncbi", "col", "eol"]:
+			if len(build_res[iu_2][2]) == 0:
+				ps_changelog.reference_keep(prev_path, base_path+pp_path, iu_2)
+				if build_changelog == True:
+					ps_changelog.reference_changelog(prev_path, base_path+pp_path, iu_2, update_stamp)
+
+	# Reference snapshot compilation
+	ps_initialize.phylosophos_snapshot_build(base_path+pp_path)
 
 
 
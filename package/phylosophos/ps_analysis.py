@@ -14,43 +14,182 @@
 
 #### Library import
 
+import copy
 import datetime
 import gc
+import heapq
 import itertools
+import multiprocessing
 import numpy
 import os
 import sys
 
+from phylosophos import ps_cache, ps_changelog, ps_index, ps_normalize, ps_profile, ps_progress
+
 #### Preset parameters
 
 alpha_numeric = {"a":0, "b":1, "c":2, "d":3, "e":4, "f":5, "g":6, "h":7, "i":8, "j":9, 
 "k":10, "l":11, "m":12, "n":13, "o":14, "p":15, "q":16, "r":17, "s":18, "t":19, 
 "u":20, "v":21, "w":22, "x":23, "y":24, "z":25}
 
+lev_batch_min = 16 # Candidate lists shorter than this are compared one pair at a time
+lev_batch_chunk = 4096 # Maximum number of candidates per padded matrix
+
+map_chunk_max = 256 # Maximum number of names sent to a mapping worker at once
+map_shared = [] # Reference data of the current parallel run (inherited by forked workers)
+
+input_chunk_size = 10000 # Input names mapped & written to the result file at once
+latin_expansion_max = 128 # Maximum number of Latin inflection combinations tried per input name
+
+mapping_status_dict = {
+"0":"Raw / Exact DB / Canonical match", 
+"1":"Raw / Exact DB / Synonym match", 
+"2":"Raw / Exact DB / Multiple match", 
+"3":"Simple corrected / Exact DB / Canonical match", 
+"4":"Simple corrected / Exact DB / Synonym match", 
+"5":"Simple corrected / Exact DB / Multiple match", 
+"6":"Recursive / Single match", 
+"8":"Recursive / Multiple match", 
+"10":"Recursive / Nearest match / Species level", 
+"11":"Recursive / Nearest match / Genus level", 
+"12":"Recursive / Nearest match / Family level", 
+"13":"Recursive / Nearest match / Class level", 
+"14":"Recursive / Nearest match / Order level", 
+"15":"Recursive / Nearest match / Phylum level", 
+"16":"Recursive / Nearest match / Kingdom level", 
+"17":"Recursive / Nearest match / Domain level", 
+"20":"Specific epithet corrected / Exact DB / Single match", 
+"21":"Specific epithet corrected / Exact DB / Multiple match", 
+"22":"Specific epithet corrected / Recursive / Single match", 
+"23":"Specific epithet corrected / Recursive / Multiple match", 
+"24":"Specific epithet corrected / Recursive / Nearest match", 
+"30":"Latin inflection corrected / Exact DB / Single match", 
+"31":"Latin inflection corrected / Exact DB / Nearest match", 
+"32":"Generic epithet corrected / Exact DB / Single match",
+"33":"Generic epithet corrected / Exact DB / Multiple match",
+"34":"Generic epithet corrected / Recursive / Single match",
+"35":"Generic epithet corrected / Recursive / Multiple match",
+"36":"Generic epithet corrected / Recursive / Nearest match",
+"40":"Correction denied / Strain name involved / Nearest match",
+"41":"Correction denied / Similarity-related abbreviation identified / Nearest match",
+"90":"Rule-based screening / Non-organism", 
+"91":"Rule-based screening / Unclassified-Uncultured-Unidentified", 
+"92":"Rule-based screening / Environmental sample", 
+"93":"Rule-based screening / Virus or phage - manual check required", 
+"94":"Rule-based screening / Phytoplasma - manual check required", 
+"95":"Rule-based screening / (endo)symbiont - manual check required", 
+"96":"Rule-based screening / Unresolvable hybrid - manual check required", 
+"97":"Rule-based screening / Multiple materia medica - manual check required", 
+"100":"Unmapped / partial match (most likely genus level)",  
+"1000":"Unmapped"
+}
+
 #### Function definition
 
+## Candidate list function
+#
+# Sorted, de-duplicated copy of a short list of names or node IDs, in the same order as numpy.unique
+# but without the round trip through a unicode array, and with plain str elements (faster dict keys downstream).
+
+def candidate_list(items):
+	return sorted(set(items))
+
 ## String correction functions
 
-def lev_dist(string_1, string_2, cut_dist): # Damerau-Levenshtein distance
+def lev_dist(string_1, string_2, cut_dist): # Damerau-Levenshtein distance (cutoff-banded)
+	# Parameter setup
+	dl_xlen = len(string_1)+1
+	dl_ylen = len(string_2)+1
+	if dl_xlen == 1 or dl_ylen == 1:
+		return dl_xlen+dl_ylen-2
+	if cut_dist < 0:
+		return max(dl_xlen, dl_ylen)
+	dl_cap = cut_dist+1 # Every cell value above cut_dist is stored as dl_cap
+	# Row 0 & row 1 (full width: row 1 reads the last row through index -1, as lev_dist_full does)
+	dl_row_2 = [min(j, dl_cap) for j in range(dl_ylen)]
+	dl_row_1 = [dl_cap]*dl_ylen
+	dl_row_1[0] = min(1, dl_cap)
+	for dl_4 in range(1, dl_ylen):
+		if string_1[0] == string_2[dl_4-1]:
+			dl_val = min(dl_row_2[dl_4-1], dl_row_2[dl_4]+1, dl_row_1[dl_4-1]+1)
+		elif string_1[-1] == string_2[dl_4-1] and string_1[0] == string_2[dl_4-2]:
+			dl_wrap = 0
+			if dl_4 >= 2 and dl_xlen == 2:
+				dl_wrap = dl_row_1[dl_4-2]
+			elif dl_4 == 2:
+				dl_wrap = min(dl_xlen-1, dl_cap)
+			dl_val = min(dl_wrap+1, dl_row_2[dl_4]+1, dl_row_1[dl_4-1]+1)
+		else:
+			dl_val = min(dl_row_2[dl_4-1], dl_row_2[dl_4], dl_row_1[dl_4-1])+1
+		dl_row_1[dl_4] = min(dl_val, dl_cap)
+	dl_band_2 = [0, min(dl_ylen-1, cut_dist)]
+	dl_band_1 = [-1, -1]
+	for dl_4 in range(dl_ylen):
+		if dl_row_1[dl_4] < dl_cap:
+			if dl_band_1[0] < 0:
+				dl_band_1[0] = dl_4
+			dl_band_1[1] = dl_4
+	# Score calculation (cells within the cutoff band only)
+	for dl_3 in range(2, dl_xlen):
+		if dl_band_1[0] < 0:
+			if dl_3 < dl_ylen:
+				return max(dl_xlen, dl_ylen) # Early termination
+			return lev_dist_full(string_1, string_2, cut_dist)
+		dl_lo = max(dl_band_1[0], 1)
+		dl_hi = dl_band_1[1]+1
+		if dl_band_2[0] >= 0:
+			dl_lo = min(dl_lo, dl_band_2[0]+2)
+			dl_hi = max(dl_hi, dl_band_2[1]+2)
+		if dl_3 < cut_dist or dl_row_2[-1] < cut_dist:
+			dl_lo = 1
+		dl_row_0 = [dl_cap]*dl_ylen
+		dl_row_0[0] = min(dl_3, dl_cap)
+		dl_band_0 = [-1, -1]
+		if dl_3 < dl_cap:
+			dl_band_0[:] = [0, 0]
+		dl_char_1 = string_1[dl_3-1]
+		dl_char_2 = string_1[dl_3-2]
+		dl_4 = dl_lo
+		while dl_4 < dl_ylen and (dl_4 <= dl_hi or dl_row_0[dl_4-1] < cut_dist):
+			if dl_char_1 == string_2[dl_4-1]:
+				dl_val = min(dl_row_1[dl_4-1], dl_row_1[dl_4]+1, dl_row_0[dl_4-1]+1)
+			elif dl_char_2 == string_2[dl_4-1] and dl_char_1 == string_2[dl_4-2]:
+				dl_val = min(dl_row_2[dl_4-2]+1, dl_row_1[dl_4]+1, dl_row_0[dl_4-1]+1)
+			else:
+				dl_val = min(dl_row_1[dl_4-1], dl_row_1[dl_4], dl_row_0[dl_4-1])+1
+			if dl_val < dl_cap:
+				dl_row_0[dl_4] = dl_val
+				if dl_band_0[0] < 0:
+					dl_band_0[0] = dl_4
+				dl_band_0[1] = dl_4
+			dl_4 += 1
+		dl_row_2, dl_row_1 = dl_row_1, dl_row_0
+		dl_band_2, dl_band_1 = dl_band_1, dl_band_0
+	# return value
+	if dl_row_1[-1] <= cut_dist:
+		return dl_row_1[-1]
+	return lev_dist_full(string_1, string_2, cut_dist)
+
+def lev_dist_full(string_1, string_2, cut_dist): # Damerau-Levenshtein distance (full matrix)
 	# Parameter setup
 	dl_xlen = len(string_1)+1
 	dl_ylen = len(string_2)+1
 	dl_det = 0 # Status determinant for early termination
 	# Matrix setup
-	dl_matrix = numpy.zeros((dl_xlen, dl_ylen))
+	dl_matrix = [[0 for j in range(dl_ylen)] for k in range(dl_xlen)]
 	for dl_1 in range(dl_xlen):
-		dl_matrix[dl_1, 0] = dl_1
+		dl_matrix[dl_1][0] = dl_1
 	for dl_2 in range(dl_ylen):
-		dl_matrix[0, dl_2] = dl_2
+		dl_matrix[0][dl_2] = dl_2
 	# Score calculation
 	for dl_3 in range(1, dl_xlen):
 		for dl_4 in range(1, dl_ylen):
 			if string_1[dl_3-1] == string_2[dl_4-1]:
-				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-1, dl_4-1], dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+				dl_matrix[dl_3][dl_4] = min(dl_matrix[dl_3-1][dl_4-1], dl_matrix[dl_3-1][dl_4]+1, dl_matrix[dl_3][dl_4-1]+1)
 			elif string_1[dl_3-2] == string_2[dl_4-1] and string_1[dl_3-1] == string_2[dl_4-2]:
-				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-2, dl_4-2]+1, dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+				dl_matrix[dl_3][dl_4] = min(dl_matrix[dl_3-2][dl_4-2]+1, dl_matrix[dl_3-1][dl_4]+1, dl_matrix[dl_3][dl_4-1]+1)
 			else:
-				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-1, dl_4-1]+1, dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+				dl_matrix[dl_3][dl_4] = min(dl_matrix[dl_3-1][dl_4-1]+1, dl_matrix[dl_3-1][dl_4]+1, dl_matrix[dl_3][dl_4-1]+1)
 			#
 			if dl_3 == dl_4 and min(dl_matrix[dl_3-1]) > cut_dist:
 				dl_det += 1
@@ -61,7 +200,92 @@ def lev_dist(string_1, string_2, cut_dist): # Damerau-Levenshtein distance
 	if dl_det >= 1:
 		return max(dl_xlen, dl_ylen)
 	else:
-		return int(dl_matrix[dl_xlen-1, dl_ylen-1])
+		return dl_matrix[dl_xlen-1][dl_ylen-1]
+
+def lev_dist_batch(string_1, string_2, cut_dist): # Damerau-Levenshtein distance (one-to-many, vectorized)
+	# Parameter setup: either argument may be a single string, which is compared against every candidate
+	if isinstance(string_1, str) and isinstance(string_2, str):
+		ps_profile.profile_count(1)
+		return [lev_dist(string_1, string_2, cut_dist)]
+	elif isinstance(string_1, str):
+		dl_pairs = [[string_1, j] for j in string_2]
+	elif isinstance(string_2, str):
+		dl_pairs = [[j, string_2] for j in string_1]
+	else:
+		dl_pairs = [[string_1[j], string_2[j]] for j in range(len(string_1))]
+	ps_profile.profile_count(len(dl_pairs))
+	dl_res = [0 for j in dl_pairs]
+	dl_vector = []
+	for dl_1 in range(len(dl_pairs)):
+		if len(dl_pairs[dl_1][0]) <= 1 or len(dl_pairs[dl_1][1]) == 0: # Degenerate shapes: scalar version
+			dl_res[dl_1] = lev_dist(dl_pairs[dl_1][0], dl_pairs[dl_1][1], cut_dist)
+		else:
+			dl_vector.append(dl_1)
+	if len(dl_vector) < lev_batch_min:
+		for dl_1 in dl_vector:
+			dl_res[dl_1] = lev_dist(dl_pairs[dl_1][0], dl_pairs[dl_1][1], cut_dist)
+		return dl_res
+	# Vectorized calculation (chunked to bound the padded matrix size)
+	for dl_2 in range(0, len(dl_vector), lev_batch_chunk):
+		dl_sub = dl_vector[dl_2:dl_2+lev_batch_chunk]
+		dl_sub_res = lev_dist_vector([dl_pairs[j][0] for j in dl_sub], [dl_pairs[j][1] for j in dl_sub], cut_dist)
+		for dl_3 in range(len(dl_sub)):
+			dl_res[dl_sub[dl_3]] = int(dl_sub_res[dl_3])
+	return dl_res
+
+def lev_dist_vector(list_1, list_2, cut_dist): # lev_dist over aligned string lists (len(list_1[k]) >= 2, len(list_2[k]) >= 1)
+	# Padded code-point matrices
+	dl_x = numpy.array(list_1).view(numpy.uint32).reshape(len(list_1), -1).astype(numpy.int64)
+	dl_y = numpy.array(list_2).view(numpy.uint32).reshape(len(list_2), -1).astype(numpy.int64)
+	dl_xlen = numpy.array([len(j) for j in list_1])
+	dl_ylen = numpy.array([len(j) for j in list_2])
+	dl_count = len(list_1)
+	dl_rows = numpy.arange(dl_count)
+	dl_ymax = dl_y.shape[1]
+	dl_cols = numpy.arange(dl_ymax+1)
+	dl_valid = dl_cols[None, :] <= dl_ylen[:, None]
+	dl_big = dl_xlen.max()+dl_ymax+2
+	# Shifted candidate characters (string_2[dl_4-2], including the index -1 wraparound at dl_4 == 1)
+	dl_y_prev = numpy.empty_like(dl_y)
+	dl_y_prev[:, 1:] = dl_y[:, :-1]
+	dl_y_prev[:, 0] = dl_y[dl_rows, dl_ylen-1]
+	# Row 0 & row 1 wraparound values (row -1 is the unfilled last row: only its column 0 is set)
+	dl_row_1 = numpy.tile(dl_cols, (dl_count, 1))
+	dl_row_2 = numpy.zeros((dl_count, dl_ymax+1), dtype=numpy.int64)
+	if dl_ymax >= 2:
+		dl_row_2[:, 1] = dl_xlen
+	dl_det = numpy.zeros(dl_count, dtype=bool) # Early termination status
+	dl_final = numpy.zeros(dl_count, dtype=numpy.int64)
+	# Score calculation (one matrix row for every pair at once)
+	for dl_3 in range(1, dl_x.shape[1]+1):
+		dl_check = (dl_3 <= dl_ylen) & (dl_3 <= dl_xlen) & ~dl_det
+		dl_row_min = numpy.where(dl_valid, dl_row_1, dl_big).min(axis=1)
+		dl_det |= dl_check & (dl_row_min > cut_dist)
+		dl_char_1 = dl_x[:, dl_3-1][:, None]
+		if dl_3 >= 2:
+			dl_char_2 = dl_x[:, dl_3-2][:, None]
+			dl_wrap = numpy.empty_like(dl_row_2[:, 1:])
+			dl_wrap[:, 1:] = dl_row_2[:, :-2]
+			dl_wrap[:, 0] = dl_row_2[dl_rows, dl_ylen]
+		else:
+			dl_char_2 = dl_x[dl_rows, dl_xlen-1][:, None]
+			dl_wrap = dl_row_2[:, :-1] # Already aligned to string_2[dl_4-2]
+		dl_match = dl_char_1 == dl_y
+		dl_trans = ~dl_match & (dl_char_2 == dl_y) & (dl_char_1 == dl_y_prev)
+		dl_up = dl_row_1[:, 1:]+1
+		dl_diag = dl_row_1[:, :-1]
+		dl_temp = numpy.where(dl_match, numpy.minimum(dl_diag, dl_up), numpy.where(dl_trans, numpy.minimum(dl_wrap+1, dl_up), numpy.minimum(dl_diag+1, dl_up)))
+		dl_row_0 = numpy.empty_like(dl_row_1)
+		dl_row_0[:, 0] = dl_3
+		dl_row_0[:, 1:] = dl_temp
+		dl_row_0 = numpy.minimum.accumulate(dl_row_0-dl_cols, axis=1)+dl_cols # Insertion (left) moves
+		dl_row_2, dl_row_1 = dl_row_1, dl_row_0
+		dl_end = dl_xlen == dl_3
+		dl_final[dl_end] = dl_row_0[dl_rows[dl_end], dl_ylen[dl_end]]
+		if numpy.all(dl_det | (dl_xlen <= dl_3)):
+			break
+	# return value
+	return numpy.where(dl_det, numpy.maximum(dl_xlen, dl_ylen)+1, dl_final)
 
 def alpha_count(string):
 	lst = string.lower()
@@ -108,31 +332,7 @@ def string_split_correction(string):
 
 def input_correction(string):
 	#
-	ignore_list = ['sp.', 'ssp.', 'genomosp.', 'genosp.', 'subsp.', 'var.', 'str.', 'f.', 'pv.', 'bv.', 's.', 's.l.', 
-	'al.', 'sect.', 'subgen.', 'nom.', 'no.', "species", "var."]
-	dropout_list = ['cf.', 'aff.', 'nr.', 'n.', 's.n.', 'nov.', 'gen.', 'inval.']
-	hybrid_list = ['×', 'x', 'x']
-	#
-	stat_code = [0, 0, 0]
-	tar_temp = []
-	#
-	ssl = string.lower().split()
-	for ic_1 in ssl:
-		if ic_1 in ignore_list:
-			stat_code[0] = 1
-		elif ic_1 in dropout_list:
-			stat_code[1] = 1
-		elif ic_1 in hybrid_list:
-			stat_code[2] = 1
-		elif '.' in ic_1 or ',' in ic_1:
-			if len(ssl) >= 2:
-				continue
-		elif '<' in ic_1 or '>' in ic_1:
-			tar_temp.append(ic_1.split('>')[0].split('<')[0])
-		else:
-			tar_temp.append(ic_1)
-	#
-	tar_str = ' '.join(tar_temp)
+	tar_str, stat_code = ps_normalize.token_correction(string) # Token tables: ps_normalize
 	if "[syn." in tar_str:
 		tar_str = tar_str.split("[syn.")[0].rstrip(' ')
 	#
@@ -140,18 +340,8 @@ def input_correction(string):
 
 def latin_correction(tar_psd):
 	#
-	removed_list = ["bulbus", "carapax", "caulis", "concha", "cortex", "embryo", "exocarpium", ]
-	removed_list.extend(["flos", "folium", "fructus", "herba", "lignum", "ligum", "oleum", "ootheca", "pedicellus"])
-	removed_list.extend(["pericarpium", "pollen", "radix", "rhizoma", "sanguis", "semen", "strobilus"])
-	removed_list.extend(["cum", "et", "radicis", "cornu", "praeparata", "preparata", "succus", "squama"])
-	removed_list.extend(["stigma", "oviductus", "acidum", "fel", "stamen", "pulveratum", "resina", "excrementum"])
-	removed_list.extend(["periostracum", "plumula", "corium", "dens", "extractum", "liquidum", "fossilia", "gummi"])
-	removed_list.extend(["plumula", "massa", "fermentata", "medulla", "nidus", "penis", "corticis", "folii"])
-	removed_list.extend(["nodus", "rhizomatis", "plastrum", "ramulus", "testa", "testis", "exodermis", "germinatus"])
-	removed_list.extend(["arillus", "alburnum", "cacumen", "os", "petiolus", "pix", "pulvis", "spina", "receptaculum"])
-	removed_list.extend(["leaf", "of", "root", "twig", "the", "family", "et", "from"])
-	#
-	drop_list = ['spp.', 'sp.', "ssp", "spp", "sp", 'var.', 'f.', "L", "L.", "(L.)", "Roxb", "Roxb.", "Fr.", "Fr", "DC", "DC."]
+	removed_list = ps_normalize.latin_removed
+	drop_list = ps_normalize.latin_drop
 	#
 	corr_det = 0
 	corr_temp = []
@@ -211,10 +401,32 @@ def latin_correction(tar_psd):
 				corr_list[i_2].append(corr_temp[i_2])
 		return corr_list
 
+def latin_expansion(form_list, budget=None): # Lazy, deduplicated word combinations of latin_correction(); fewest alternative forms first
+	if budget is None:
+		budget = latin_expansion_max
+	le_start = tuple([0 for j in form_list])
+	le_heap = [(0, le_start)]
+	le_seen = set([le_start])
+	le_done = set()
+	while len(le_heap) >= 1 and len(le_done) < budget:
+		le_cost, le_pos = heapq.heappop(le_heap)
+		le_str = ' '.join([form_list[j][le_pos[j]] for j in range(len(form_list))])
+		if le_str not in le_done:
+			le_done.add(le_str)
+			yield le_str
+		for le_1 in range(len(le_pos)):
+			if le_pos[le_1]+1 < len(form_list[le_1]):
+				le_next = le_pos[:le_1] + (le_pos[le_1]+1,) + le_pos[le_1+1:]
+				if le_next not in le_seen:
+					le_seen.add(le_next)
+					heapq.heappush(le_heap, (le_cost+(le_pos[le_1] == 0), le_next)) # Cost = number of words not in their first form
+
 ## Mapping subprocesses
 
-def first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict):
+def first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict, ri_dict=None):
 	#
+	if ri_dict is None:
+		ri_dict = {}
 	tar_str = string.lower()
 	tar_gen = tar_str.split()[0]
 	tar_corr, tar_cstat = input_correction(tar_str)
@@ -238,36 +450,22 @@ def first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict):
 
 	for fb_2 in range(len(tr_list)):
 		if min(fb_stat) < 10 and fb_stat[fb_2] >= 10:
-			syn_sub = []
+			syn_src = []
 			for fb_3 in range(len(tr_list)):
 				if fb_stat[fb_3] == 0:
-					for fb_4 in rr_dict[tr_list[fb_3]][tar_str]:
-						syn_sub.append(rn_dict[tr_list[fb_3]][fb_4][1])
-						ssl_2 = rn_dict[tr_list[fb_3]][fb_4][2].split("|")
-						for fb_5 in ssl_2:
-							if len(fb_5) >= 1 and fb_5 in rn_dict[tr_list[fb_3]][fb_4][1]:
-								syn_sub.append(fb_5)
+					syn_src.append([tr_list[fb_3], rr_dict[tr_list[fb_3]][tar_str]])
 				elif fb_stat[fb_3] == 3:
-					for fb_4 in rr_dict[tr_list[fb_3]][tar_corr]:
-						syn_sub.append(rn_dict[tr_list[fb_3]][fb_4][1])
-						ssl_2 = rn_dict[tr_list[fb_3]][fb_4][2].split("|")
-						for fb_5 in ssl_2:
-							if len(fb_5) >= 1 and fb_5 in rn_dict[tr_list[fb_3]][fb_4][1]:
-								syn_sub.append(fb_5)
-			syn_sub = [j.lower() for j in numpy.unique(syn_sub) if len(j) >= 1]
-			syn_tar = []
-			for fb_5 in syn_sub:
-				if fb_5 in rr_dict[tr_list[fb_2]]:
-					syn_tar.extend(rr_dict[tr_list[fb_2]][fb_5])
-					fb_stat[fb_2] = 6
+					syn_src.append([tr_list[fb_3], rr_dict[tr_list[fb_3]][tar_corr]])
+			syn_tar = ps_index.bridge_match(ri_dict, rn_dict, rr_dict, syn_src, tr_list[fb_2])
 			if len(syn_tar) >= 1:
 				fb_match[fb_2][:] = syn_tar
+				fb_stat[fb_2] = 6
 	
 	# Clearance & return
 
 	for fb_7 in range(len(tr_list)):
 		if len(fb_match[fb_7]) >= 2:
-			fb_match[fb_7][:] = list(numpy.unique(fb_match[fb_7]))
+			fb_match[fb_7][:] = candidate_list(fb_match[fb_7])
 		#
 		if len(fb_match[fb_7]) == 1:
 			if fb_stat[fb_7] == 0:
@@ -290,64 +488,48 @@ def first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict):
 
 def lowest_taxon_match(prev_map, prev_stat, tr_list, rn_dict, rr_dict):
 	#
-	broad_type = {
-	"|R|": "Archaea", "|B6LM6|": "Bacteria", "|F|": "Fungi", "|N|": "Metazoa", "|P|": "Plant", 
-	"|EOL-000000024748|": "Archaea", "|EOL-000000000003|": "Bacteria", "|EOL-000002172573|": "Fungi", "|EOL-000000541397|": "Metazoa", "|EOL-000000097815|": "Plant", 
-	"|2|-": "Archaea", "|3|": "Bacteria", "|5|": "Fungi", "|1|": "Metazoa", "|6|": "Plant", 
-	"|2157|": "Archaea", "|2|131567|": "Bacteria", "|4751|": "Fungi", "|33208|": "Metazoa", "|33090|": "Plant"
-	}
+	# Broad group, highest rank code & lineage name keys of each node come precomputed from the node table (ps_snapshot);
+	# the lineage overlap of every candidate with the exact matches is counted in one vectorized pass over name keys
 	#
 	lt_match = [[] for j in tr_list]
 	lt_stat = [j for j in prev_stat]
 	#
 	for ltm_1 in range(len(tr_list)):
 		if prev_stat[ltm_1] >= 10:
-			match_type_r = "(others)"
-			match_r_list = []
+			match_type_r = 0 # (others)
+			match_r_keys = numpy.zeros(0, dtype=numpy.uint64)
 			#
 			for ltm_2 in range(len(tr_list)):
 				if prev_stat[ltm_2] < 5: # Accept exact match only
 					#
 					for ltm_3 in prev_map[ltm_2]:
-						phylo_tree = rn_dict[tr_list[ltm_2]][ltm_3][4].split("|")
-						phylo_rank = [int(j) for j in rn_dict[tr_list[ltm_2]][ltm_3][5].split("|")]
-						for ltm_11 in broad_type:
-							if ltm_11 in rn_dict[tr_list[ltm_2]][ltm_3][4] and match_type_r == "(others)":
-								match_type_r = broad_type[ltm_11]
-								for ltm_12 in phylo_tree:
-									if ltm_12 in rn_dict[tr_list[ltm_2]]:
-										match_r_list.append(rn_dict[tr_list[ltm_2]][ltm_12][1].lower())
-								break
+						phylo_profile = rn_dict[tr_list[ltm_2]].profile(ltm_3)
+						if phylo_profile[0] != 0 and match_type_r == 0:
+							match_type_r = phylo_profile[0]
+							match_r_keys = phylo_profile[3]
 			#
 			ltm_sub = {}
 			ltm_depth = {}
+			ltm_cand = []
 			for ltm_2 in prev_map[ltm_1]:
-				phylo_tree = rn_dict[tr_list[ltm_1]][ltm_2][4].split("|")
-				phylo_rank = [int(j) for j in rn_dict[tr_list[ltm_1]][ltm_2][5].split("|")]
-				match_type_c = "(others)"
-				for ltm_12 in broad_type:
-					if ltm_12 in rn_dict[tr_list[ltm_1]][ltm_2][4]:
-						match_type_c = broad_type[ltm_12]
-						break
-				if match_type_c == match_type_r:
-					ltm_sub[ltm_2] = max(phylo_rank)
-					phylo_tree_names = []
-					phylo_score = 0
-					for ltm_13 in phylo_tree:
-						if ltm_13 in rn_dict[tr_list[ltm_1]]:
-							phylo_tree_names.append(rn_dict[tr_list[ltm_1]][ltm_13][1].lower())
-					for ltm_14 in phylo_tree_names:
-						if ltm_14 in match_r_list:
-							phylo_score += 1
-					ltm_depth[ltm_2] = phylo_score
+				phylo_profile = rn_dict[tr_list[ltm_1]].profile(ltm_2)
+				if phylo_profile[0] == match_type_r:
+					ltm_sub[ltm_2] = phylo_profile[1]
+					ltm_cand.append([ltm_2, phylo_profile[3]])
+			if len(ltm_cand) >= 1:
+				phylo_hit = numpy.isin(numpy.concatenate([j[1] for j in ltm_cand]), match_r_keys)
+				phylo_start = numpy.cumsum([0]+[len(j[1]) for j in ltm_cand[:-1]])
+				phylo_score = numpy.add.reduceat(phylo_hit.astype(numpy.int32), phylo_start) if len(phylo_hit) >= 1 else [0 for j in ltm_cand]
+				for ltm_4 in range(len(ltm_cand)):
+					ltm_depth[ltm_cand[ltm_4][0]] = int(phylo_score[ltm_4])
 			#
 			if len(ltm_sub) == 0:
 				for ltm_10 in prev_map[ltm_1]:
-					ltm_sub[ltm_10] = max([int(j) for j in rn_dict[tr_list[ltm_1]][ltm_10][5].split("|")])
+					ltm_sub[ltm_10] = rn_dict[tr_list[ltm_1]].profile(ltm_10)[1]
 					ltm_depth[ltm_10] = 0
 			elif max(ltm_sub.values()) < 7 and len(prev_map[ltm_1]) >= 1:
 				for ltm_10 in prev_map[ltm_1]:
-					ltm_sub[ltm_10] = max([int(j) for j in rn_dict[tr_list[ltm_1]][ltm_10][5].split("|")])
+					ltm_sub[ltm_10] = rn_dict[tr_list[ltm_1]].profile(ltm_10)[1]
 					ltm_depth[ltm_10] = 0
 			#
 			if len(ltm_sub) >= 1:
@@ -370,61 +552,17 @@ def lowest_taxon_match(prev_map, prev_stat, tr_list, rn_dict, rr_dict):
 
 def tax_rule_screening(string):
 	#
-	string_list = string.split()
-
-	# Non-organism flag
-	remove_key = ['collection', 'construct', 'library', 'plasmid', 'sequence', 'transposon', 'vector', "<<"]
-	for trs_1 in remove_key:
-		if trs_1 in string_list:
-			return 90
-
-	# Unclassified/Uncultured/Unidentified flag
-	unclear_key = ['unclassified', 'uncultured', 'unidentified']
-	for trs_2 in unclear_key:
-		if trs_2 in string_list:
-			return 91
-
-	# Environmental sample/Enrichment culture flag
-	env_key = ['environmental', 'sample', 'enrichment', 'culture']
-	for trs_3 in env_key:
-		if trs_3 in string_list:
-			return 92
-
-	# Virus flag
-	virus_key = ['virus', 'phage']
-	for trs_4 in virus_key:
-		if trs_4 in string_list:
-			return 93
-
-	# Phytoplasma flag
-	if 'phytoplasma' in string_list:
-		return 94
-
-	# Endosymbiont flag
-	symbiont_key = ["symbiont", "endosymbiont", "symbiotic"]
-	for trs_5 in symbiont_key:
-		if trs_5 in string_list:
-			return 95
-
-	# Hybrid flag
-	hybrid_key = ["x", "×"]
-	for trs_6 in hybrid_key:
-		if trs_6 in string_list:
-			return 96
-
-	# Materia medica // complicated input flag
-	multiple_key = ['lac', 'massa fermentata', 'sal', 'seu']
-	for trs_7 in multiple_key:
-		if trs_7 in string_list:
-			return 97
-
-	# (all other else)
-	return 0
-
-def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
+	# Non-organism (90), unclassified (91), environmental sample (92), virus (93), phytoplasma (94),
+	# endosymbiont (95), hybrid (96) & materia medica (97) flags: token table in ps_normalize
+	return ps_normalize.token_screening(string.split())
+
+def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict=None):
 	
 	# Initialization
 
+	if ri_dict is None:
+		ri_dict = {}
+
 	string_block = string.lower().split()
 	first_block = string_block[0]
 	second_block = ""
@@ -437,7 +575,7 @@ def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict
 
 	lowest_case = []
 
-	for igd_1 in numpy.arange(len(string_block), 0, -1):
+	for igd_1 in range(len(string_block), 0, -1):
 		sst = ' '.join(string_block[0:igd_1])
 		for igd_2 in range(len(tr_list)):
 			if sst in rr_dict[tr_list[igd_2]]:
@@ -453,7 +591,7 @@ def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict
 
 	if any(char.isdigit() for char in string) == True:
 		for igd_3 in range(len(tr_list)):
-			for igd_4 in numpy.arange(len(lowest_case), 0, -1):
+			for igd_4 in range(len(lowest_case), 0, -1):
 				if ' '.join(lowest_case[0:igd_4]) in rr_dict[tr_list[igd_3]]:
 					igd_match[igd_3].extend(rr_dict[tr_list[igd_3]][' '.join(lowest_case[0:igd_4])])
 					igd_stat[igd_3] = 25
@@ -496,19 +634,19 @@ def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict
 								else:
 									ig_temp_names.append(igd_8)
 
-	ig_temp_names[:] = list(numpy.unique(ig_temp_names))
+	ig_temp_names[:] = candidate_list(ig_temp_names)
 
 	#
 
 	sorted_list = {}
-	for igd_5 in ig_temp_names:
-		if numpy.fabs(len(igd_5) - len(string)) <= cut_dist:
-			ed_value = lev_dist(string.lower(), igd_5, cut_dist)
-			if ed_value <= cut_dist and ed_value < float(len(string)-len(first_block))*(0.3333):
-				if string.lower() in igd_5 or igd_5 in string.lower():
-					sorted_list[igd_5] = min(ed_value-1, 0)
-				else:
-					sorted_list[igd_5] = ed_value
+	ig_cand_names = [j for j in ig_temp_names if abs(len(j) - len(string)) <= cut_dist]
+	ig_cand_dist = lev_dist_batch(string.lower(), ig_cand_names, cut_dist)
+	for igd_5, ed_value in zip(ig_cand_names, ig_cand_dist):
+		if ed_value <= cut_dist and ed_value < float(len(string)-len(first_block))*(0.3333):
+			if string.lower() in igd_5 or igd_5 in string.lower():
+				sorted_list[igd_5] = min(ed_value-1, 0)
+			else:
+				sorted_list[igd_5] = ed_value
 	sorted_list = dict(sorted(sorted_list.items(), key=lambda item: item[1]))
 
 	#
@@ -518,7 +656,7 @@ def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict
 		igd_match_temp = [[], []]
 		for igd_6 in sorted_list:
 			if sorted_list[igd_6] == min_ed:
-				pc_map_igd, pc_stat_igd = first_bare_match(igd_6, tr_list, rn_dict, rg_dict, rr_dict)
+				pc_map_igd, pc_stat_igd = first_bare_match(igd_6, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
 				igd_match_temp[0].append(pc_map_igd)
 				igd_match_temp[1].append(pc_stat_igd)
 		for igd_7 in range(len(tr_list)):
@@ -558,71 +696,71 @@ def intra_generic_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict
 	#print(string, len(ig_temp_names), len(sorted_list), sorted_list, igd_match, igd_stat)
 	return igd_match, igd_stat
 
-def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
+def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict):
 	#
 	idd_match = [[] for j in tr_list]
 	idd_stat = [1000 for j in tr_list]
-	# Latin correction raw match
-	latin_corr = [' '.join(j) for j in list(itertools.product(*latin_correction(string.split())))]
+	# Latin correction raw match (inflection combinations are generated lazily, most probable first)
+	latin_form = latin_correction(string.split())
+	latin_first = ' '.join([j[0] for j in latin_form])
 	latin_first_block = ""
 	if len(string) >= 1:
-		if len(latin_corr) >= 1:
-			if len(latin_corr[0]) >= 1:
-				latin_first_block += latin_corr[0].split()[0]
-			else:
-				latin_first_block += string.split()[0]
+		if len(latin_first) >= 1:
+			latin_first_block += latin_first.split()[0]
 		else:
 			latin_first_block += string.split()[0]
 	#
-	for idd_2 in range(len(tr_list)):
-		if idd_stat[idd_2] > 100 and len(latin_corr) >= 1:
-			for idd_3 in latin_corr:
-				if idd_3 in rr_dict[tr_list[idd_2]]:
-					idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][idd_3])
-					idd_stat[idd_2] = 0
-					break
-		#
-		if idd_stat[idd_2] > 100 and len(latin_corr) >= 1:		
-			for idd_3 in latin_corr:
-				ssl = idd_3.split()
-				ssl_len = len(ssl)
-				if len(ssl) >= 3:
-					for idd_4 in numpy.arange(len(ssl)-1, 1, -1):
-						if ' '.join(ssl[0:idd_4]) in rr_dict[tr_list[idd_2]]:
-							idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][' '.join(ssl[0:idd_4])])
-							if idd_4 >= 3:
-								idd_stat[idd_2] = 0
-							else:
-								idd_stat[idd_2] = 100
-							break
-		#
-		if idd_stat[idd_2] > 100 and len(latin_corr) >= 1:		
-			for idd_3 in latin_corr:
-				ssl = idd_3.split()
-				if len(ssl) >= 1:
-					if ssl[0] in rr_dict[tr_list[idd_2]]:
-						idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][ssl[0]])
-						idd_stat[idd_2] = 100
-						latin_first_block = ssl[0]
+	latin_hit = [[None, None, None] for j in tr_list] # First exact / leading-words / first-word hit per reference
+	for idd_3 in latin_expansion(latin_form):
+		ssl = idd_3.split()
+		for idd_2 in range(len(tr_list)):
+			if latin_hit[idd_2][0] is not None:
+				continue
+			if idd_3 in rr_dict[tr_list[idd_2]]:
+				latin_hit[idd_2][0] = idd_3
+				continue
+			if latin_hit[idd_2][1] is None and len(ssl) >= 3:
+				for idd_4 in range(len(ssl)-1, 1, -1):
+					if ' '.join(ssl[0:idd_4]) in rr_dict[tr_list[idd_2]]:
+						latin_hit[idd_2][1] = [' '.join(ssl[0:idd_4]), idd_4]
 						break
+			if latin_hit[idd_2][2] is None and len(ssl) >= 1:
+				if ssl[0] in rr_dict[tr_list[idd_2]]:
+					latin_hit[idd_2][2] = ssl[0]
+		if all(j[0] is not None for j in latin_hit):
+			break
+	#
+	for idd_2 in range(len(tr_list)):
+		if latin_hit[idd_2][0] is not None:
+			idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][latin_hit[idd_2][0]])
+			idd_stat[idd_2] = 0
+		elif latin_hit[idd_2][1] is not None:
+			idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][latin_hit[idd_2][1][0]])
+			if latin_hit[idd_2][1][1] >= 3:
+				idd_stat[idd_2] = 0
+			else:
+				idd_stat[idd_2] = 100
+		elif latin_hit[idd_2][2] is not None:
+			idd_match[idd_2].extend(rr_dict[tr_list[idd_2]][latin_hit[idd_2][2]])
+			idd_stat[idd_2] = 100
+			latin_first_block = latin_hit[idd_2][2]
 	#
 	if any(char.isdigit() for char in string) == True:
 		pass
 	else:
-		if idd_stat[idd_2] > 10 and len(latin_corr) >= 1:
-			if len(latin_corr[0].split()) > 1:
+		if idd_stat[idd_2] > 10:
+			if len(latin_first.split()) > 1:
 				rg_min = min([len(rg_dict[j]) for j in rg_dict])
 				first_alpha = alpha_count(latin_first_block)
 				first_len = len(latin_first_block)
 				first_raw = {}
 				for idd_4 in range(len(tr_list)):
 					if len(rg_dict[tr_list[idd_4]]) == rg_min:
-						for idd_5 in rg_dict[tr_list[idd_4]]:
-							if numpy.fabs(len(idd_5)-first_len) < cut_dist:
-								if alpha_compare(rg_dict[tr_list[idd_4]][idd_5][0], first_alpha, cut_dist) <=  cut_dist:
-									ed_score = lev_dist(idd_5, latin_first_block, cut_dist)
-									if ed_score <= cut_dist:
-										first_raw[idd_5] = ed_score
+						first_index = ps_index.genus_index_get(ri_dict, rg_dict, tr_list[idd_4], cut_dist)
+						first_cand = ps_index.genus_index_query(first_index, first_alpha, first_len)
+						for idd_5, ed_score in zip(first_cand, lev_dist_batch(first_cand, latin_first_block, cut_dist)):
+							if ed_score <= cut_dist:
+								first_raw[idd_5] = ed_score
 				first_raw = dict(sorted(first_raw.items(), key=lambda item: item[1]))
 				#
 				second_raw = []
@@ -638,12 +776,17 @@ def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
 									for idd_9 in ssl:
 										if idd_7 in idd_9:
 											second_raw.append(idd_9)
-				second_raw[:] = list(numpy.unique(second_raw))
+				second_raw[:] = candidate_list(second_raw)
 				#
 				sorted_list = {}
+				second_cand = [j for j in second_raw if abs(len(string) - len(j)) <= cut_dist]
+				second_dist = dict(zip(second_cand, lev_dist_batch(string, second_cand, cut_dist)))
+				second_latin_dist = {}
+				second_latin_cand = [j for j in second_raw if abs(len(latin_first) - len(j)) <= cut_dist]
+				second_latin_dist = dict(zip(second_latin_cand, lev_dist_batch(latin_first, second_latin_cand, cut_dist)))
 				for idd_10 in second_raw:
-					if numpy.fabs(len(string) - len(idd_10)) <= cut_dist:
-						ed_score = lev_dist(string, idd_10, cut_dist)
+					if idd_10 in second_dist:
+						ed_score = second_dist[idd_10]
 						if ed_score <= cut_dist:
 							if idd_10 in sorted_list:
 								if ed_score < sorted_list[idd_10]:
@@ -651,15 +794,14 @@ def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
 							else:
 								sorted_list[idd_10] = ed_score
 					#
-					if len(latin_corr) >= 1:
-						if numpy.fabs(len(latin_corr[0]) - len(idd_10)) <= cut_dist:
-							ed_score_2 = lev_dist(latin_corr[0], idd_10, cut_dist)
-							if ed_score_2 <= cut_dist:
-								if idd_10 in sorted_list:
-									if ed_score_2 < sorted_list[idd_10]:
-										sorted_list[idd_10] = ed_score_2
-								else:
+					if idd_10 in second_latin_dist:
+						ed_score_2 = second_latin_dist[idd_10]
+						if ed_score_2 <= cut_dist:
+							if idd_10 in sorted_list:
+								if ed_score_2 < sorted_list[idd_10]:
 									sorted_list[idd_10] = ed_score_2
+							else:
+								sorted_list[idd_10] = ed_score_2
 				sorted_list = dict(sorted(sorted_list.items(), key=lambda item: item[1]))
 				if len(sorted_list) >= 1:
 					sorted_min = min(sorted_list.values())
@@ -674,23 +816,11 @@ def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
 		#
 		for idd_13 in range(len(tr_list)):
 			if min(idd_stat) < 10 and idd_stat[idd_13] >= 10:
-				syn_sub = []
-				for idd_14 in range(len(tr_list)):
-					if idd_stat[idd_14] < 10:
-						for idd_15 in idd_match[idd_14]:
-							syn_sub.append(rn_dict[tr_list[idd_14]][idd_15][1])
-							ssl_2 = rn_dict[tr_list[idd_14]][idd_15][2].split("|")
-							for idd_16 in ssl_2:
-								if len(idd_16) >= 1 and idd_16 in rn_dict[tr_list[idd_14]][idd_15][1]:
-									syn_sub.append(idd_16)
-				syn_sub = [j.lower() for j in numpy.unique(syn_sub) if len(j) >= 1]
-				syn_tar = []
-				for idd_16 in syn_sub:
-					if idd_16 in rr_dict[tr_list[idd_13]]:
-						syn_tar.extend(rr_dict[tr_list[idd_13]][idd_16])
-						idd_stat[idd_13] = 6
+				syn_src = [[tr_list[j], idd_match[j]] for j in range(len(tr_list)) if idd_stat[j] < 10]
+				syn_tar = ps_index.bridge_match(ri_dict, rn_dict, rr_dict, syn_src, tr_list[idd_13])
 				if len(syn_tar) >= 1:
-					idd_match[idd_13][:] = list(numpy.unique(syn_tar))
+					idd_match[idd_13][:] = candidate_list(syn_tar)
+					idd_stat[idd_13] = 6
 	#
 	if min(idd_stat) < 10:
 		idd_lt_map, idd_lt_stat = lowest_taxon_match(idd_match, idd_stat, tr_list, rn_dict, rr_dict)
@@ -728,8 +858,10 @@ def in_depth_edit_dist(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
 
 ## Partial mapping sequence
 
-def partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict):
+def partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict, ri_dict=None):
 	#
+	if ri_dict is None:
+		ri_dict = {}
 	tar_str = string.lower()
 	pm_match = [[] for j in tr_list]
 	pm_stat = [1000 for j in tr_list]
@@ -753,19 +885,7 @@ def partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict):
 				if tar_det >= 1:
 					for pm_3 in range(len(tr_list)):
 						if pm_stat[pm_3] > 100:
-							syn_sub = []
-							for pm_4 in pm_match[pm_2]:
-								syn_sub.append(rn_dict[tr_list[pm_2]][pm_4][1])
-								if len(rn_dict[tr_list[pm_2]][pm_4][2]) >= 1:
-									ssl_2 = rn_dict[tr_list[pm_2]][pm_4][2].split("|")
-									for pm_5 in ssl_2:
-										if len(pm_5) >= 1 and pm_5 in rn_dict[tr_list[pm_2]][pm_4][1]:
-											syn_sub.append(pm_5)
-							syn_sub = [j.lower() for j in numpy.unique(syn_sub) if len(j) >= 1]
-							syn_tar = []
-							for pm_6 in syn_sub:
-								if pm_6 in rr_dict[tr_list[pm_3]]:
-									syn_tar.extend(rr_dict[tr_list[pm_3]][pm_6])
+							syn_tar = ps_index.bridge_match(ri_dict, rn_dict, rr_dict, [[tr_list[pm_2], pm_match[pm_2]]], tr_list[pm_3])
 							if len(syn_tar) >= 1:
 								pm_match[pm_3][:] = syn_tar
 								pm_stat[pm_3] = 100
@@ -775,7 +895,13 @@ def partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict):
 
 ## Core mapping sequence
 
-def phylosophos_sequential_mapping(string, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict):
+def phylosophos_sequential_mapping(string, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict):
+	pc_quick = phylosophos_quick_mapping(string, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
+	if pc_quick[0] == True:
+		return pc_quick[1], pc_quick[2]
+	return phylosophos_fuzzy_mapping(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, pc_quick)
+
+def phylosophos_quick_mapping(string, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict): # Steps 1-3; returns [finished, mapped IDs, status codes, step 1 IDs]
 
 	# Initialization
 
@@ -786,10 +912,12 @@ def phylosophos_sequential_mapping(string, ref_sel, cut_dist, tr_list, rn_dict,
 			break
 	pc_map_map = [[] for j in tr_list]
 	pc_map_stat = [1000 for j in tr_list]
+	ps_profile.profile_begin(string)
 
 	# Step 1. Exact matching
 
-	pc_map_1, pc_stat_1 = first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict)
+	ps_profile.profile_stage("exact_match", pc_map_stat)
+	pc_map_1, pc_stat_1 = first_bare_match(string, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
 	for pc_1 in range(len(tr_list)):
 		if pc_stat_1[pc_1] < pc_map_stat[pc_1]:
 			pc_map_map[pc_1][:] = pc_map_1[pc_1][:]
@@ -798,41 +926,55 @@ def phylosophos_sequential_mapping(string, ref_sel, cut_dist, tr_list, rn_dict,
 	# Step 2. Closest taxon mapping
 
 	if min(pc_map_stat) < 10:
+		ps_profile.profile_stage("lowest_taxon", pc_map_stat)
 		pc_map_2, pc_stat_2 = lowest_taxon_match(pc_map_1, pc_stat_1, tr_list, rn_dict, rr_dict)
 		for pc_1 in range(len(tr_list)):
 			if pc_stat_2[pc_1] < pc_map_stat[pc_1]:
 				pc_map_map[pc_1][:] = pc_map_2[pc_1][:]
 				pc_map_stat[pc_1] = pc_stat_2[pc_1]
 		if pc_map_stat[ref_ord] < 20:
-			return pc_map_map, pc_map_stat
+			ps_profile.profile_end(pc_map_stat)
+			return [True, pc_map_map, pc_map_stat, pc_map_1]
 
 	# Step 3. Rule-based screening
 
+	ps_profile.profile_stage("rule_screening", pc_map_stat)
 	pc_rule_stat = tax_rule_screening(string)
 
 	if pc_rule_stat >= 90:
 		pc_map_stat[:] = [pc_rule_stat for j in tr_list]
-		return [[], [], [], []], pc_map_stat
+		ps_profile.profile_end(pc_map_stat)
+		return [True, [[], [], [], []], pc_map_stat, pc_map_1]
 
 	if cut_dist == 0: # Ignore edit-distance based mapping process if cutoff distance is zero
-		return pc_map_map, pc_map_stat
+		ps_profile.profile_end(pc_map_stat)
+		return [True, pc_map_map, pc_map_stat, pc_map_1]
+
+	return [False, pc_map_map, pc_map_stat, pc_map_1]
+
+def phylosophos_fuzzy_mapping(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, quick_state): # Steps 4-6, continued from phylosophos_quick_mapping()
+
+	pc_map_map, pc_map_stat, pc_map_1 = quick_state[1], quick_state[2], quick_state[3]
 
 	# Step 4. (intrageneric) edit distance-based mapping
 
 	corr_string = input_correction(string)[0]
 
 	if sum([len(j) for j in pc_map_1]) >= 1:
-		pc_map_3, pc_stat_3 = intra_generic_edit_dist(corr_string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict)
+		ps_profile.profile_stage("intra_generic", pc_map_stat)
+		pc_map_3, pc_stat_3 = intra_generic_edit_dist(corr_string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
 		for pc_1 in range(len(tr_list)):
 			if pc_stat_3[pc_1] < pc_map_stat[pc_1]:
 				pc_map_map[pc_1][:] = pc_map_3[pc_1][:]
 				pc_map_stat[pc_1] = pc_stat_3[pc_1]
 		if min(pc_map_stat) < 30:
+			ps_profile.profile_end(pc_map_stat)
 			return pc_map_map, pc_map_stat
 
 	# Step 5. (intergeneric) edit distance-based mapping
 
-	pc_map_4, pc_stat_4 = in_depth_edit_dist(corr_string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict)
+	ps_profile.profile_stage("in_depth", pc_map_stat)
+	pc_map_4, pc_stat_4 = in_depth_edit_dist(corr_string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
 	for pc_1 in range(len(tr_list)):
 		if pc_stat_4[pc_1] < pc_map_stat[pc_1]:
 			pc_map_map[pc_1][:] = pc_map_4[pc_1][:]
@@ -840,72 +982,98 @@ def phylosophos_sequential_mapping(string, ref_sel, cut_dist, tr_list, rn_dict,
 
 	# Step 6. Mapping status return
 
-	pc_map_5, pc_stat_5 = partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict)
+	ps_profile.profile_stage("partial_mapping", pc_map_stat)
+	pc_map_5, pc_stat_5 = partial_mapping(string, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
 	for pc_1 in range(len(tr_list)):
 		if pc_stat_5[pc_1] <= pc_map_stat[pc_1]:
 			pc_map_map[pc_1][:] = pc_map_5[pc_1][:]
 			pc_map_stat[pc_1] = pc_stat_5[pc_1]
 
+	ps_profile.profile_end(pc_map_stat, False)
 	return pc_map_map, pc_map_stat
 
-## Export function
+## Parallel mapping sequence
+#
+# Forked workers inherit map_shared copy-on-write, so the reference dictionaries are never copied;
+# gc.freeze() keeps the collector from touching (and thereby duplicating) the inherited pages.
+# Where fork is unavailable (Windows), map_shared is sent once per worker: node tables re-open their memory maps.
+
+def mapping_worker_init(shared_list, profile_stat=False):
+	global map_shared
+	if shared_list is not None:
+		map_shared = shared_list
+	ps_profile.profile_data = ps_profile.profile_new() if profile_stat == True else None
+
+def mapping_worker(name_list): # Returns the mapping results of the chunk & the stage profile part of the worker (None: profiling off)
+	ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict = map_shared
+	mw_res = [list(phylosophos_sequential_mapping(j, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)) for j in name_list]
+	return [mw_res, ps_profile.profile_take()]
+
+def fuzzy_worker(string, quick_state): # Steps 4-6 of one name in a worker process
+	ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict = map_shared
+	return list(phylosophos_fuzzy_mapping(string, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, quick_state))
+
+def mapping_pool_open(shared_list, job_count):
+	global map_shared
+	map_shared = shared_list
+	if "fork" in multiprocessing.get_all_start_methods():
+		gc.collect()
+		gc.freeze()
+		return multiprocessing.get_context("fork").Pool(job_count, initializer=mapping_worker_init, initargs=(None, ps_profile.profile_data is not None))
+	return multiprocessing.get_context().Pool(job_count, initializer=mapping_worker_init, initargs=(shared_list, ps_profile.profile_data is not None))
+
+def mapping_pool_close(mp_pool):
+	global map_shared
+	mp_pool.terminate()
+	mp_pool.join()
+	gc.unfreeze()
+	map_shared = []
+
+def phylosophos_parallel_mapping(map_progress, row_start, precalc_list, mp_pool, job_count):
+	ppm_chunk = max(1, min(map_chunk_max, len(precalc_list)//(job_count*8)))
+	ppm_list = [precalc_list[j:j+ppm_chunk] for j in range(0, len(precalc_list), ppm_chunk)]
+	mapping_results = []
+	for ppm_1 in mp_pool.imap(mapping_worker, ppm_list): # imap keeps the input order
+		mapping_results.extend(ppm_1[0])
+		ps_profile.profile_merge(ppm_1[1])
+		ps_progress.progress_update(map_progress, row_start+len(mapping_results))
+	return mapping_results
+
+## Chunk mapping sequence (each distinct name is mapped once; repeated & previously mapped names are served from the cache)
+
+def phylosophos_chunk_mapping(map_progress, row_start, precalc_list, ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, map_cache, mp_pool, job_count):
+	map_keys = [ps_cache.cache_key(j, ref_sel, cut_dist) for j in precalc_list]
+	map_found = {} # Results of this chunk, kept apart from the cache (which may evict them before the chunk ends)
+	for pcm_1 in dict.fromkeys(map_keys):
+		if pcm_1 in map_cache["entries"]:
+			map_cache["entries"].move_to_end(pcm_1)
+			map_found[pcm_1] = map_cache["entries"][pcm_1]
+	map_list = [j for j in dict.fromkeys(map_keys) if j not in map_found]
+	map_cache["miss"] += len(map_list)
+	map_cache["hit"] += len(map_keys)-len(map_list)
+
+	if mp_pool is not None and len(map_list) >= 2:
+		map_res = phylosophos_parallel_mapping(map_progress, row_start, [j[0] for j in map_list], mp_pool, job_count)
+		for pcm_2 in range(len(map_list)):
+			map_found[map_list[pcm_2]] = map_res[pcm_2]
+			ps_cache.cache_put(map_cache, map_list[pcm_2], map_res[pcm_2])
+	else:
+		for pcm_2 in range(len(map_list)):
+			map_label, map_stat = phylosophos_sequential_mapping(map_list[pcm_2][0], ref_sel, cut_dist, tr_list, rn_dict, rg_dict, rr_dict, ri_dict)
+			map_found[map_list[pcm_2]] = [map_label, map_stat]
+			ps_cache.cache_put(map_cache, map_list[pcm_2], [map_label, map_stat])
+			ps_progress.progress_update(map_progress, row_start+pcm_2+1, map_list[pcm_2][0])
 
-def phylosophos_result_export(input_name, raw_list, precalc_list, mapping_results, ref_type, tr_list, rn_dict):
+	return [copy.deepcopy(map_found[j]) for j in map_keys] # Private copies: the export step edits results in place
 
-	# Preset information
-
-	mapping_status_dict = {
-	"0":"Raw / Exact DB / Canonical match", 
-	"1":"Raw / Exact DB / Synonym match", 
-	"2":"Raw / Exact DB / Multiple match", 
-	"3":"Simple corrected / Exact DB / Canonical match", 
-	"4":"Simple corrected / Exact DB / Synonym match", 
-	"5":"Simple corrected / Exact DB / Multiple match", 
-	"6":"Recursive / Single match", 
-	"8":"Recursive / Multiple match", 
-	"10":"Recursive / Nearest match / Species level", 
-	"11":"Recursive / Nearest match / Genus level", 
-	"12":"Recursive / Nearest match / Family level", 
-	"13":"Recursive / Nearest match / Class level", 
-	"14":"Recursive / Nearest match / Order level", 
-	"15":"Recursive / Nearest match / Phylum level", 
-	"16":"Recursive / Nearest match / Kingdom level", 
-	"17":"Recursive / Nearest match / Domain level", 
-	"20":"Specific epithet corrected / Exact DB / Single match", 
-	"21":"Specific epithet corrected / Exact DB / Multiple match", 
-	"22":"Specific epithet corrected / Recursive / Single match", 
-	"23":"Specific epithet corrected / Recursive / Multiple match", 
-	"24":"Specific epithet corrected / Recursive / Nearest match", 
-	"30":"Latin inflection corrected / Exact DB / Single match", 
-	"31":"Latin inflection corrected / Exact DB / Nearest match", 
-	"32":"Generic epithet corrected / Exact DB / Single match",
-	"33":"Generic epithet corrected / Exact DB / Multiple match",
-	"34":"Generic epithet corrected / Recursive / Single match",
-	"35":"Generic epithet corrected / Recursive / Multiple match",
-	"36":"Generic epithet corrected / Recursive / Nearest match",
-	"40":"Correction denied / Strain name involved / Nearest match",
-	"41":"Correction denied / Similarity-related abbreviation identified / Nearest match",
-	"90":"Rule-based screening / Non-organism", 
-	"91":"Rule-based screening / Unclassified-Uncultured-Unidentified", 
-	"92":"Rule-based screening / Environmental sample", 
-	"93":"Rule-based screening / Virus or phage - manual check required", 
-	"94":"Rule-based screening / Phytoplasma - manual check required", 
-	"95":"Rule-based screening / (endo)symbiont - manual check required", 
-	"96":"Rule-based screening / Unresolvable hybrid - manual check required", 
-	"97":"Rule-based screening / Multiple materia medica - manual check required", 
-	"100":"Unmapped / partial match (most likely genus level)",  
-	"1000":"Unmapped"
-	}
+## Export function
+
+def phylosophos_result_header(tr_list):
 
 	export_header = ["Input_file_name", "Input_original_order", "Raw_name_input", "Pre_corrected_input", 
 	"Chosen_reference", "Chosen_reference_mapped_ID", "Chosen_reference_scientific_name", 
 	"Chosen_reference_mapping_status_code", "Chosen_reference_mapping_status_description"]
 
-	# Initialization
-
-	export_time = str(datetime.datetime.now())[2:19].replace("-", "").replace(":", "").replace(" ", "_")
-	export_file_name = "phylosophos_result_"+export_time+"_"+input_name.split("\\")[-1]
-
 	for pre_1 in tr_list:
 		export_header.append(pre_1+"_mapped_ID")
 		export_header.append(pre_1+"_scientific_name")
@@ -913,11 +1081,55 @@ def phylosophos_result_export(input_name, raw_list, precalc_list, mapping_result
 
 	export_header.append("Manual_curation_recommended")
 
-	ref_ord = 0
-	for pcm_1 in range(len(tr_list)):
-		if ref_type == tr_list[pcm_1]:
-			ref_ord += pcm_1
-			break
+	return export_header
+
+def phylosophos_result_resume(resume_path, export_header): # Returns the number of complete rows (an incomplete last row is cut off)
+	rr_count = 0
+	rr_end = 0
+	rr_order = b"0"
+	with open(resume_path, 'rb') as inp_f:
+		rr_head = inp_f.readline()
+		rr_end += len(rr_head)
+		for line in inp_f:
+			if line[-1:] != b"\n":
+				break
+			rr_count += 1
+			rr_end += len(line)
+			rr_order = line.split(b"\t", 2)[1]
+	if rr_head.decode('UTF-8', errors = 'ignore').rstrip('\r\n').split('\t') != export_header or rr_order != str(rr_count).encode('UTF-8'):
+		print("- ERROR OCCURRED: RESUMED RESULT FILE DOES NOT MATCH THE CURRENT ANALYSIS //", resume_path)
+		print("- ANALYSIS TERMINATED")
+		exit()
+	os.truncate(resume_path, rr_end)
+	return rr_count
+
+def phylosophos_result_open(input_name, tr_list, resume_file): # Returns the result file path & the number of rows already written
+
+	export_header = phylosophos_result_header(tr_list)
+	b_path = os.getcwd()+"\\"
+
+	# Partial result file of the same input
+
+	if len(resume_file) >= 1 and resume_file.split("\\")[-1].endswith("_"+input_name.split("\\")[-1]):
+		resume_path = resume_file
+		if os.path.isfile(resume_path) == False:
+			resume_path = b_path+"result\\"+resume_file
+		if os.path.isfile(resume_path) == True:
+			resume_count = phylosophos_result_resume(resume_path, export_header)
+			print("-", input_name, "resumed after row", resume_count)
+			return resume_path, resume_count
+
+	# New result file
+
+	export_time = str(datetime.datetime.now())[2:19].replace("-", "").replace(":", "").replace(" ", "_")
+	export_file_name = "phylosophos_result_"+export_time+"_"+input_name.split("\\")[-1]
+
+	with open(b_path+"result\\"+export_file_name, 'w', encoding = 'UTF-8', errors = 'ignore') as res_f:
+		res_f.write('\t'.join(export_header) + '\n')
+
+	return b_path+"result\\"+export_file_name, 0
+
+def phylosophos_result_correction(raw_list, mapping_results, tr_list, rn_dict): # Final status corrections (in place) before a result is reported
 
 	# Similar species mapping correction
 
@@ -949,34 +1161,64 @@ def phylosophos_result_export(input_name, raw_list, precalc_list, mapping_result
 			if mapping_results[i_1][1][i_4] == 25:
 				mapping_results[i_1][1][i_4] = 40
 
+def phylosophos_result_record(raw_name, precalc, mapping_result, ref_type, tr_list, rn_dict): # Structured form of one result row
+
+	ref_ord = 0
+	for pcm_1 in range(len(tr_list)):
+		if ref_type == tr_list[pcm_1]:
+			ref_ord += pcm_1
+			break
+
+	rr_res = {"input": str(raw_name), "pre_corrected": str(precalc), "reference": ref_type,
+	"mapped_id": list(mapping_result[0][ref_ord]), "scientific_name": [rn_dict[ref_type][j][1] for j in mapping_result[0][ref_ord]],
+	"status_code": int(mapping_result[1][ref_ord]), "status_description": mapping_status_dict[str(mapping_result[1][ref_ord])], "references": {}}
+	for rr_1 in range(len(tr_list)):
+		rr_res["references"][tr_list[rr_1]] = {"mapped_id": list(mapping_result[0][rr_1]),
+		"scientific_name": [rn_dict[tr_list[rr_1]][j][1] for j in mapping_result[0][rr_1]], "status_code": int(mapping_result[1][rr_1])}
+	#
+	if str(mapping_result[1][ref_ord]) in ["0", "1", "3", "4", "6", "10", "20", "22", "30", "31", "32", "34"]:
+		rr_res["manual_curation"] = "NO"
+	elif str(mapping_result[1][ref_ord]) in ["11", "12", "13", "14", "15", "16", "17", "24", "36"]:
+		rr_res["manual_curation"] = "MAYBE"
+	else:
+		rr_res["manual_curation"] = "YES"
+	return rr_res
+
+def phylosophos_result_line(input_name, row_order, record, tr_list): # Result file columns (phylosophos_result_header) of a result record
+	rl_res = [input_name.split("\\")[-1], str(row_order), record["input"], record["pre_corrected"], record["reference"],
+	'|'.join(record["mapped_id"]), '|'.join(record["scientific_name"]), str(record["status_code"]), record["status_description"]]
+	for rl_1 in tr_list:
+		rl_res.extend(['|'.join(record["references"][rl_1]["mapped_id"]), '|'.join(record["references"][rl_1]["scientific_name"]), str(record["references"][rl_1]["status_code"])])
+	rl_res.append(record["manual_curation"])
+	return rl_res
+
+def phylosophos_result_write(res_f, input_name, row_start, raw_list, precalc_list, mapping_results, ref_type, tr_list, rn_dict):
+
+	phylosophos_result_correction(raw_list, mapping_results, tr_list, rn_dict)
+
 	# Mapping data export
 
-	b_path = os.getcwd()+"\\"
-	with open(b_path+"result\\"+export_file_name, 'w', encoding = 'UTF-8', errors = 'ignore') as res_f:
-		res_f.write('\t'.join(export_header) + '\n')
-		for i_1 in range(len(mapping_results)):
-			res_f.write(input_name.split("\\")[-1] + '\t' + str(i_1+1) + '\t')
-			res_f.write(str(raw_list[i_1]) + '\t' + str(precalc_list[i_1]) + '\t' + ref_type + '\t')
-			res_f.write('|'.join(mapping_results[i_1][0][ref_ord]) + '\t')
-			res_f.write('|'.join([rn_dict[ref_type][j][1] for j in mapping_results[i_1][0][ref_ord]]) + '\t')
-			res_f.write(str(mapping_results[i_1][1][ref_ord]) + '\t')
-			res_f.write(mapping_status_dict[str(mapping_results[i_1][1][ref_ord])])
-			for i_2 in range(len(tr_list)):
-				res_f.write('\t' + '|'.join(mapping_results[i_1][0][i_2]))
-				res_f.write('\t' + '|'.join([rn_dict[tr_list[i_2]][j][1] for j in mapping_results[i_1][0][i_2]]))
-				res_f.write('\t' + str(mapping_results[i_1][1][i_2]))
-			#
-			if str(mapping_results[i_1][1][ref_ord]) in ["0", "1", "3", "4", "6", "10", "20", "22", "30", "31", "32", "34"]:
-				res_f.write('\t' + "NO")
-			elif str(mapping_results[i_1][1][ref_ord]) in ["11", "12", "13", "14", "15", "16", "17", "24", "36"]:
-				res_f.write('\t' + "MAYBE")
-			else:
-				res_f.write('\t' + "YES")
-			res_f.write('\n')
+	for i_1 in range(len(mapping_results)):
+		rw_rec = phylosophos_result_record(raw_list[i_1], precalc_list[i_1], mapping_results[i_1], ref_type, tr_list, rn_dict)
+		res_f.write('\t'.join(phylosophos_result_line(input_name, row_start+i_1+1, rw_rec, tr_list)) + '\n')
+
+def phylosophos_result_export(input_name, raw_list, precalc_list, mapping_results, ref_type, tr_list, rn_dict):
+	export_path, export_count = phylosophos_result_open(input_name, tr_list, "")
+	with open(export_path, 'a', encoding = 'UTF-8', errors = 'ignore') as res_f:
+		phylosophos_result_write(res_f, input_name, 0, raw_list, precalc_list, mapping_results, ref_type, tr_list, rn_dict)
 
 ## Analysis function
 
-def phylosophos_core_analysis(input_list, tr_list, rn_dict, rg_dict, rr_dict, ref_type, lev_cutoff, manual_stat):
+def phylosophos_manual_import(learning_path): # {lowercase raw name: curated name} of manual_curation_list.tsv
+	manual_dict = {}
+	with open(learning_path+"manual_curation_list.tsv", encoding = "UTF-8") as inp_f:
+		inp_f.readline()
+		for line in inp_f:
+			ssl = line.rstrip('\n').split('\t')
+			manual_dict[ssl[0].lower()] = ssl[1]
+	return manual_dict
+
+def phylosophos_core_analysis(input_list, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, ref_type, lev_cutoff, manual_stat, job_count=1, map_cache=None, resume_file="", profile_stat=False):
 
 	# Initialization
 
@@ -991,36 +1233,171 @@ def phylosophos_core_analysis(input_list, tr_list, rn_dict, rg_dict, rr_dict, re
 	manual_dict = {}
 
 	if manual_stat == True:
-		b_path = os.getcwd()+"\\"
-		with open(b_path+"pp_learning\\manual_curation_list.tsv", encoding = "UTF-8") as inp_f:
-			inp_f.readline()
-			for line in inp_f:
-				ssl = line.rstrip('\n').split('\t')
-				manual_dict[ssl[0].lower()] = ssl[1]
+		manual_dict = phylosophos_manual_import(os.getcwd()+"\\pp_learning\\")
 
-	# Input names simple correction
+	# Result file setup (rows of a resumed result file are kept, and their input names skipped)
 
-	precalc_list = []
+	export_path, row_count = phylosophos_result_open(input_list[0], tr_list, resume_file)
+	input_iter = itertools.islice(iter(input_list[1]), row_count, None)
 
-	for pca_1 in range(len(input_list[1])):		
-		if input_list[1][pca_1].lower() in manual_dict:
-			precalc_list.append(manual_dict[input_list[1][pca_1].lower()])
-		else:
-			precalc_list.append(string_split_correction(input_list[1][pca_1]))
+	if map_cache is None:
+		map_cache = ps_cache.cache_new("", 0)
+	map_progress = ps_progress.progress_start("- "+input_list[0], input_list[2] if len(input_list) >= 3 else 0, row_count)
+	ps_profile.profile_data = ps_profile.profile_new(lev_cutoff) if profile_stat == True else None
+	mp_pool = None
+	if job_count >= 2:
+		mp_pool = mapping_pool_open([ref_type, lev_cutoff, tr_list, rn_dict, rg_dict, rr_dict, ri_dict], job_count)
 
-	# Core analysis
+	# Chunked analysis & export (every chunk is flushed to the result file as soon as it is mapped)
 
-	mapping_results = []
+	try:
+		with open(export_path, 'a', encoding = 'UTF-8', errors = 'ignore') as res_f:
+			while True:
+				raw_list = list(itertools.islice(input_iter, input_chunk_size))
+				if len(raw_list) == 0:
+					break
+
+				# Input names simple correction
+
+				precalc_list = []
+				for pca_1 in raw_list:
+					if pca_1.lower() in manual_dict:
+						precalc_list.append(manual_dict[pca_1.lower()])
+					else:
+						precalc_list.append(string_split_correction(pca_1))
+
+				# Core analysis & export
+
+				mapping_results = phylosophos_chunk_mapping(map_progress, row_count, precalc_list, ref_type, lev_cutoff, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, map_cache, mp_pool, job_count)
+				phylosophos_result_write(res_f, input_list[0], row_count, raw_list, precalc_list, mapping_results, ref_type, tr_list, rn_dict)
+				res_f.flush()
+				row_count += len(raw_list)
+				ps_progress.progress_update(map_progress, row_count)
+	finally:
+		if mp_pool is not None:
+			mapping_pool_close(mp_pool)
 
-	for pca_2 in precalc_list:
-		map_label, map_stat = phylosophos_sequential_mapping(pca_2, ref_type, lev_cutoff, tr_list, rn_dict, rg_dict, rr_dict)
-		mapping_results.append([map_label, map_stat])
-		print(input_list[0], len(mapping_results), "/", len(precalc_list), end='\r')
+	ps_progress.progress_end(map_progress, row_count)
+	print("-", input_list[0], row_count, "analysis completed")
+	return ps_profile.profile_export(export_path)
 
-	# Result export
+## Re-mapping function
+#
+# A previous result file is updated after a reference update: rows are re-mapped only if their pre-corrected input changed,
+# one of their mapped IDs was renamed/modified/removed, one of their words is a changed name's generic epithet,
+# or their first word lies within the cutoff of one (the genus bucket searched by the edit distance steps).
+# Every other row is copied unchanged into the merged result file.
+
+def phylosophos_remap_affected(remap_row, precalc, remap_delta, ref_type, tr_list, cut_dist, genus_memo):
+	if remap_row[3] != precalc or remap_row[4] != ref_type:
+		return True
+	for pra_1 in range(len(tr_list)):
+		if tr_list[pra_1] in remap_delta["ids"] and len(remap_delta["ids"][tr_list[pra_1]].intersection(remap_row[9+3*pra_1].split("|"))) >= 1:
+			return True
+	pra_words = precalc.lower().split()
+	if len(pra_words) == 0:
+		return False
+	if precalc.lower() in remap_delta["names"]:
+		return True
+	for pra_2 in pra_words:
+		if pra_2 in remap_delta["genera"]:
+			return True
+	if pra_words[0] not in genus_memo:
+		pra_cand = [j for j in remap_delta["genera"] if abs(len(j)-len(pra_words[0])) < cut_dist]
+		genus_memo[pra_words[0]] = len(pra_cand) >= 1 and min(lev_dist_batch(pra_words[0], pra_cand, cut_dist)) <= cut_dist
+	return genus_memo[pra_words[0]]
+
+def phylosophos_remap_analysis(remap_file, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, ref_type, lev_cutoff, manual_stat, job_count=1, map_cache=None, profile_stat=False):
+
+	b_path = os.getcwd()+"\\"
+	remap_path = remap_file
+	if os.path.isfile(remap_path) == False:
+		remap_path = b_path+"result\\"+remap_file
+	if os.path.isfile(remap_path) == False:
+		print("- ERROR OCCURRED: PREVIOUS RESULT FILE NOT FOUND //", remap_file)
+		print("- ANALYSIS TERMINATED")
+		exit()
+
+	# Reference changes since the previous result (changelogs of the same day are included)
+
+	remap_date = remap_path.split("\\")[-1].split("_")
+	remap_date = remap_date[2] if len(remap_date) >= 3 and remap_date[2].isdigit() else ""
+	remap_delta = ps_changelog.changelog_delta(ps_changelog.changelog_collect(b_path+"pp_ref\\", remap_date))
+	print("## Reference changes:", sum([len(remap_delta["ids"][j]) for j in remap_delta["ids"]]), "taxa,", len(remap_delta["genera"]), "generic epithets")
+
+	# Manual curation file import
+
+	manual_dict = {}
+
+	if manual_stat == True:
+		manual_dict = phylosophos_manual_import(b_path+"pp_learning\\")
+
+	# Merged result file setup
+
+	with open(remap_path, encoding = 'UTF-8', errors = 'ignore') as inp_f:
+		remap_header = inp_f.readline().rstrip('\n').split('\t')
+		remap_first = inp_f.readline().split('\t')
+	if remap_header != phylosophos_result_header(tr_list) or len(remap_first) < 2:
+		print("- ERROR OCCURRED: PREVIOUS RESULT FILE DOES NOT MATCH THE CURRENT REFERENCES //", remap_file)
+		print("- ANALYSIS TERMINATED")
+		exit()
+	input_name = remap_first[0]
+	export_path, row_count = phylosophos_result_open(input_name, tr_list, "")
+
+	if map_cache is None:
+		map_cache = ps_cache.cache_new("", 0)
+	map_progress = ps_progress.progress_start("- "+remap_path.split("\\")[-1], 0, 0)
+	ps_profile.profile_data = ps_profile.profile_new(lev_cutoff) if profile_stat == True else None
+	mp_pool = None
+	if job_count >= 2:
+		mp_pool = mapping_pool_open([ref_type, lev_cutoff, tr_list, rn_dict, rg_dict, rr_dict, ri_dict], job_count)
+
+	# Chunked re-mapping & merge
+
+	remap_count = 0
+	genus_memo = {}
+	try:
+		with open(remap_path, encoding = 'UTF-8', errors = 'ignore') as inp_f, open(export_path, 'a', encoding = 'UTF-8', errors = 'ignore') as res_f:
+			inp_f.readline()
+			while True:
+				line_list = list(itertools.islice(inp_f, input_chunk_size))
+				if len(line_list) == 0:
+					break
+
+				# Affected rows selection
 
-	print("-", input_list[0], len(precalc_list), "analysis completed")
-	phylosophos_result_export(input_list[0], input_list[1], precalc_list, mapping_results, ref_type, tr_list, rn_dict)
+				remap_rows = []
+				for rma_1 in range(len(line_list)):
+					ssl = line_list[rma_1].rstrip('\n').split('\t')
+					if ssl[2].lower() in manual_dict:
+						rma_precalc = manual_dict[ssl[2].lower()]
+					else:
+						rma_precalc = string_split_correction(ssl[2])
+					if phylosophos_remap_affected(ssl, rma_precalc, remap_delta, ref_type, tr_list, lev_cutoff, genus_memo) == True:
+						remap_rows.append([rma_1, int(ssl[1])-1, ssl[2], rma_precalc])
+
+				# Re-mapping & export (in the original row order)
+
+				mapping_results = phylosophos_chunk_mapping(map_progress, row_count, [j[3] for j in remap_rows], ref_type, lev_cutoff, tr_list, rn_dict, rg_dict, rr_dict, ri_dict, map_cache, mp_pool, job_count)
+				rma_next = 0
+				for rma_2 in range(len(line_list)):
+					if rma_next < len(remap_rows) and remap_rows[rma_next][0] == rma_2:
+						rma_row = remap_rows[rma_next]
+						phylosophos_result_write(res_f, input_name, rma_row[1], [rma_row[2]], [rma_row[3]], [mapping_results[rma_next]], ref_type, tr_list, rn_dict)
+						rma_next += 1
+					else:
+						res_f.write(line_list[rma_2] if line_list[rma_2].endswith('\n') else line_list[rma_2]+'\n')
+				res_f.flush()
+				row_count += len(line_list)
+				remap_count += len(remap_rows)
+				ps_progress.progress_update(map_progress, row_count)
+	finally:
+		if mp_pool is not None:
+			mapping_pool_close(mp_pool)
+
+	ps_progress.progress_end(map_progress, row_count)
+	print("-", input_name, remap_count, "of", row_count, "rows re-mapped //", export_path.split("\\")[-1])
+	return ps_profile.profile_export(export_path)
 
 #
 
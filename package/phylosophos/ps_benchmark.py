@@ -0,0 +1,850 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: ACCESSORY SCRIPT
+####
+#### PERFORMANCE BENCHMARK MODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import hashlib
+import json
+import numpy
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+try:
+	import resource # Peak RSS on Linux & macOS
+except ImportError:
+	resource = None
+
+from phylosophos import ps_analysis, ps_index, ps_initialize, ps_normalize, ps_update
+
+#### Preset parameters
+
+suite_rates = {"typo": 0.2, "synonym": 0.1, "latin": 0.05, "junk": 0.05} # Input composition of the suite benchmark (the rest: exact names)
+suite_tolerance = 0.25 # Relative slowdown (or memory growth) reported as a regression by -compare
+latin_parts = ["radix", "herba", "folium", "fructus", "semen", "cortex", "flos", "rhizoma"]
+junk_names = ["uncultured bacterium", "environmental sample", "cloning vector", "unidentified", "enrichment culture", "phage"]
+
+#### Function definition
+
+## Baseline implementations (kept for comparison only)
+
+def lev_dist_matrix(string_1, string_2, cut_dist): # Damerau-Levenshtein distance (numpy matrix version)
+	# Parameter setup
+	dl_xlen = len(string_1)+1
+	dl_ylen = len(string_2)+1
+	dl_det = 0 # Status determinant for early termination
+	# Matrix setup
+	dl_matrix = numpy.zeros((dl_xlen, dl_ylen))
+	for dl_1 in range(dl_xlen):
+		dl_matrix[dl_1, 0] = dl_1
+	for dl_2 in range(dl_ylen):
+		dl_matrix[0, dl_2] = dl_2
+	# Score calculation
+	for dl_3 in range(1, dl_xlen):
+		for dl_4 in range(1, dl_ylen):
+			if string_1[dl_3-1] == string_2[dl_4-1]:
+				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-1, dl_4-1], dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+			elif string_1[dl_3-2] == string_2[dl_4-1] and string_1[dl_3-1] == string_2[dl_4-2]:
+				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-2, dl_4-2]+1, dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+			else:
+				dl_matrix[dl_3, dl_4] = min(dl_matrix[dl_3-1, dl_4-1]+1, dl_matrix[dl_3-1, dl_4]+1, dl_matrix[dl_3, dl_4-1]+1)
+			#
+			if dl_3 == dl_4 and min(dl_matrix[dl_3-1]) > cut_dist:
+				dl_det += 1
+				break
+		if dl_det >= 1:
+			break
+	# return value
+	if dl_det >= 1:
+		return max(dl_xlen, dl_ylen)
+	else:
+		return int(dl_matrix[dl_xlen-1, dl_ylen-1])
+
+def lineage_walk(node_id, parent_dict): # Root-to-node lineage by walking up the parent chain (NCBI builder, before memoization)
+	taxid_code = [[node_id], [parent_dict[node_id][2]]]
+	t_det = 0
+	while t_det == 0:
+		tar_parent = parent_dict[taxid_code[0][-1]]
+		taxid_code[0].append(tar_parent[0])
+		taxid_code[1].append(tar_parent[2])
+		if tar_parent[0] == "1":
+			t_det += 1
+	taxid_code[1].append(0)
+	return ['|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][1:]]), max(taxid_code[1])]
+
+def unique_numpy(items): # Sorted unique list through a numpy array (candidate lists before ps_analysis.candidate_list)
+	return list(numpy.unique(items))
+
+def input_correction_list(string): # input_correction with keyword lists (before ps_normalize)
+	#
+	ignore_list = ['sp.', 'ssp.', 'genomosp.', 'genosp.', 'subsp.', 'var.', 'str.', 'f.', 'pv.', 'bv.', 's.', 's.l.', 
+	'al.', 'sect.', 'subgen.', 'nom.', 'no.', "species", "var."]
+	dropout_list = ['cf.', 'aff.', 'nr.', 'n.', 's.n.', 'nov.', 'gen.', 'inval.']
+	hybrid_list = ['×', 'x', 'x']
+	#
+	stat_code = [0, 0, 0]
+	tar_temp = []
+	#
+	ssl = string.lower().split()
+	for ic_1 in ssl:
+		if ic_1 in ignore_list:
+			stat_code[0] = 1
+		elif ic_1 in dropout_list:
+			stat_code[1] = 1
+		elif ic_1 in hybrid_list:
+			stat_code[2] = 1
+		elif '.' in ic_1 or ',' in ic_1:
+			if len(ssl) >= 2:
+				continue
+		elif '<' in ic_1 or '>' in ic_1:
+			tar_temp.append(ic_1.split('>')[0].split('<')[0])
+		else:
+			tar_temp.append(ic_1)
+	#
+	tar_str = ' '.join(tar_temp)
+	if "[syn." in tar_str:
+		tar_str = tar_str.split("[syn.")[0].rstrip(' ')
+	#
+	return tar_str, stat_code
+
+def latin_correction_list(tar_psd): # latin_correction with keyword lists (before ps_normalize)
+	#
+	removed_list = ["bulbus", "carapax", "caulis", "concha", "cortex", "embryo", "exocarpium", ]
+	removed_list.extend(["flos", "folium", "fructus", "herba", "lignum", "ligum", "oleum", "ootheca", "pedicellus"])
+	removed_list.extend(["pericarpium", "pollen", "radix", "rhizoma", "sanguis", "semen", "strobilus"])
+	removed_list.extend(["cum", "et", "radicis", "cornu", "praeparata", "preparata", "succus", "squama"])
+	removed_list.extend(["stigma", "oviductus", "acidum", "fel", "stamen", "pulveratum", "resina", "excrementum"])
+	removed_list.extend(["periostracum", "plumula", "corium", "dens", "extractum", "liquidum", "fossilia", "gummi"])
+	removed_list.extend(["plumula", "massa", "fermentata", "medulla", "nidus", "penis", "corticis", "folii"])
+	removed_list.extend(["nodus", "rhizomatis", "plastrum", "ramulus", "testa", "testis", "exodermis", "germinatus"])
+	removed_list.extend(["arillus", "alburnum", "cacumen", "os", "petiolus", "pix", "pulvis", "spina", "receptaculum"])
+	removed_list.extend(["leaf", "of", "root", "twig", "the", "family", "et", "from"])
+	#
+	drop_list = ['spp.', 'sp.', "ssp", "spp", "sp", 'var.', 'f.', "L", "L.", "(L.)", "Roxb", "Roxb.", "Fr.", "Fr", "DC", "DC."]
+	#
+	corr_det = 0
+	corr_temp = []
+	for i_1 in range(len(tar_psd)):
+		if tar_psd[i_1] in removed_list:
+			corr_det += 1
+		elif i_1 == len(tar_psd)-1 and tar_psd[i_1] in drop_list:
+			pass
+		elif "(" in tar_psd[i_1] or ")" in tar_psd[i_1]:
+			if tar_psd[i_1][0] == "(":
+				pass
+			else:
+				t_1 = tar_psd[i_1].split("(")
+				for i_2 in range(len(t_1)):
+					t_2 = t_1[i_2].split(")")
+					corr_temp.extend([str(j) for j in t_2 if len(j) >= 1])
+		elif "." in tar_psd[i_1] and i_1 < 2 and len(tar_psd[i_1]) <= 2:
+			pass
+		elif len(tar_psd[i_1]) == 0:
+			pass
+		else:
+			corr_temp.append(tar_psd[i_1])
+	if corr_det < 1:
+		return [[j] for j in corr_temp]
+	else:
+		corr_list = [[] for j in corr_temp]
+		for i_2 in range(len(corr_temp)):
+			if corr_temp[i_2][-2:] == "ae":
+				corr_list[i_2].append(corr_temp[i_2][:-1])
+				corr_list[i_2].append(corr_temp[i_2])
+			elif corr_temp[i_2][-2:] == "is":
+				corr_list[i_2].append(corr_temp[i_2])
+				if corr_temp[i_2][-3:] == "cis":
+					if corr_temp[i_2][-4:] == "icis":
+						corr_list[i_2].append(corr_temp[i_2][:-4] + "ex")
+					corr_list[i_2].append(corr_temp[i_2][:-3] + "x")
+				elif corr_temp[i_2][-3:] == "dis":
+					corr_list[i_2].append(corr_temp[i_2][:-3] + "s")
+					corr_list[i_2].append(corr_temp[i_2][:-3] + "des")
+				elif corr_temp[i_2][-4:] == "inis" or corr_temp[i_2][-4:] == "onis":
+					corr_list[i_2].append(corr_temp[i_2][:-4] + "o")
+				elif corr_temp[i_2][-4:] == "ntis":
+					corr_list[i_2].append(corr_temp[i_2][:-4] + "s")
+				elif corr_temp[i_2][-4:] == "itis":
+					corr_list[i_2].append(corr_temp[i_2][:-3] + "s")
+				elif corr_temp[i_2][-4:] == "this":
+					corr_list[i_2].append(corr_temp[i_2][:-4] + "thes")
+				else:					
+					corr_list[i_2].append(corr_temp[i_2][:-2])
+			elif corr_temp[i_2][-1] == "i":
+				corr_list[i_2].append(corr_temp[i_2])
+				corr_list[i_2].append(corr_temp[i_2][:-1]+"os")
+				corr_list[i_2].append(corr_temp[i_2][:-1]+"on")
+				corr_list[i_2].append(corr_temp[i_2][:-1]+"um")
+				corr_list[i_2].append(corr_temp[i_2][:-1]+"us")
+			else:
+				corr_list[i_2].append(corr_temp[i_2])
+		return corr_list
+
+def tax_rule_screening_list(string): # tax_rule_screening with keyword lists (before ps_normalize)
+	#
+	string_list = string.split()
+
+	# Non-organism flag
+	remove_key = ['collection', 'construct', 'library', 'plasmid', 'sequence', 'transposon', 'vector', "<<"]
+	for trs_1 in remove_key:
+		if trs_1 in string_list:
+			return 90
+
+	# Unclassified/Uncultured/Unidentified flag
+	unclear_key = ['unclassified', 'uncultured', 'unidentified']
+	for trs_2 in unclear_key:
+		if trs_2 in string_list:
+			return 91
+
+	# Environmental sample/Enrichment culture flag
+	env_key = ['environmental', 'sample', 'enrichment', 'culture']
+	for trs_3 in env_key:
+		if trs_3 in string_list:
+			return 92
+
+	# Virus flag
+	virus_key = ['virus', 'phage']
+	for trs_4 in virus_key:
+		if trs_4 in string_list:
+			return 93
+
+	# Phytoplasma flag
+	if 'phytoplasma' in string_list:
+		return 94
+
+	# Endosymbiont flag
+	symbiont_key = ["symbiont", "endosymbiont", "symbiotic"]
+	for trs_5 in symbiont_key:
+		if trs_5 in string_list:
+			return 95
+
+	# Hybrid flag
+	hybrid_key = ["x", "×"]
+	for trs_6 in hybrid_key:
+		if trs_6 in string_list:
+			return 96
+
+	# Materia medica // complicated input flag
+	multiple_key = ['lac', 'massa fermentata', 'sal', 'seu']
+	for trs_7 in multiple_key:
+		if trs_7 in string_list:
+			return 97
+
+	# (all other else)
+	return 0
+
+def ref_partial_correction_list(string): # ref_partial_correction with keyword lists (before ps_normalize)
+	#
+	ignore_list = ['sp.', 'ssp.', 'genomosp.', 'genosp.', 'subsp.', 'var.', 'str.', 'f.', 'pv.', 'bv.', 's.', 's.l.', 
+	'al.', 'sect.', 'subgen.', 'nom.', 'no.', "species"]
+	dropout_list = ['cf.', 'aff.', 'nr.', 'n.', 's.n.', 'nov.', 'gen.', 'inval.']
+	hybrid_list = ['×', 'x', 'x']
+	#
+	stat_code = [0, 0, 0]
+	tar_temp = []
+	#
+	ssl = string.lower().split()
+	for ic_1 in ssl:
+		if ic_1 in ignore_list:
+			stat_code[0] = 1
+		elif ic_1 in dropout_list:
+			stat_code[1] = 1
+		elif ic_1 in hybrid_list:
+			stat_code[2] = 1
+		elif '.' in ic_1 or ',' in ic_1:
+			if len(ssl) >= 2:
+				continue
+		elif '<' in ic_1 or '>' in ic_1:
+			tar_temp.append(ic_1.split('>')[0].split('<')[0])
+		else:
+			tar_temp.append(ic_1)
+	#
+	return ' '.join(tar_temp), stat_code
+
+## Synthetic data generators
+
+def synthetic_epithet(rng, min_len, max_len):
+	syllables = ["a", "ae", "an", "ar", "ca", "ci", "da", "el", "en", "er", "i", "ia", "is", "la", "li", "ma", "na",
+	"o", "or", "pa", "ra", "ri", "sa", "si", "ta", "ti", "u", "um", "us", "va"]
+	tar_str = ""
+	tar_len = rng.randint(min_len, max_len)
+	while len(tar_str) < tar_len:
+		tar_str += rng.choice(syllables)
+	return tar_str
+
+def synthetic_typo(rng, string, edit_count):
+	tar_list = list(string)
+	for st_1 in range(edit_count):
+		st_type = rng.randint(0, 3)
+		if st_type == 0 and len(tar_list) >= 2:
+			del tar_list[rng.randrange(len(tar_list))]
+		elif st_type == 1:
+			tar_list.insert(rng.randint(0, len(tar_list)), rng.choice("abcdefghijklmnopqrstuvwxyz"))
+		elif st_type == 2 and len(tar_list) >= 1:
+			tar_list[rng.randrange(len(tar_list))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+		elif len(tar_list) >= 2:
+			st_pos = rng.randrange(len(tar_list)-1)
+			tar_list[st_pos], tar_list[st_pos+1] = tar_list[st_pos+1], tar_list[st_pos]
+	return ''.join(tar_list)
+
+def synthetic_name_pairs(pair_count, seed):
+	rng = random.Random(seed)
+	pair_list = []
+	for snp_1 in range(pair_count):
+		tar_name = synthetic_epithet(rng, 5, 12) + " " + synthetic_epithet(rng, 5, 14)
+		if snp_1 % 2 == 0: # Near-miss candidate (typical intra-generic comparison)
+			pair_list.append([tar_name, synthetic_typo(rng, tar_name, rng.randint(0, 4))])
+		else: # Unrelated candidate of similar length
+			pair_list.append([tar_name, tar_name.split()[0] + " " + synthetic_epithet(rng, 5, 14)])
+	return pair_list
+
+def synthetic_taxonomy(node_count, max_depth, seed): # NCBI-style {node_id: [parent_id, rank, rank_code]} tree
+	rng = random.Random(seed)
+	rank_names = ["superkingdom", "kingdom", "phylum", "class", "order", "family", "genus", "species"]
+	parent_dict = {"1": ["1", "no rank", 0]}
+	depth_list = [["1"]]
+	depth_total = max_depth*(max_depth+1)//2
+	for st_1 in range(1, max_depth+1): # Deeper levels hold more nodes, as in real taxonomies
+		depth_list.append([])
+		for st_2 in range(max(1, node_count*st_1//depth_total)):
+			tar_id = str(len(parent_dict)+1)
+			tar_rank = rank_names[min(len(rank_names)-1, (st_1-1)*len(rank_names)//max_depth)]
+			if rng.random() < 0.5:
+				tar_rank = "no rank"
+			parent_dict[tar_id] = [rng.choice(depth_list[st_1-1]), tar_rank, rank_names.index(tar_rank)+1 if tar_rank in rank_names else 0]
+			depth_list[st_1].append(tar_id)
+	return parent_dict
+
+def synthetic_reference(ref_path, genus_count, seed): # Writes CoL/EoL/GBIF/NCBI-style node & genus dictionaries; returns {genus: [epithets]}
+	rng = random.Random(seed)
+	genus_list = sorted(set([synthetic_epithet(rng, 5, 10).capitalize() for j in range(genus_count)]))
+	species_dict = {j: sorted(set([synthetic_epithet(rng, 5, 12) for k in range(rng.randint(1, 6))])) for j in genus_list}
+	kingdom_ids = {"col": ["N", "P", "F", "R"], "eol": ["EOL-000000541397", "EOL-000000097815", "EOL-000002172573", "EOL-000000024748"],
+	"gbif": ["1", "6", "5", "2"], "ncbi": ["33208", "33090", "4751", "2157"]}
+	kingdom_names = ["Metazoa", "Viridiplantae", "Fungi", "Archaea"]
+	for sr_1 in kingdom_ids:
+		ref_rng = random.Random(seed*31+zlib.crc32(sr_1.encode('UTF-8')))
+		root_id = {"col": "R0", "eol": "EOL-0", "gbif": "0", "ncbi": "1"}[sr_1]
+		node_list = [[root_id, "root", "", "no rank", root_id, "0"]]
+		genus_dict = {}
+		family_list = []
+		for sr_2 in range(len(kingdom_ids[sr_1])):
+			king_id = kingdom_ids[sr_1][sr_2]
+			node_list.append([king_id, kingdom_names[sr_2], "", "kingdom", king_id+"|"+root_id, "2|0"])
+			for sr_3 in range(5):
+				fam_id = sr_1[0]+"f"+str(sr_2)+"_"+str(sr_3)
+				family_list.append([fam_id, king_id])
+				node_list.append([fam_id, synthetic_epithet(ref_rng, 5, 9).capitalize()+"aceae", "", "family", fam_id+"|"+king_id+"|"+root_id, "6|2|0"])
+		node_count = 0
+		for sr_4 in genus_list:
+			if ref_rng.random() < 0.15: # References do not cover the same genera
+				continue
+			fam_id, king_id = family_list[zlib.crc32(sr_4.encode('UTF-8')) % len(family_list)]
+			gen_id = sr_1[0]+"g"+str(node_count)
+			node_count += 1
+			gen_lineage = gen_id+"|"+fam_id+"|"+king_id+"|"+root_id
+			node_list.append([gen_id, sr_4, "", "genus", gen_lineage, "7|6|2|0"])
+			genus_dict.setdefault(sr_4.lower(), []).append(gen_id)
+			for sr_5 in species_dict[sr_4]:
+				if ref_rng.random() < 0.1:
+					continue
+				sp_id = sr_1[0]+"s"+str(node_count)
+				node_count += 1
+				syn_list = []
+				if ref_rng.random() < 0.2:
+					syn_list.append(ref_rng.choice(genus_list)+" "+sr_5)
+				node_list.append([sp_id, sr_4+" "+sr_5, "|".join(syn_list), "species", sp_id+"|"+gen_lineage, "8|7|6|2|0"])
+				genus_dict.setdefault(sr_4.lower(), []).append(sp_id)
+				for sr_6 in syn_list:
+					genus_dict.setdefault(sr_6.split()[0].lower(), []).append(sp_id)
+		with open(os.path.join(ref_path, sr_1+"_node_dict.txt"), 'w', encoding = 'UTF-8') as res_f:
+			for sr_7 in node_list:
+				res_f.write('\t'.join(sr_7) + '\n')
+		with open(os.path.join(ref_path, sr_1+"_genus_dict.txt"), 'w', encoding = 'UTF-8') as res_f:
+			sr_8 = 0
+			for sr_9 in genus_dict:
+				res_f.write(str(sr_8) + '\t' + sr_9 + '\t' + '|'.join(genus_dict[sr_9]) + '\n')
+				sr_8 += 1
+	return species_dict
+
+def synthetic_inputs(species_dict, name_count, seed): # Exact, misspelled and annotated names, as found in occurrence data
+	rng = random.Random(seed)
+	genus_list = list(species_dict.keys())
+	input_list = []
+	for si_1 in range(name_count):
+		tar_gen = rng.choice(genus_list)
+		tar_sp = rng.choice(species_dict[tar_gen])
+		si_type = rng.random()
+		if si_type < 0.3:
+			input_list.append(tar_gen+" "+tar_sp)
+		elif si_type < 0.45:
+			input_list.append(tar_gen+" "+synthetic_typo(rng, tar_sp, rng.randint(1, 2)))
+		elif si_type < 0.6:
+			input_list.append(synthetic_typo(rng, tar_gen, rng.randint(1, 2)).capitalize()+" "+tar_sp)
+		elif si_type < 0.7:
+			input_list.append(tar_gen+" sp. "+str(rng.randint(1, 99)))
+		elif si_type < 0.8:
+			input_list.append(tar_gen+" cf. "+tar_sp)
+		elif si_type < 0.9:
+			input_list.append(tar_gen+" "+tar_sp+" var. "+synthetic_typo(rng, tar_sp, 1))
+		else:
+			input_list.append(synthetic_typo(rng, tar_gen+" "+tar_sp, 3))
+	return input_list
+
+def synthetic_synonyms(ref_path): # Synonyms written by synthetic_reference (every reference)
+	syn_list = []
+	for ss_1 in sorted(os.listdir(ref_path)):
+		if ss_1.endswith("_node_dict.txt"):
+			with open(os.path.join(ref_path, ss_1), encoding = 'UTF-8') as inp_f:
+				for line in inp_f:
+					ssl = line.rstrip('\n').split('\t')
+					syn_list.extend([j for j in ssl[2].split("|") if len(j) >= 1])
+	return sorted(set(syn_list))
+
+def synthetic_genitive(word): # Latin genitive as found in materia medica names (Lycium -> Lycii)
+	if word[-2:] in ["us", "um", "os", "on"]:
+		return word[:-2]+"i"
+	elif word[-1:] == "a":
+		return word+"e"
+	elif word[-1:] == "x":
+		return word[:-1]+"cis"
+	return word
+
+def synthetic_mixed_inputs(species_dict, syn_list, name_count, seed, rates): # Inputs with controlled typo / synonym / Latin inflection / junk rates
+	rng = random.Random(seed)
+	genus_list = list(species_dict.keys())
+	input_list = []
+	for smi_1 in range(name_count):
+		tar_gen = rng.choice(genus_list)
+		tar_sp = rng.choice(species_dict[tar_gen])
+		smi_type = rng.random()
+		if smi_type < rates["typo"]:
+			input_list.append(synthetic_typo(rng, tar_gen+" "+tar_sp, rng.randint(1, 3)))
+		elif smi_type < rates["typo"]+rates["synonym"] and len(syn_list) >= 1:
+			input_list.append(rng.choice(syn_list))
+		elif smi_type < rates["typo"]+rates["synonym"]+rates["latin"]:
+			smi_words = [synthetic_genitive(tar_gen), synthetic_genitive(tar_sp)]
+			if rng.random() < 0.5:
+				input_list.append(rng.choice(latin_parts).capitalize()+" "+' '.join(smi_words))
+			else:
+				input_list.append(' '.join(smi_words)+" "+rng.choice(latin_parts))
+		elif smi_type < rates["typo"]+rates["synonym"]+rates["latin"]+rates["junk"]:
+			if rng.random() < 0.5:
+				input_list.append(rng.choice(junk_names)+" "+str(rng.randint(1, 999)))
+			else:
+				input_list.append(synthetic_epithet(rng, 3, 8)+str(rng.randint(0, 99))+" "+synthetic_epithet(rng, 3, 8))
+		else:
+			input_list.append(tar_gen+" "+tar_sp)
+	return input_list
+
+def token_corpus(name_list, seed): # Input names, their corrected & lowercase forms, and names with every table token inserted
+	rng = random.Random(seed)
+	token_list = sorted(set(list(ps_normalize.correction_table)+list(ps_normalize.screening_table)+list(ps_normalize.latin_removed)+list(ps_normalize.latin_drop)))
+	token_list.extend(["massa fermentata", "[syn.", "[syn. Abies alba]", "<b>", "a<i>b</i>", "a,b", "x.", "(L.)", "()", "(a)b", "a(b)c", "ab.", "A.", ".", ","])
+	corpus_list = []
+	for tc_1 in name_list:
+		corpus_list.extend([tc_1, tc_1.lower(), ps_analysis.string_split_correction(tc_1)])
+	for tc_2 in token_list:
+		for tc_3 in [tc_2, tc_2.capitalize(), tc_2.upper()]:
+			tar_name = rng.choice(name_list).split() if len(name_list) >= 1 else ["Abies", "alba"]
+			for tc_4 in [0, 1, len(tar_name)]:
+				corpus_list.append(' '.join(tar_name[:tc_4]+[tc_3]+tar_name[tc_4:]))
+			corpus_list.append(tc_3)
+	return corpus_list
+
+def synthetic_reference_load(ref_path, cut_dist): # Reference set of a synthetic directory, as loaded by phylosophos_core
+	tr_list, rn_dict, rg_dict, rr_dict = ps_initialize.phylosophos_ref_import(ref_path)
+	ri_dict = ps_index.phylosophos_index_build(tr_list, rn_dict, rg_dict, rr_dict, cut_dist)
+	return tr_list, rn_dict, rg_dict, rr_dict, ri_dict
+
+## Benchmark functions
+
+def time_call(func, arg_list, repeat):
+	best_time = -1.0
+	for tc_1 in range(repeat):
+		time_start = time.perf_counter()
+		for tc_2 in arg_list:
+			func(*tc_2)
+		time_spent = time.perf_counter()-time_start
+		if best_time < 0 or time_spent < best_time:
+			best_time = time_spent
+	return best_time
+
+def lev_dist_benchmark(pair_count, repeat):
+	pair_list = synthetic_name_pairs(pair_count, 4096)
+	print("#### Edit distance micro-benchmark started ####")
+	print("## Name pairs:", len(pair_list), "// repeat:", repeat)
+	print('\t'.join(["cutoff", "matrix_sec", "banded_sec", "speedup", "identical"]))
+	bench_res = []
+	for lb_1 in range(1, 6):
+		arg_list = [[j[0], j[1], lb_1] for j in pair_list]
+		same_det = all(lev_dist_matrix(*j) == ps_analysis.lev_dist(*j) for j in arg_list)
+		matrix_time = time_call(lev_dist_matrix, arg_list, repeat)
+		banded_time = time_call(ps_analysis.lev_dist, arg_list, repeat)
+		bench_res.append([lb_1, matrix_time, banded_time, matrix_time/max(banded_time, 1e-9), same_det])
+		print('\t'.join([str(lb_1), "%.4f" % matrix_time, "%.4f" % banded_time, "%.1fx" % bench_res[-1][3], str(same_det)]))
+	print("#### Edit distance micro-benchmark completed ####")
+	return bench_res
+
+def lev_batch_benchmark(pair_count, repeat):
+	rng = random.Random(4096)
+	print("#### Batched edit distance benchmark started ####")
+	print('\t'.join(["candidates", "cutoff", "loop_sec", "batch_sec", "speedup", "identical"]))
+	bench_res = []
+	for lbb_1 in [8, 32, 128, 512, 2048]:
+		query_list = [synthetic_epithet(rng, 5, 12) + " " + synthetic_epithet(rng, 5, 14) for j in range(max(1, pair_count//lbb_1))]
+		cand_list = [[synthetic_typo(rng, j, rng.randint(0, 5)) for k in range(lbb_1)] for j in query_list]
+		for lbb_2 in [1, 3, 5]:
+			loop_args = [[query_list[j], cand_list[j], lbb_2] for j in range(len(query_list))]
+			same_det = all([ps_analysis.lev_dist(j[0], k, j[2]) for k in j[1]] == ps_analysis.lev_dist_batch(*j) for j in loop_args)
+			loop_time = time_call(lambda q, c, d: [ps_analysis.lev_dist(q, j, d) for j in c], loop_args, repeat)
+			batch_time = time_call(ps_analysis.lev_dist_batch, loop_args, repeat)
+			bench_res.append([lbb_1, lbb_2, loop_time, batch_time, loop_time/max(batch_time, 1e-9), same_det])
+			print('\t'.join([str(lbb_1), str(lbb_2), "%.4f" % loop_time, "%.4f" % batch_time, "%.1fx" % bench_res[-1][4], str(same_det)]))
+	print("#### Batched edit distance benchmark completed ####")
+	return bench_res
+
+def lev_check(pair_count): # Equivalence of lev_dist / lev_dist_full / lev_dist_batch with the matrix version; returns the number of mismatches
+	rng = random.Random(4096)
+	edge_list = ["", "a", "b", "ab", "ba", "aa", "abc", "acb", "bca", "cab", "abab", "baba", "Homo sapiens", "Homo spaiens", "sapiens Homo",
+	"Betula pendula", "Bétula péndula", "Œnothera", "Oenothera", "Ærva lanata", "Λύκιον", "白头翁", "白頭翁", "\U0001d538bies alba", "Abies alba"]
+	pair_list = [[j, k] for j in edge_list for k in edge_list]
+	for lc_1 in synthetic_name_pairs(pair_count, 4096): # Fuzzed pairs, half of them with non-ASCII characters swapped in
+		if rng.random() < 0.5:
+			lc_1 = [''.join([rng.choice("áéíöüñçæœλ头\U0001d538") if rng.random() < 0.15 else j for j in k]) for k in lc_1]
+		pair_list.append(lc_1)
+	print("#### Edit distance equivalence check started ####")
+	print("## Name pairs:", len(pair_list), "(edge cases:", len(edge_list)**2, ") // reference: numpy matrix version")
+	print('\t'.join(["cutoff", "beyond_cutoff", "lev_dist", "lev_dist_full", "lev_dist_batch"]))
+	lc_count = 0
+	for lc_2 in range(0, 6):
+		ref_res = [lev_dist_matrix(j[0], j[1], lc_2) for j in pair_list]
+		lc_res = [[ps_analysis.lev_dist(j[0], j[1], lc_2) for j in pair_list], [ps_analysis.lev_dist_full(j[0], j[1], lc_2) for j in pair_list], []]
+		for lc_3 in range(0, len(pair_list), 64): # One-to-many blocks of at least lev_batch_min candidates (vectorized path)
+			lc_block = pair_list[lc_3:lc_3+64]
+			for lc_4 in lc_block:
+				lc_res[2].append(ps_analysis.lev_dist_batch(lc_4[0], [lc_4[1]]+[j[1] for j in lc_block], lc_2)[0])
+		lc_diff = [sum([1 for k in range(len(pair_list)) if j[k] != ref_res[k]]) for j in lc_res]
+		lc_count += sum(lc_diff)
+		print('\t'.join([str(lc_2), str(sum([1 for j in ref_res if j > lc_2]))]+[str(j)+" mismatch" if j >= 1 else "identical" for j in lc_diff]))
+	print("#### Edit distance equivalence check completed ####")
+	if lc_count >= 1:
+		print("- ERROR OCCURRED: EDIT DISTANCE RESULTS DIFFER FROM THE MATRIX VERSION //", lc_count, "results")
+		sys.exit(1)
+	return lc_count
+
+def lineage_benchmark(node_count, repeat):
+	print("#### Lineage construction benchmark started ####")
+	print('\t'.join(["nodes", "depth", "walk_sec", "memo_sec", "speedup", "identical"]))
+	bench_res = []
+	for lb_1 in [10, 30, 60]:
+		parent_dict = synthetic_taxonomy(node_count, lb_1, 4096)
+		node_list = [[j] for j in parent_dict]
+		def taxid_step(node_id):
+			if parent_dict[node_id][0] == "1":
+				return [[node_id, "1"], [parent_dict[node_id][2], 0], None]
+			return [[node_id], [parent_dict[node_id][2]], parent_dict[node_id][0]]
+		memo_dict = {}
+		same_det = all(lineage_walk(j[0], parent_dict) == ps_update.lineage_memo(j[0], taxid_step, memo_dict) for j in node_list)
+		walk_time = time_call(lambda x: lineage_walk(x, parent_dict), node_list, repeat)
+		memo_time = -1.0
+		for lb_2 in range(repeat): # A fresh memo per repeat: the timing includes filling it
+			memo_dict = {}
+			lb_time = time_call(lambda x: ps_update.lineage_memo(x, taxid_step, memo_dict), node_list, 1)
+			if memo_time < 0 or lb_time < memo_time:
+				memo_time = lb_time
+		bench_res.append([len(parent_dict), lb_1, walk_time, memo_time, walk_time/max(memo_time, 1e-9), same_det])
+		print('\t'.join([str(len(parent_dict)), str(lb_1), "%.4f" % walk_time, "%.4f" % memo_time, "%.1fx" % bench_res[-1][4], str(same_det)]))
+	print("#### Lineage construction benchmark completed ####")
+	return bench_res
+
+def candidate_benchmark(name_count, repeat):
+	rng = random.Random(4096)
+	print("#### Candidate list benchmark started ####")
+	print('\t'.join(["list_size", "numpy_unique_sec", "candidate_list_sec", "speedup", "identical"]))
+	bench_res = []
+	for cb_1 in [1, 3, 10, 50, 200]:
+		arg_list = [[[synthetic_epithet(rng, 5, 12) for k in range(cb_1)]] for j in range(max(1, name_count))]
+		for cb_2 in arg_list: # Repeated entries, as in merged candidate lists
+			cb_2[0].extend(cb_2[0][:cb_1//2])
+		same_det = all(unique_numpy(*j) == ps_analysis.candidate_list(*j) for j in arg_list)
+		numpy_time = time_call(unique_numpy, arg_list, repeat)
+		cand_time = time_call(ps_analysis.candidate_list, arg_list, repeat)
+		bench_res.append([cb_1, numpy_time, cand_time, numpy_time/max(cand_time, 1e-9), same_det])
+		print('\t'.join([str(cb_1), "%.4f" % numpy_time, "%.4f" % cand_time, "%.1fx" % bench_res[-1][3], str(same_det)]))
+	#
+	print("## Per-name mapping latency (synthetic references, cutoff 3)")
+	print('\t'.join(["candidate_lists", "total_sec", "usec_per_name", "names_per_sec", "identical"]))
+	ref_path = tempfile.mkdtemp(prefix="phylosophos_bench_")+os.sep
+	try:
+		species_dict = synthetic_reference(ref_path, 400, 4096)
+		ref_set = synthetic_reference_load(ref_path, 3)
+		input_list = [[ps_analysis.string_split_correction(j), ref_set[0][-1], 3]+list(ref_set) for j in synthetic_inputs(species_dict, name_count, 4096)]
+		map_res = {}
+		for cb_3 in [["numpy.unique", unique_numpy], ["candidate_list", ps_analysis.candidate_list]]:
+			cb_func = ps_analysis.candidate_list
+			ps_analysis.candidate_list = cb_3[1]
+			try:
+				map_res[cb_3[0]] = [ps_analysis.phylosophos_sequential_mapping(*j) for j in input_list]
+				map_time = time_call(ps_analysis.phylosophos_sequential_mapping, input_list, repeat)
+			finally:
+				ps_analysis.candidate_list = cb_func
+			same_det = map_res[cb_3[0]] == map_res["numpy.unique"]
+			bench_res.append([cb_3[0], map_time, 1e6*map_time/len(input_list), len(input_list)/max(map_time, 1e-9), same_det])
+			print('\t'.join([cb_3[0], "%.4f" % map_time, "%.1f" % bench_res[-1][2], "%.0f" % bench_res[-1][3], str(same_det)]))
+	finally:
+		shutil.rmtree(ref_path, ignore_errors=True)
+	print("#### Candidate list benchmark completed ####")
+	return bench_res
+
+def token_benchmark(name_count, repeat):
+	sample_file = os.path.join(os.getcwd(), "input", "sample_scientific_name_inputs.txt")
+	if os.path.isfile(sample_file):
+		with open(sample_file, encoding = 'UTF-8', errors = 'ignore') as inp_f:
+			name_list = [j.rstrip('\n') for j in inp_f if len(j.strip()) >= 1]
+	else:
+		sample_file = "(synthetic names)"
+		name_list = synthetic_inputs({synthetic_epithet(random.Random(j), 5, 10).capitalize(): ["alba", "vulgaris"] for j in range(50)}, name_count, 4096)
+	corpus_list = token_corpus(name_list, 4096)
+	print("#### Token table benchmark started ####")
+	print("## Corpus:", sample_file, "//", len(name_list), "names //", len(corpus_list), "cases")
+	print('\t'.join(["function", "list_sec", "table_sec", "speedup", "identical"]))
+	bench_res = []
+	for tb_1 in [["input_correction", input_correction_list, ps_analysis.input_correction, [[j] for j in corpus_list]],
+	["ref_partial_correction", ref_partial_correction_list, ps_initialize.ref_partial_correction, [[j.lower()] for j in corpus_list]],
+	["tax_rule_screening", tax_rule_screening_list, ps_analysis.tax_rule_screening, [[j] for j in corpus_list]+[[j.lower()] for j in corpus_list]],
+	["latin_correction", latin_correction_list, ps_analysis.latin_correction, [[j.split()] for j in corpus_list]+[[j.lower().split()] for j in corpus_list]]]:
+		same_det = all(tb_1[1](*j) == tb_1[2](*j) for j in tb_1[3])
+		list_time = time_call(tb_1[1], tb_1[3], repeat)
+		table_time = time_call(tb_1[2], tb_1[3], repeat)
+		bench_res.append([tb_1[0], list_time, table_time, list_time/max(table_time, 1e-9), same_det])
+		print('\t'.join([tb_1[0], "%.4f" % list_time, "%.4f" % table_time, "%.1fx" % bench_res[-1][3], str(same_det)]))
+	print("#### Token table benchmark completed ####")
+	tb_diff = [j[0] for j in bench_res if j[4] == False]
+	if len(tb_diff) >= 1: # The corpus is the equivalence check of the token tables: any difference fails the run
+		print("- ERROR OCCURRED: TOKEN TABLE RESULTS DIFFER FROM THE KEYWORD LISTS //", ', '.join(tb_diff))
+		sys.exit(1)
+	return bench_res
+
+## Mapping pipeline suite
+#
+# Synthetic references & inputs are generated from fixed seeds, so two runs with the same options are directly comparable.
+# Every measurement runs in a fresh process: "load" runs load the references cold (text parsing & snapshot build),
+# "map" runs load the snapshots warm and map the inputs through phylosophos_core_analysis with -profile.
+# Both are repeated and the best run is kept. -save writes the result as a JSON baseline; -compare checks a result against one.
+
+def peak_rss_mb(): # Peak resident set size of this process & of its finished child processes (-1: not available)
+	if resource is None:
+		return -1.0, -1.0
+	pr_div = 1024.0*1024.0 if sys.platform == "darwin" else 1024.0
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/pr_div, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss/pr_div
+
+def suite_result_files(work_path): # Result files of the work directory (on POSIX, the "\\result\\" paths of ps_analysis end up beside it)
+	sf_res = []
+	for sf_1 in [os.path.join(work_path, "result"), os.path.dirname(work_path)]:
+		if os.path.isdir(sf_1):
+			sf_res.extend([os.path.join(sf_1, j) for j in sorted(os.listdir(sf_1)) if "phylosophos_result_" in j])
+	return sf_res
+
+def suite_snapshot_clear(ref_path): # Removes everything but the text dictionaries (snapshots, caches), so the next load is cold
+	for ssc_1 in os.listdir(ref_path):
+		if ssc_1.endswith("_dict.txt") == False:
+			if os.path.isdir(ref_path+ssc_1):
+				shutil.rmtree(ref_path+ssc_1, ignore_errors=True)
+			else:
+				os.remove(ref_path+ssc_1)
+
+def suite_run(ref_path, input_path, work_path, cut_dist, job_count, phase): # Runs in a fresh process & prints one "## suite_run" JSON line
+	sr_res = {"phase": phase}
+	sr_time = time.perf_counter()
+	tr_list, rn_dict, rg_dict, rr_dict = ps_initialize.phylosophos_ref_import(ref_path)
+	sr_res["load_sec"] = time.perf_counter()-sr_time
+	if phase == "map":
+		sr_time = time.perf_counter()
+		ri_dict = ps_index.phylosophos_index_build(tr_list, rn_dict, rg_dict, rr_dict, int(cut_dist))
+		sr_res["index_sec"] = time.perf_counter()-sr_time
+		with open(input_path, encoding = 'UTF-8') as inp_f:
+			name_list = [j.rstrip('\n') for j in inp_f]
+		os.chdir(work_path)
+		sr_time = time.perf_counter()
+		sr_stage = ps_analysis.phylosophos_core_analysis([os.path.basename(input_path), name_list, len(name_list)], tr_list, rn_dict, rg_dict, rr_dict, ri_dict,
+		"ncbi", int(cut_dist), False, int(job_count), None, "", True)
+		sr_res["map_sec"] = time.perf_counter()-sr_time
+		sr_res["names_per_sec"] = len(name_list)/max(sr_res["map_sec"], 1e-9)
+		sr_res["stages"] = {j["stage"]: {"calls": j["calls"], "names_per_sec": j["calls"]/max(j["total_sec"], 1e-9), "mean_ms": j["mean_ms"], "p99_ms": j["p99_ms"],
+		"time_share_pct": j["time_share_pct"]} for j in sr_stage}
+		for sr_1 in suite_result_files(work_path):
+			if sr_1.endswith("_profile.json") == False and sr_1.endswith("_profile.tsv") == False:
+				with open(sr_1, 'rb') as inp_f:
+					sr_res["result_md5"] = hashlib.md5(inp_f.read()).hexdigest()
+			os.remove(sr_1)
+	sr_res["peak_rss_mb"], sr_res["worker_peak_rss_mb"] = peak_rss_mb()
+	print("## suite_run " + json.dumps(sr_res))
+
+def suite_call(ref_path, input_path, work_path, cut_dist, job_count, phase):
+	sc_env = dict(os.environ)
+	sc_env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + (os.pathsep + sc_env["PYTHONPATH"] if "PYTHONPATH" in sc_env else "")
+	sc_env["PHYLOSOPHOS_PROGRESS"] = "silent"
+	sc_run = subprocess.run([sys.executable, "-c", "import sys; from phylosophos import ps_benchmark; ps_benchmark.suite_run(*sys.argv[1:])",
+	ref_path, input_path, work_path, str(cut_dist), str(job_count), phase], capture_output = True, text = True, env = sc_env)
+	for line in sc_run.stdout.split('\n'):
+		if line.startswith("## suite_run "):
+			return json.loads(line[len("## suite_run "):])
+	print("- ERROR OCCURRED: BENCHMARK PROCESS FAILED")
+	print(sc_run.stderr[-2000:])
+	print("- ANALYSIS TERMINATED")
+	exit()
+
+def suite_compare(suite_res, baseline_file, tolerance): # Returns the number of regressions
+	with open(baseline_file, encoding = 'UTF-8') as inp_f:
+		base_res = json.load(inp_f)
+	if base_res["config"] != suite_res["config"]:
+		print("- ERROR OCCURRED: BASELINE WAS MEASURED WITH OTHER OPTIONS //", baseline_file)
+		print("- ANALYSIS TERMINATED")
+		exit()
+	print("## Comparison with", baseline_file, "// tolerance:", "%.0f%%" % (100*tolerance))
+	print('\t'.join(["metric", "baseline", "current", "change", "status"]))
+	metric_list = [[j, base_res["result"][j], suite_res["result"][j], j != "names_per_sec"] for j in ["load_cold_sec", "load_warm_sec", "index_sec", "map_sec", "names_per_sec", "peak_rss_mb"]]
+	for sc_1 in suite_res["result"]["stages"]:
+		if sc_1 in base_res["result"]["stages"] and suite_res["result"]["stages"][sc_1]["calls"] >= 1:
+			metric_list.append([sc_1+"_names_per_sec", base_res["result"]["stages"][sc_1]["names_per_sec"], suite_res["result"]["stages"][sc_1]["names_per_sec"], False])
+	sc_count = 0
+	for sc_2 in metric_list:
+		if sc_2[1] <= 0 or sc_2[2] < 0:
+			continue
+		sc_ratio = sc_2[2]/sc_2[1] if sc_2[3] == True else sc_2[1]/max(sc_2[2], 1e-9) # > 1: worse
+		sc_stat = "ok"
+		if sc_ratio > 1+tolerance:
+			sc_stat = "REGRESSION"
+			sc_count += 1
+		print('\t'.join([sc_2[0], "%.4f" % sc_2[1], "%.4f" % sc_2[2], "%+.1f%%" % (100*(sc_2[2]/sc_2[1]-1)), sc_stat]))
+	if base_res["result"].get("result_md5", "") != suite_res["result"].get("result_md5", ""):
+		print("## Mapping results differ from the baseline (result_md5)")
+	return sc_count
+
+def suite_benchmark(name_count, genus_count, seed, rates, cut_dist, job_count, repeat, save_file="", compare_file="", tolerance=suite_tolerance):
+	base_path = tempfile.mkdtemp(prefix="phylosophos_suite_")
+	ref_path = os.path.join(base_path, "pp_ref")+os.sep
+	work_path = os.path.join(base_path, "work")
+	os.makedirs(ref_path)
+	os.makedirs(os.path.join(work_path, "result"))
+	input_path = os.path.join(base_path, "suite_input.txt")
+	print("#### Mapping pipeline benchmark started ####")
+	try:
+		species_dict = synthetic_reference(ref_path, genus_count, seed)
+		input_list = synthetic_mixed_inputs(species_dict, synthetic_synonyms(ref_path), name_count, seed, rates)
+		with open(input_path, 'w', encoding = 'UTF-8') as res_f:
+			res_f.write('\n'.join(input_list) + '\n')
+		suite_res = {"config": {"names": name_count, "genera": genus_count, "seed": seed, "rates": rates, "lev_cutoff": cut_dist, "jobs": job_count,
+		"input_crc32": zlib.crc32('\n'.join(input_list).encode('UTF-8')), "reference_bytes": sum([os.path.getsize(ref_path+j) for j in os.listdir(ref_path)])}}
+		print("## Synthetic references:", len(species_dict), "genera //", suite_res["config"]["reference_bytes"], "bytes // inputs:", name_count, "// rates:", rates)
+		#
+		cold_res = None
+		for sb_1 in range(max(1, repeat)):
+			suite_snapshot_clear(ref_path)
+			sb_res = suite_call(ref_path, input_path, work_path, cut_dist, job_count, "load")
+			if cold_res is None or sb_res["load_sec"] < cold_res["load_sec"]:
+				cold_res = sb_res
+		map_res = None
+		for sb_1 in range(max(1, repeat)):
+			sb_res = suite_call(ref_path, input_path, work_path, cut_dist, job_count, "map")
+			if map_res is None or sb_res["map_sec"] < map_res["map_sec"]:
+				map_res = sb_res
+		suite_res["result"] = {"load_cold_sec": cold_res["load_sec"], "load_warm_sec": map_res["load_sec"], "index_sec": map_res["index_sec"], "map_sec": map_res["map_sec"],
+		"names_per_sec": map_res["names_per_sec"], "peak_rss_mb": map_res["peak_rss_mb"], "worker_peak_rss_mb": map_res["worker_peak_rss_mb"],
+		"result_md5": map_res.get("result_md5", ""), "stages": map_res["stages"]}
+	finally:
+		shutil.rmtree(base_path, ignore_errors=True)
+	#
+	print('\t'.join(["load_cold_sec", "load_warm_sec", "index_sec", "map_sec", "names_per_sec", "peak_rss_mb", "worker_peak_rss_mb"]))
+	print('\t'.join(["%.4f" % suite_res["result"][j] for j in ["load_cold_sec", "load_warm_sec", "index_sec", "map_sec"]]+["%.0f" % suite_res["result"]["names_per_sec"],
+	"%.1f" % suite_res["result"]["peak_rss_mb"], "%.1f" % suite_res["result"]["worker_peak_rss_mb"]]))
+	print('\t'.join(["stage", "calls", "names_per_sec", "mean_ms", "p99_ms", "time_share_pct"]))
+	for sb_2 in suite_res["result"]["stages"]:
+		sb_stage = suite_res["result"]["stages"][sb_2]
+		print('\t'.join([sb_2, str(sb_stage["calls"]), "%.0f" % sb_stage["names_per_sec"], "%.4f" % sb_stage["mean_ms"], "%.4f" % sb_stage["p99_ms"], "%.2f" % sb_stage["time_share_pct"]]))
+	if len(save_file) >= 1:
+		with open(save_file, 'w', encoding = 'UTF-8') as res_f:
+			json.dump(suite_res, res_f, indent = 1)
+		print("## Baseline saved:", save_file)
+	sb_count = 0
+	if len(compare_file) >= 1:
+		sb_count = suite_compare(suite_res, compare_file, tolerance)
+	print("#### Mapping pipeline benchmark completed ####")
+	if sb_count >= 1:
+		print("- PERFORMANCE REGRESSION DETECTED:", sb_count, "metric(s)")
+		sys.exit(1)
+	return suite_res
+
+## Main function
+
+def phylosophos_benchmark():
+	bench_type = "lev"
+	pair_count = 2000
+	repeat = 3
+	genus_count = 2000
+	seed = 1
+	rates = dict(suite_rates)
+	cut_dist = 3
+	job_count = 1
+	save_file = ""
+	compare_file = ""
+	tolerance = suite_tolerance
+	for pb_1 in range(1, len(sys.argv)-1):
+		if sys.argv[pb_1].lower() in ["-b", "-bench"]:
+			bench_type = sys.argv[pb_1+1].lower()
+		elif sys.argv[pb_1].lower() in ["-n", "-size"]:
+			pair_count = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-repeat"]:
+			repeat = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-g", "-genera"]:
+			genus_count = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-seed"]:
+			seed = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower()[1:] in rates:
+			rates[sys.argv[pb_1].lower()[1:]] = float(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-l", "-lev", "-cutoff"]:
+			cut_dist = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-j", "-jobs"]:
+			job_count = int(sys.argv[pb_1+1])
+		elif sys.argv[pb_1].lower() in ["-save"]:
+			save_file = sys.argv[pb_1+1]
+		elif sys.argv[pb_1].lower() in ["-compare"]:
+			compare_file = sys.argv[pb_1+1]
+		elif sys.argv[pb_1].lower() in ["-tol", "-tolerance"]:
+			tolerance = float(sys.argv[pb_1+1])
+	#
+	if bench_type == "lev":
+		lev_dist_benchmark(pair_count, repeat)
+	elif bench_type == "batch":
+		lev_batch_benchmark(pair_count, repeat)
+	elif bench_type == "levcheck":
+		lev_check(pair_count)
+	elif bench_type == "lineage":
+		lineage_benchmark(pair_count*100, repeat)
+	elif bench_type == "candidate":
+		candidate_benchmark(pair_count, repeat)
+	elif bench_type == "token":
+		token_benchmark(pair_count, repeat)
+	elif bench_type == "suite":
+		suite_benchmark(pair_count, genus_count, seed, rates, cut_dist, job_count, repeat, save_file, compare_file, tolerance)
+	else:
+		print("- ERROR OCCURRED: UNKNOWN BENCHMARK TYPE", bench_type)
+
+#### END OF SCRIPT
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ANALYSIS/PROCESSING MODULE - MAPPING CACHE SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import copy
+import hashlib
+import os
+import pickle
+
+from collections import OrderedDict
+from phylosophos import ps_snapshot
+
+#### Preset parameters
+
+cache_dir = "cache\\"
+cache_file = "mapping_cache.pkl"
+cache_version = 2 # Increase whenever the mapping algorithm changes its results
+cache_entry_max = 100000 # Mapping results kept in memory when no persistent cache size is set
+
+#### Function definition
+
+## Mapping cache
+#
+# Mapping results are keyed on (pre-corrected string, chosen reference, cutoff).
+# The reference set itself is identified by a signature of the reference data files:
+# a persisted cache is discarded as a whole once any reference is updated.
+# Entries are kept in least-recently-used order and bounded while mapping: cache_size entries when set
+# (the same entries are written to disk), otherwise cache_entry_max, so memory does not grow with the input size.
+
+def cache_signature(ref_path, tr_list):
+	cs_list = [cache_version, sorted(tr_list)]
+	for cs_1 in sorted(tr_list):
+		cs_list.append(ps_snapshot.snapshot_source_stat(ref_path, cs_1))
+	return hashlib.sha1(repr(cs_list).encode('UTF-8')).hexdigest()
+
+def cache_new(signature, cache_size):
+	return {"signature": signature, "size": cache_size, "entries": OrderedDict(), "hit": 0, "miss": 0, "stored": 0}
+
+def cache_load(ref_path, tr_list, cache_size): # cache_size = 0: in-memory cache for the current run only
+	map_cache = cache_new(cache_signature(ref_path, tr_list), cache_size)
+	if cache_size <= 0:
+		return map_cache
+	try:
+		with open(ref_path+cache_dir+cache_file, 'rb') as inp_f:
+			cl_signature = pickle.load(inp_f)
+			if cl_signature == map_cache["signature"]:
+				map_cache["entries"] = pickle.load(inp_f)
+				map_cache["stored"] = len(map_cache["entries"])
+	except (OSError, EOFError, pickle.UnpicklingError):
+		pass
+	return map_cache
+
+def cache_save(ref_path, map_cache):
+	if map_cache["size"] <= 0:
+		return
+	cache_trim(map_cache)
+	os.makedirs(ref_path+cache_dir, exist_ok=True)
+	cs_file = ref_path+cache_dir+cache_file
+	with open(cs_file+".tmp", 'wb') as res_f:
+		pickle.dump(map_cache["signature"], res_f, protocol=pickle.HIGHEST_PROTOCOL)
+		pickle.dump(map_cache["entries"], res_f, protocol=pickle.HIGHEST_PROTOCOL)
+	os.replace(cs_file+".tmp", cs_file)
+
+def cache_key(string, ref_sel, cut_dist):
+	return (string, ref_sel, cut_dist)
+
+def cache_get(map_cache, key): # Returns a private copy (the export step edits results in place), or None
+	if key not in map_cache["entries"]:
+		return None
+	map_cache["entries"].move_to_end(key)
+	return copy.deepcopy(map_cache["entries"][key])
+
+def cache_put(map_cache, key, result):
+	map_cache["entries"][key] = copy.deepcopy(result)
+	map_cache["entries"].move_to_end(key)
+	cache_trim(map_cache)
+
+def cache_trim(map_cache): # Least recently used results go first
+	ct_max = map_cache["size"] if map_cache["size"] >= 1 else cache_entry_max
+	while len(map_cache["entries"]) > ct_max:
+		map_cache["entries"].popitem(last=False)
+
+def cache_report(map_cache):
+	cr_total = map_cache["hit"]+map_cache["miss"]
+	print("## Mapping cache: hits", map_cache["hit"], "/ misses", map_cache["miss"], "/ hit rate", "%.1f%%" % (100.0*map_cache["hit"]/max(cr_total, 1)), "/ entries", len(map_cache["entries"]), "(" + str(map_cache["stored"]) + " loaded from disk)")
+
+#### END OF SCRIPT
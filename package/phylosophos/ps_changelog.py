@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### INITIALIZE MODULE - REFERENCE CHANGELOG SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import datetime
+import hashlib
+import os
+import shutil
+
+#### Preset parameters
+
+changelog_dir = "changelog\\"
+changelog_header = ["Update_date", "Reference", "Change_type", "Node_ID", "Previous_name", "Current_name",
+"Previous_synonyms", "Current_synonyms", "Previous_lineage", "Current_lineage", "Previous_genus_nodes", "Current_genus_nodes"]
+
+#### Function definition
+
+## Reference dictionary diff
+#
+# Node dictionaries are compared line by line through 8-byte digests, so only the lines of changed taxa are kept in memory.
+# Node changes: added / removed / renamed (scientific name changed) / modified (synonyms, rank or lineage changed).
+# Genus changes: genus_added / genus_removed / genus_modified (different node IDs); their node ID lists go to the genus node columns.
+
+def node_dict_digest(file_path):
+	nd_res = {}
+	with open(file_path, 'rb') as inp_f:
+		for line in inp_f:
+			nd_res[line.split(b'\t', 1)[0]] = hashlib.blake2b(line, digest_size=8).digest()
+	return nd_res
+
+def node_dict_lines(file_path, id_set):
+	nl_res = {}
+	with open(file_path, 'rb') as inp_f:
+		for line in inp_f:
+			nl_id = line.split(b'\t', 1)[0]
+			if nl_id in id_set:
+				nl_res[nl_id] = line.decode('UTF-8', errors='ignore').rstrip('\r\n').split('\t')
+	return nl_res
+
+def genus_dict_read(file_path):
+	gr_res = {}
+	with open(file_path, 'rb') as inp_f:
+		for line in inp_f:
+			ssl = line.decode('UTF-8', errors='ignore').rstrip('\r\n').split('\t')
+			gr_res[ssl[1]] = ssl[2]
+	return gr_res
+
+def reference_diff(prev_dir, cur_dir, ref_type): # Returns [change type, node ID, previous fields, current fields] rows
+	rd_file = ref_type+"_node_dict.txt"
+	rd_prev = node_dict_digest(prev_dir+rd_file)
+	rd_change = {}
+	with open(cur_dir+rd_file, 'rb') as inp_f:
+		for line in inp_f:
+			rd_id = line.split(b'\t', 1)[0]
+			if rd_id not in rd_prev:
+				rd_change[rd_id] = "added"
+			elif rd_prev[rd_id] != hashlib.blake2b(line, digest_size=8).digest():
+				rd_change[rd_id] = "changed"
+			rd_prev.pop(rd_id, None)
+	for rd_1 in rd_prev: # Node IDs left over are no longer in the current dictionary
+		rd_change[rd_1] = "removed"
+	rd_old = node_dict_lines(prev_dir+rd_file, set([j for j in rd_change if rd_change[j] != "added"]))
+	rd_new = node_dict_lines(cur_dir+rd_file, set([j for j in rd_change if rd_change[j] != "removed"]))
+	#
+	rd_res = []
+	for rd_2 in rd_change:
+		rd_prev_f = rd_old.get(rd_2, ["", "", "", "", "", ""])
+		rd_cur_f = rd_new.get(rd_2, ["", "", "", "", "", ""])
+		rd_type = rd_change[rd_2]
+		if rd_type == "changed":
+			rd_type = "renamed" if rd_prev_f[1] != rd_cur_f[1] else "modified"
+		rd_res.append([rd_type, rd_2.decode('UTF-8', errors='ignore'), rd_prev_f, rd_cur_f])
+	#
+	rd_file = ref_type+"_genus_dict.txt"
+	rd_prev_g = genus_dict_read(prev_dir+rd_file)
+	rd_cur_g = genus_dict_read(cur_dir+rd_file)
+	for rd_3 in rd_cur_g:
+		if rd_3 not in rd_prev_g:
+			rd_res.append(["genus_added", "", ["", rd_3, ""], ["", rd_3, rd_cur_g[rd_3]]])
+		elif rd_prev_g[rd_3] != rd_cur_g[rd_3]:
+			rd_res.append(["genus_modified", "", ["", rd_3, rd_prev_g[rd_3]], ["", rd_3, rd_cur_g[rd_3]]])
+	for rd_4 in rd_prev_g:
+		if rd_4 not in rd_cur_g:
+			rd_res.append(["genus_removed", "", ["", rd_4, rd_prev_g[rd_4]], ["", rd_4, ""]])
+	return rd_res
+
+## Changelog
+#
+# Archives (pp_ref/previous/<stamp>) and changelogs are keyed on the update date (yymmdd); a later update of the same day
+# gets a sequence suffix (yymmdd-2, yymmdd-3, ...), so no earlier archive or changelog is ever overwritten.
+
+def changelog_stamp(pp_dir, update_date=""): # First update stamp of the day not used by an archive or a changelog
+	if len(update_date) == 0:
+		update_date = str(datetime.datetime.now())[2:10].replace("-", "")
+	cs_res = update_date
+	cs_count = 1
+	while os.path.exists(pp_dir+"previous\\"+cs_res) or len([j for j in os.listdir(pp_dir+changelog_dir) if j.endswith("_changelog_"+cs_res+".tsv")] if os.path.isdir(pp_dir+changelog_dir) else []) >= 1:
+		cs_count += 1
+		cs_res = update_date+"-"+str(cs_count)
+	return cs_res
+
+def changelog_file_name(pp_dir, ref_type, update_date):
+	return pp_dir+changelog_dir+ref_type+"_changelog_"+update_date+".tsv"
+
+def changelog_write(pp_dir, ref_type, change_list, update_date):
+	os.makedirs(pp_dir+changelog_dir, exist_ok=True)
+	cw_file = changelog_file_name(pp_dir, ref_type, update_date)
+	if os.path.isfile(cw_file) == True:
+		raise FileExistsError("CHANGELOG ALREADY EXISTS: "+cw_file)
+	with open(cw_file, 'w', encoding = 'UTF-8', errors = 'ignore') as res_f:
+		res_f.write('\t'.join(changelog_header) + '\n')
+		for cw_1 in change_list:
+			if cw_1[0].startswith("genus_"): # Genus rows: generic epithet & node ID lists only
+				res_f.write('\t'.join([update_date, ref_type, cw_1[0], "", cw_1[2][1], cw_1[3][1], "", "", "", "", cw_1[2][2], cw_1[3][2]]) + '\n')
+			else:
+				res_f.write('\t'.join([update_date, ref_type, cw_1[0], cw_1[1], cw_1[2][1], cw_1[3][1], cw_1[2][2], cw_1[3][2], cw_1[2][4], cw_1[3][4], "", ""]) + '\n')
+
+def changelog_read(file_path): # Returns a list of {column: value} dictionaries
+	cr_res = []
+	with open(file_path, encoding = 'UTF-8', errors = 'ignore') as inp_f:
+		cr_header = inp_f.readline().rstrip('\n').split('\t')
+		for line in inp_f:
+			ssl = line.rstrip('\n').split('\t')
+			cr_res.append({cr_header[j]: ssl[j] for j in range(min(len(cr_header), len(ssl)))})
+	return cr_res
+
+def changelog_collect(pp_dir, since_date=""): # Changelog files written on or after since_date (yymmdd; "" = all)
+	cc_res = []
+	if os.path.isdir(pp_dir+changelog_dir) == False:
+		return cc_res
+	for cc_1 in sorted(os.listdir(pp_dir+changelog_dir)):
+		if cc_1.endswith(".tsv") and "_changelog_" in cc_1 and cc_1[:-4].split("_")[-1] >= since_date: # yymmdd-2 sorts after yymmdd
+			cc_res.append(pp_dir+changelog_dir+cc_1)
+	return cc_res
+
+## Re-mapping delta
+#
+# Collects what a previous mapping result may depend on: node IDs that were renamed, modified or removed (per reference),
+# every old & new scientific name and synonym of a changed taxon, and the generic epithets (first words) of those names.
+
+def changelog_delta(file_list):
+	cd_res = {"ids": {}, "names": set(), "genera": set()}
+	for cd_1 in file_list:
+		for cd_2 in changelog_read(cd_1):
+			if cd_2["Change_type"].startswith("genus_"): # Only the generic epithet; node ID lists are not names
+				cd_res["genera"].add((cd_2["Current_name"] or cd_2["Previous_name"]).lower())
+				continue
+			if cd_2["Reference"] not in cd_res["ids"]:
+				cd_res["ids"][cd_2["Reference"]] = set()
+			cd_res["ids"][cd_2["Reference"]].add(cd_2["Node_ID"])
+			for cd_3 in [cd_2["Previous_name"], cd_2["Current_name"]]+cd_2["Previous_synonyms"].split("|")+cd_2["Current_synonyms"].split("|"):
+				if len(cd_3.strip()) >= 1:
+					cd_res["names"].add(cd_3.strip().lower())
+					cd_res["genera"].add(cd_3.split()[0].lower())
+	return cd_res
+
+## Unchanged references
+#
+# A reference rebuilt without any change gets its archived dictionaries back (timestamps included), so its compiled
+# snapshot and the persistent mapping cache stay valid. Changed references are recompiled as a whole: the raw name
+# dictionary depends on the order of the whole file (canonical names win over synonyms, partial corrections override
+# each other), so it cannot be patched entry by entry.
+
+def file_digest(file_path):
+	fd_res = hashlib.blake2b(digest_size=16)
+	with open(file_path, 'rb') as inp_f:
+		for fd_1 in iter(lambda: inp_f.read(1 << 20), b''):
+			fd_res.update(fd_1)
+	return fd_res.digest()
+
+def reference_keep(prev_dir, pp_dir, ref_type): # Returns True if the archived dictionaries were restored
+	rk_files = [ref_type+"_node_dict.txt", ref_type+"_genus_dict.txt"]
+	for rk_1 in rk_files:
+		if os.path.isfile(prev_dir+rk_1) == False or os.path.isfile(pp_dir+rk_1) == False:
+			return False
+		if os.path.getsize(prev_dir+rk_1) != os.path.getsize(pp_dir+rk_1) or file_digest(prev_dir+rk_1) != file_digest(pp_dir+rk_1):
+			return False
+	for rk_2 in rk_files:
+		shutil.copy2(prev_dir+rk_2, pp_dir+rk_2)
+	print("## Reference unchanged:", ref_type, "- previous files kept (compiled snapshot still valid)")
+	return True
+
+## Reference changelog
+#
+# The references are rebuilt from the downloaded dumps; this records how they differ from the archive.
+
+def reference_changelog(prev_dir, pp_dir, ref_type, update_date):
+	for rc_1 in [ref_type+"_node_dict.txt", ref_type+"_genus_dict.txt"]:
+		if os.path.isfile(prev_dir+rc_1) == False or os.path.isfile(pp_dir+rc_1) == False:
+			print("## Reference changelog:", ref_type, "- no previous reference found (no changelog written)")
+			return None
+	rc_change = reference_diff(prev_dir, pp_dir, ref_type)
+	changelog_write(pp_dir, ref_type, rc_change, update_date)
+	rc_count = {}
+	for rc_2 in rc_change:
+		rc_count[rc_2[0]] = rc_count.get(rc_2[0], 0)+1
+	print("## Reference changelog:", ref_type, "- changes:", len(rc_change), rc_count if len(rc_count) >= 1 else "(unchanged)")
+	return rc_change
+
+#### END OF SCRIPT
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### INITIALIZE MODULE - REFERENCE INDEX SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import datetime
+import numpy
+
+#### Function definition
+
+## Genus fuzzy index
+#
+# A generic epithet is a correction candidate when its length differs by less than cut_dist,
+# its 27-bin letter count differs in at most cut_dist bins (alpha_compare) and lev_dist <= cut_dist.
+# The bins are split into cut_dist+2 blocks: two names differing in <= cut_dist bins agree on at least two whole blocks,
+# so (length, block pair, block pair counts) buckets return every name the linear scan would accept, and few of the rest.
+
+def genus_index_blocks(cut_dist):
+	gi_blocks = [[j for j in range(27) if j % (cut_dist+2) == k] for k in range(cut_dist+2)]
+	return [gi_blocks[j]+gi_blocks[k] for j in range(len(gi_blocks)) for k in range(j+1, len(gi_blocks))]
+
+def genus_index_build(g_dict, cut_dist):
+	gi_blocks = genus_index_blocks(cut_dist)
+	gi_names = list(g_dict.keys())
+	gi_buckets = {}
+	for gi_1 in range(len(gi_names)):
+		for gi_2 in range(len(gi_blocks)):
+			gi_key = (len(gi_names[gi_1]), gi_2, tuple([g_dict[gi_names[gi_1]][0][j] for j in gi_blocks[gi_2]]))
+			if gi_key not in gi_buckets:
+				gi_buckets[gi_key] = []
+			gi_buckets[gi_key].append(gi_1)
+	gi_alpha = numpy.array([g_dict[j][0] for j in gi_names], dtype=numpy.int16).reshape(len(gi_names), 27)
+	return {"cut_dist": cut_dist, "blocks": gi_blocks, "buckets": gi_buckets, "names": gi_names, "alpha": gi_alpha}
+
+def genus_index_query(g_index, first_alpha, first_len): # Same result as scanning g_dict with the length & alpha_compare filters
+	cut_dist = g_index["cut_dist"]
+	gq_cand = set()
+	for gq_1 in range(first_len-cut_dist+1, first_len+cut_dist):
+		for gq_2 in range(len(g_index["blocks"])):
+			gq_key = (gq_1, gq_2, tuple([first_alpha[j] for j in g_index["blocks"][gq_2]]))
+			if gq_key in g_index["buckets"]:
+				gq_cand.update(g_index["buckets"][gq_key])
+	if len(gq_cand) == 0:
+		return []
+	gq_cand = numpy.array(sorted(gq_cand))
+	gq_diff = (g_index["alpha"][gq_cand] != numpy.array(first_alpha, dtype=numpy.int16)).sum(axis=1)
+	return [g_index["names"][j] for j in gq_cand[gq_diff <= cut_dist]]
+
+def genus_index_get(ri_dict, rg_dict, ref_type, cut_dist):
+	if "genus" not in ri_dict:
+		ri_dict["genus"] = {}
+	if ref_type not in ri_dict["genus"]:
+		ri_dict["genus"][ref_type] = {}
+	if cut_dist not in ri_dict["genus"][ref_type]:
+		ri_dict["genus"][ref_type][cut_dist] = genus_index_build(rg_dict[ref_type], cut_dist)
+	return ri_dict["genus"][ref_type][cut_dist]
+
+## Cross-reference synonym bridge
+#
+# Recursive mapping carries exact matches of one reference over to the others: the scientific names of the matched nodes
+# (and those of their synonyms contained in the scientific name) are looked up in the target reference.
+# The bridge keeps these names for every node used so far, and the target nodes for every name set,
+# so a recursive mapping repeated over the inputs of a reference set is answered by dictionary lookups.
+
+bridge_cache_size = 100000 # Entries kept per bridge table
+
+def bridge_get(ri_dict):
+	if "bridge" not in ri_dict:
+		ri_dict["bridge"] = {"names": {}, "match": {}}
+	return ri_dict["bridge"]
+
+def bridge_names(bridge, rn_dict, ref_type, node_id):
+	bn_key = (ref_type, node_id)
+	if bn_key not in bridge["names"]:
+		if len(bridge["names"]) >= bridge_cache_size:
+			bridge["names"].clear()
+		bn_node = rn_dict[ref_type][node_id]
+		bn_list = [bn_node[1]]
+		for bn_1 in bn_node[2].split("|"):
+			if len(bn_1) >= 1 and bn_1 in bn_node[1]:
+				bn_list.append(bn_1)
+		bridge["names"][bn_key] = bn_list
+	return bridge["names"][bn_key]
+
+def bridge_match(ri_dict, rn_dict, rr_dict, src_list, tgt_ref): # src_list: [[reference type, node IDs], ...]; returns node IDs of tgt_ref
+	bridge = bridge_get(ri_dict)
+	bm_names = set()
+	for bm_1 in src_list:
+		for bm_2 in bm_1[1]:
+			bm_names.update(bridge_names(bridge, rn_dict, bm_1[0], bm_2))
+	bm_key = (tgt_ref, tuple(sorted(bm_names)))
+	if bm_key not in bridge["match"]:
+		if len(bridge["match"]) >= bridge_cache_size:
+			bridge["match"].clear()
+		bm_res = []
+		for bm_3 in bm_key[1]: # Sorted by the original spelling, looked up in lowercase
+			if len(bm_3) >= 1 and bm_3.lower() in rr_dict[tgt_ref]:
+				bm_res.extend(rr_dict[tgt_ref][bm_3.lower()])
+		bridge["match"][bm_key] = bm_res
+	return list(bridge["match"][bm_key])
+
+## Index import
+
+def phylosophos_index_build(tr_list, rn_dict, rg_dict, rr_dict, cut_dist):
+
+	print("#### Reference index build started ####", end='\r')
+	time_start = datetime.datetime.now()
+
+	ri_dict = {}
+
+	# Genus fuzzy index (only the smallest genus reference is scanned by in_depth_edit_dist)
+
+	if cut_dist >= 1 and len(rg_dict) >= 1:
+		rg_min = min([len(rg_dict[j]) for j in rg_dict])
+		for pib_1 in tr_list:
+			if len(rg_dict[pib_1]) == rg_min:
+				genus_index_get(ri_dict, rg_dict, pib_1, cut_dist)
+				print(pib_1, "genus index", len(ri_dict["genus"][pib_1][cut_dist]["buckets"]), datetime.datetime.now()-time_start, "                ", end='\r')
+
+	print("                                                                                ", end='\r')
+	print("#### Reference index build completed ####")
+	return ri_dict
+
+#### END OF SCRIPT
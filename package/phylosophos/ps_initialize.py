@@ -21,6 +21,8 @@ import numpy
 import os
 import sys
 
+from phylosophos import ps_normalize, ps_snapshot
+
 #### Preset parameters
 
 alpha_numeric = {"a":0, "b":1, "c":2, "d":3, "e":4, "f":5, "g":6, "h":7, "i":8, "j":9, 
@@ -99,11 +101,64 @@ def phylosophos_initialization(arg_list):
 				break
 	print("## Manual curation data usage:", mc_stat)
 
+	# STEP 5: PARALLEL MAPPING PROCESSES
+
+	job_count = 1
+	if "-j" in arg_list or "-jobs" in arg_list:
+		for pi_4 in range(len(arg_list)-1):
+			if arg_list[pi_4].lower() in ["-j", "-jobs"]:
+				job_count = int(arg_list[pi_4+1])
+				break
+	if job_count <= 0: # 0 or negative: use every available core
+		job_count = os.cpu_count() or 1
+	print("## Mapping processes:", job_count)
+
+	# STEP 6: PERSISTENT MAPPING CACHE
+
+	cache_size = 0 # 0: repeated names are only cached within the current run
+	if "-cache" in arg_list:
+		for pi_5 in range(len(arg_list)-1):
+			if arg_list[pi_5].lower() in ["-cache"]:
+				cache_size = max(0, int(arg_list[pi_5+1]))
+				break
+	print("## Persistent mapping cache size:", cache_size)
+
+	# STEP 7: RESUME FROM A PARTIAL RESULT FILE
+
+	resume_file = ""
+	if "-resume" in arg_list:
+		for pi_6 in range(len(arg_list)-1):
+			if arg_list[pi_6].lower() in ["-resume"]:
+				resume_file += arg_list[pi_6+1]
+				break
+	if len(resume_file) >= 1:
+		print("## Resumed result file:", resume_file)
+
+	# STEP 8: RE-MAPPING OF A PREVIOUS RESULT FILE AFTER A REFERENCE UPDATE
+
+	remap_file = ""
+	if "-remap" in arg_list:
+		for pi_7 in range(len(arg_list)-1):
+			if arg_list[pi_7].lower() in ["-remap"]:
+				remap_file += arg_list[pi_7+1]
+				break
+	if len(remap_file) >= 1:
+		print("## Re-mapped result file:", remap_file)
+
+	# STEP 9: PER-STAGE PROFILING
+
+	profile_stat = False
+	for pi_8 in arg_list[1:]:
+		if pi_8.lower() in ["-profile"]:
+			profile_stat = True
+	if profile_stat == True:
+		print("## Stage profiling: True (report written next to the result file)")
+
 	print("#### PhyloSophos analysis started ####")
 
 	# RETURN PARAMETERS
 
-	return ref_type, input_type, input_file_name, default_cutoff, mc_stat
+	return ref_type, input_type, input_file_name, default_cutoff, mc_stat, job_count, cache_size, resume_file, remap_file, profile_stat
 
 def phylosophos_help():
 
@@ -136,6 +191,16 @@ def phylosophos_help():
 	print("")
 	print("* MANUAL CURATION (-m, -manual, -curation): APPLICATION OF MANUALLY CURATED DATA (DEFAULT = FALSE)")
 	print("")
+	print("* PARALLEL MAPPING (-j, -jobs): NUMBER OF MAPPING PROCESSES (DEFAULT = 1, 0 = ALL AVAILABLE CORES)")
+	print("")
+	print("* MAPPING CACHE (-cache): NUMBER OF MAPPING RESULTS KEPT ON DISK FOR LATER RUNS (DEFAULT = 0: CURRENT RUN ONLY)")
+	print("")
+	print("* RESUME (-resume): PARTIAL RESULT FILE TO BE COMPLETED (ALREADY WRITTEN ROWS ARE KEPT & SKIPPED)")
+	print("")
+	print("* RE-MAPPING (-remap): PREVIOUS RESULT FILE TO BE UPDATED AFTER A REFERENCE UPDATE (ONLY AFFECTED ROWS ARE RE-MAPPED)")
+	print("")
+	print("* PROFILING (-profile): PER-STAGE CALLS, HITS, EARLY EXITS, EDIT DISTANCE CANDIDATES & LATENCY (_PROFILE.JSON/.TSV NEXT TO THE RESULT FILE)")
+	print("")
 	print("[3] OPTIONAL UPDATE PARAMETER")
 	print("")
 	print("* REFERENCE RAW DATA UPDATE: FORCED TAXONOMIC METADATA DOWNLOAD & UPDATE")
@@ -146,6 +211,22 @@ def phylosophos_help():
 
 ##
 
+def phylosophos_input_stream(file_path): # Input names are read lazily, one line at a time
+	with open(file_path, encoding = 'utf-8') as inp_f:
+		for line in inp_f:
+			yield line.rstrip('\n')
+
+def phylosophos_input_count(file_path): # Number of input lines (progress ETA), counted without decoding
+	ic_count = 0
+	ic_last = b"\n"
+	with open(file_path, 'rb') as inp_f:
+		for ic_block in iter(lambda: inp_f.read(1048576), b""):
+			ic_count += ic_block.count(b"\n")
+			ic_last = ic_block[-1:]
+	if ic_last != b"\n":
+		ic_count += 1
+	return ic_count
+
 def phylosophos_input_import(i_type, i_fname):
 
 	input_dir = os.getcwd()+"\\input\\"
@@ -157,32 +238,19 @@ def phylosophos_input_import(i_type, i_fname):
 
 	if i_type == 0:		
 		for pii_1 in os.listdir(input_dir):
-			pii_sub = []
-			with open(input_dir+pii_1, encoding = 'utf-8') as inp_f:
-				for line in inp_f:
-					pii_sub.append(line.rstrip('\n'))
-			pii_input_list.append([pii_1, pii_sub])
+			pii_input_list.append([pii_1, phylosophos_input_stream(input_dir+pii_1), phylosophos_input_count(input_dir+pii_1)])
 
 	# IMPORT FROM SPECIFIC FILE
 
 	elif i_type == 1:
 		if i_fname in os.listdir(input_dir):
-			pii_sub = []
-			with open(input_dir+i_fname, encoding = 'utf-8') as inp_f:
-				for line in inp_f:
-					pii_sub.append(line.rstrip('\n'))
-			pii_input_list.append([i_fname, pii_sub])
+			pii_input_list.append([i_fname, phylosophos_input_stream(input_dir+i_fname), phylosophos_input_count(input_dir+i_fname)])
+		elif os.path.isfile(i_fname):
+			pii_input_list.append([i_fname, phylosophos_input_stream(i_fname), phylosophos_input_count(i_fname)])
 		else:
-			try:
-				pii_sub = []
-				with open(i_fname, encoding = 'utf-8') as inp_f:
-					for line in inp_f:
-						pii_sub.append(line.rstrip('\n'))
-				pii_input_list.append([i_fname, pii_sub])
-			except:
-				print("- ERROR OCCURRED: INPUT FILE NOT FOUND")
-				print("- ANALYSIS TERMINATED")
-				exit()
+			print("- ERROR OCCURRED: INPUT FILE NOT FOUND")
+			print("- ANALYSIS TERMINATED")
+			exit()
 
 	print("#### Input file import completed ####")
 
@@ -201,32 +269,48 @@ def alpha_count(string):
 	return tar_code
 
 def ref_partial_correction(string):
+	return ps_normalize.token_correction(string)
+
+def phylosophos_ref_parse(ref_path, ref_type):
+	n_ref_file = ref_type+"_node_dict.txt"
+	g_ref_file = ref_type+"_genus_dict.txt"
 	#
-	ignore_list = ['sp.', 'ssp.', 'genomosp.', 'genosp.', 'subsp.', 'var.', 'str.', 'f.', 'pv.', 'bv.', 's.', 's.l.', 
-	'al.', 'sect.', 'subgen.', 'nom.', 'no.', "species"]
-	dropout_list = ['cf.', 'aff.', 'nr.', 'n.', 's.n.', 'nov.', 'gen.', 'inval.']
-	hybrid_list = ['×', 'x', 'x']
+	raw_names_sub = {}
+	whole_names_sub = {}
+	whole_genus_sub = {}
+	canon_name_list = {}
 	#
-	stat_code = [0, 0, 0]
-	tar_temp = []
+	with open(ref_path+n_ref_file) as inp_f:
+		for line in inp_f:
+			ssl = line.rstrip('\n').split('\t')
+			ssl[0] = sys.intern(ssl[0]) # Node IDs are shared by every dictionary (and by the snapshot)
+			whole_names_sub[ssl[0]] = ssl[0:6]
+			#
+			canon_name_list[ssl[1].lower()] = ssl[0]
+			if ssl[1].lower() not in raw_names_sub:
+				raw_names_sub[ssl[1].lower()] = []
+			raw_names_sub[ssl[1].lower()].append(ssl[0])
 	#
-	ssl = string.lower().split()
-	for ic_1 in ssl:
-		if ic_1 in ignore_list:
-			stat_code[0] = 1
-		elif ic_1 in dropout_list:
-			stat_code[1] = 1
-		elif ic_1 in hybrid_list:
-			stat_code[2] = 1
-		elif '.' in ic_1 or ',' in ic_1:
-			if len(ssl) >= 2:
-				continue
-		elif '<' in ic_1 or '>' in ic_1:
-			tar_temp.append(ic_1.split('>')[0].split('<')[0])
-		else:
-			tar_temp.append(ic_1)
+	for ri_1 in whole_names_sub:
+		ssl = whole_names_sub[ri_1]
+		if len(ssl[2]) >= 1:
+			ssl_2 = [j for j in ssl[2].lower().split("|") if len(j) >= 1]
+			for ri_3 in ssl_2:
+				if ri_3 not in canon_name_list:
+					if ri_3 not in raw_names_sub:
+						raw_names_sub[ri_3] = []
+					raw_names_sub[ri_3].append(ssl[0])
+		if len(ssl[1].split()) >= 4:
+			corr_string, corr_stat = ref_partial_correction(ssl[1].lower())
+			if corr_stat[0] == 1 and sum(corr_stat) < 2 and ssl[1].split()[1].lower() != 'sp.':
+				raw_names_sub[corr_string] = [ssl[0]]
+	#
+	with open(ref_path+g_ref_file) as inp_f:
+		for line in inp_f:
+			ssl = line.rstrip('\n').split('\t')
+			whole_genus_sub[ssl[1].lower()] = [alpha_count(ssl[1]), [sys.intern(j) for j in ssl[2].split("|")]]
 	#
-	return ' '.join(tar_temp), stat_code
+	return whole_names_sub, whole_genus_sub, raw_names_sub
 
 def phylosophos_ref_import(ref_path):
 
@@ -245,43 +329,11 @@ def phylosophos_ref_import(ref_path):
 	whole_genus_list = {}
 
 	for ri_2 in range(len(ref_types)):
-		n_ref_file = ref_types[ri_2]+"_node_dict.txt"
-		g_ref_file = ref_types[ri_2]+"_genus_dict.txt"
-		#
-		raw_names_list[ref_types[ri_2]] = {}
-		whole_names_list[ref_types[ri_2]] = {}
-		whole_genus_list[ref_types[ri_2]] = {}
-		canon_name_list = {}
-		#
-		with open(ref_path+n_ref_file) as inp_f:
-			for line in inp_f:
-				ssl = line.rstrip('\n').split('\t')
-				whole_names_list[ref_types[ri_2]][ssl[0]] = ssl[0:6]
-				#
-				canon_name_list[ssl[1].lower()] = ssl[0]
-				if ssl[1].lower() not in raw_names_list[ref_types[ri_2]]:
-					raw_names_list[ref_types[ri_2]][ssl[1].lower()] = []
-				raw_names_list[ref_types[ri_2]][ssl[1].lower()].append(ssl[0])
-		#
-		with open(ref_path+n_ref_file) as inp_f:
-			for line in inp_f:
-				ssl = line.rstrip('\n').split('\t')
-				if len(ssl[2]) >= 1:
-					ssl_2 = [j for j in ssl[2].lower().split("|") if len(j) >= 1]
-					for ri_3 in ssl_2:
-						if ri_3 not in canon_name_list:
-							if ri_3 not in raw_names_list[ref_types[ri_2]]:
-								raw_names_list[ref_types[ri_2]][ri_3] = []
-							raw_names_list[ref_types[ri_2]][ri_3].append(ssl[0])
-				if len(ssl[1].split()) >= 4:
-					corr_string, corr_stat = ref_partial_correction(ssl[1].lower())
-					if corr_stat[0] == 1 and sum(corr_stat) < 2 and corr_string not in raw_names_list and ssl[1].split()[1].lower() != 'sp.':
-						raw_names_list[ref_types[ri_2]][corr_string] = [ssl[0]]
-		#
-		with open(ref_path+g_ref_file) as inp_f:
-			for line in inp_f:
-				ssl = line.rstrip('\n').split('\t')
-				whole_genus_list[ref_types[ri_2]][ssl[1].lower()] = [alpha_count(ssl[1]), ssl[2].split("|")]
+		ref_snapshot = ps_snapshot.snapshot_load(ref_path, ref_types[ri_2])
+		if ref_snapshot is None: # Missing or stale snapshot: parse text dictionaries and recompile (the written build is used as is)
+			ref_snapshot = ps_snapshot.snapshot_write(ref_path, ref_types[ri_2], *phylosophos_ref_parse(ref_path, ref_types[ri_2]))
+			gc.collect()
+		whole_names_list[ref_types[ri_2]], whole_genus_list[ref_types[ri_2]], raw_names_list[ref_types[ri_2]] = ref_snapshot
 		#
 		print(ref_types[ri_2], len(whole_genus_list[ref_types[ri_2]]), len(whole_names_list[ref_types[ri_2]]), len(raw_names_list[ref_types[ri_2]]), datetime.datetime.now()-time_start, "                ", end='\r')
 
@@ -289,5 +341,19 @@ def phylosophos_ref_import(ref_path):
 	print("#### Reference file import completed ####")
 	return ref_types, whole_names_list, whole_genus_list, raw_names_list
 
-#
+def phylosophos_snapshot_build(ref_path):
+
+	print("#### Reference snapshot compilation started ####")
 
+	ref_types = list(sorted(numpy.unique([j.split("_")[0] for j in os.listdir(ref_path) if j[-4:] == ".txt"])))
+	for psb_1 in ref_types:
+		if ps_snapshot.snapshot_fresh(ref_path, psb_1) == False:
+			ps_snapshot.snapshot_write(ref_path, psb_1, *phylosophos_ref_parse(ref_path, psb_1))
+			gc.collect()
+			print("## Reference snapshot compiled:", psb_1)
+		else:
+			print("## Reference snapshot up to date:", psb_1)
+
+	print("#### Reference snapshot compilation completed ####")
+
+#
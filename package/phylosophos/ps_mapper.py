@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ACCESSORY MODULE - LIBRARY API SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import asyncio
+import copy
+import itertools
+import os
+
+from phylosophos import ps_analysis, ps_cache, ps_index, ps_initialize, ps_progress
+
+#### Function definition
+
+## Library API
+#
+# Mapper loads the references (and their index) once and maps any number of names afterwards:
+#
+#	from phylosophos.ps_mapper import Mapper
+#	with Mapper(ref_type="ncbi", lev_cutoff=3) as mapper:
+#		mapper.map("Homo sapiens")["mapped_id"]
+#		mapper.map_many(name_list)
+#
+# Every result is the structured form of a result file row (ps_analysis.phylosophos_result_record), so the values are
+# those the command line version writes for the same name. Repeated names are served from the mapping cache.
+# With job_count >= 2, map_many() maps large batches in worker processes (one worker pool per process at a time).
+
+class Mapper:
+
+	def __init__(self, ref_path="", ref_type="ncbi", lev_cutoff=3, manual_stat=False, job_count=1, cache_size=0, learning_path=""):
+		if len(ref_path) == 0:
+			ref_path = os.getcwd()+"\\pp_ref\\"
+		if len(learning_path) == 0:
+			learning_path = os.getcwd()+"\\pp_learning\\"
+		self.ref_path = ref_path
+		self.ref_type = ref_type
+		self.lev_cutoff = lev_cutoff
+		self.job_count = job_count
+		self.tr_list, self.rn_dict, self.rg_dict, self.rr_dict = ps_initialize.phylosophos_ref_import(ref_path)
+		if ref_type not in self.tr_list:
+			raise ValueError("REFERENCE NOT FOUND IN "+ref_path+": "+ref_type+" (AVAILABLE: "+', '.join(self.tr_list)+")")
+		self.ri_dict = ps_index.phylosophos_index_build(self.tr_list, self.rn_dict, self.rg_dict, self.rr_dict, lev_cutoff)
+		self.map_cache = ps_cache.cache_load(ref_path, self.tr_list, cache_size)
+		self.manual_dict = {}
+		if manual_stat == True:
+			self.manual_dict = ps_analysis.phylosophos_manual_import(learning_path)
+		self.mp_pool = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def close(self): # Closes the worker pool & writes the persistent mapping cache (cache_size >= 1)
+		if self.mp_pool is not None:
+			ps_analysis.mapping_pool_close(self.mp_pool)
+			self.mp_pool = None
+		ps_cache.cache_save(self.ref_path, self.map_cache)
+
+	def pool_open(self, job_min=2): # Starts the worker pool now (otherwise it starts with the first large batch); job_min = 1: even a single process
+		po_count = max(self.job_count, 1)
+		if self.mp_pool is None and po_count >= job_min:
+			self.mp_pool = ps_analysis.mapping_pool_open([self.ref_type, self.lev_cutoff, self.tr_list, self.rn_dict, self.rg_dict, self.rr_dict, self.ri_dict], po_count)
+
+	def precalc(self, name): # Pre-corrected input, as in the result file
+		if name.lower() in self.manual_dict:
+			return self.manual_dict[name.lower()]
+		return ps_analysis.string_split_correction(name)
+
+	def map(self, name):
+		return self.map_many([name])[0]
+
+	def map_many(self, names): # List of result records, in the order of names (any iterable)
+		mm_res = []
+		mm_iter = iter(names)
+		mm_progress = ps_progress.progress_start("- Mapper")
+		mm_progress["mode"] = "silent"
+		while True:
+			raw_list = [str(j) for j in itertools.islice(mm_iter, ps_analysis.input_chunk_size)]
+			if len(raw_list) == 0:
+				break
+			precalc_list = [self.precalc(j) for j in raw_list]
+			if len(raw_list) >= ps_analysis.map_chunk_max:
+				self.pool_open()
+			mapping_results = ps_analysis.phylosophos_chunk_mapping(mm_progress, len(mm_res), precalc_list, self.ref_type, self.lev_cutoff,
+			self.tr_list, self.rn_dict, self.rg_dict, self.rr_dict, self.ri_dict, self.map_cache, self.mp_pool, self.job_count)
+			ps_analysis.phylosophos_result_correction(raw_list, mapping_results, self.tr_list, self.rn_dict)
+			for mm_1 in range(len(raw_list)):
+				mm_res.append(ps_analysis.phylosophos_result_record(raw_list[mm_1], precalc_list[mm_1], mapping_results[mm_1], self.ref_type, self.tr_list, self.rn_dict))
+		return mm_res
+
+	def result_header(self): # Columns of phylosophos_result_line() rows
+		return ps_analysis.phylosophos_result_header(self.tr_list)
+
+	def result_line(self, input_name, row_order, record): # Result file row of a record (input_name & row_order fill the first two columns)
+		return ps_analysis.phylosophos_result_line(input_name, row_order, record, self.tr_list)
+
+	def cache_stats(self):
+		return {"hit": self.map_cache["hit"], "miss": self.map_cache["miss"], "entries": len(self.map_cache["entries"])}
+
+## Asyncio front-end
+#
+# AsyncMapper answers concurrent "await mapper.resolve(name)" calls on top of a Mapper:
+#
+#	async with AsyncMapper(Mapper(ref_type="ncbi")) as mapper:
+#		record = await mapper.resolve("Homo sapiens")
+#		records = await mapper.resolve_many(name_list)
+#
+# Cached names and names settled by steps 1-3 (exact matching, closest taxon, rule-based screening) are answered inline.
+# Every other name continues with steps 4-6 (edit distance based & partial mapping) in the worker pool of the Mapper
+# (at least one process), so the event loop never waits for a fuzzy search. Identical names in flight share one job.
+
+class AsyncMapper:
+
+	def __init__(self, mapper):
+		self.mapper = mapper
+		self.mapper.pool_open(1)
+		self.inflight = {}
+		self.stats = {"inline": 0, "cache_hit": 0, "pooled": 0, "coalesced": 0}
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		await self.aclose()
+
+	async def aclose(self): # Closes the Mapper (worker pool & persistent cache) without blocking the event loop
+		await asyncio.get_running_loop().run_in_executor(None, self.mapper.close)
+
+	async def resolve(self, name):
+		name = str(name)
+		rs_mapper = self.mapper
+		rs_precalc = rs_mapper.precalc(name)
+		rs_key = ps_cache.cache_key(rs_precalc, rs_mapper.ref_type, rs_mapper.lev_cutoff)
+		if rs_key in self.inflight:
+			self.stats["coalesced"] += 1
+			rs_res = copy.deepcopy(await asyncio.shield(self.inflight[rs_key]))
+		else:
+			rs_res = ps_cache.cache_get(rs_mapper.map_cache, rs_key)
+			if rs_res is not None:
+				self.stats["cache_hit"] += 1
+				rs_mapper.map_cache["hit"] += 1
+			else:
+				rs_mapper.map_cache["miss"] += 1
+				rs_quick = ps_analysis.phylosophos_quick_mapping(rs_precalc, rs_mapper.ref_type, rs_mapper.lev_cutoff, rs_mapper.tr_list,
+				rs_mapper.rn_dict, rs_mapper.rg_dict, rs_mapper.rr_dict, rs_mapper.ri_dict)
+				if rs_quick[0] == True:
+					self.stats["inline"] += 1
+					rs_res = [rs_quick[1], rs_quick[2]]
+					ps_cache.cache_put(rs_mapper.map_cache, rs_key, rs_res)
+				else:
+					self.stats["pooled"] += 1
+					self.inflight[rs_key] = asyncio.ensure_future(self.fuzzy_run(rs_key, rs_precalc, rs_quick))
+					rs_res = copy.deepcopy(await asyncio.shield(self.inflight[rs_key]))
+		ps_analysis.phylosophos_result_correction([name], [rs_res], rs_mapper.tr_list, rs_mapper.rn_dict)
+		return ps_analysis.phylosophos_result_record(name, rs_precalc, rs_res, rs_mapper.ref_type, rs_mapper.tr_list, rs_mapper.rn_dict)
+
+	async def resolve_many(self, names):
+		return list(await asyncio.gather(*[self.resolve(j) for j in names]))
+
+	async def fuzzy_run(self, key, precalc, quick_state): # One pool job per distinct name; callers await it through shield(), so a cancelled caller does not cancel it
+		fr_loop = asyncio.get_running_loop()
+		fr_future = fr_loop.create_future()
+		def fr_done(result):
+			fr_loop.call_soon_threadsafe(lambda: fr_future.done() or fr_future.set_result(result))
+		def fr_error(error):
+			fr_loop.call_soon_threadsafe(lambda: fr_future.done() or fr_future.set_exception(error))
+		try:
+			self.mapper.mp_pool.apply_async(ps_analysis.fuzzy_worker, (precalc, quick_state), callback=fr_done, error_callback=fr_error)
+			fr_res = await fr_future
+			ps_cache.cache_put(self.mapper.map_cache, key, fr_res)
+			return fr_res
+		finally:
+			self.inflight.pop(key, None)
+
+#### END OF SCRIPT
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ANALYSIS/PROCESSING MODULE - TOKEN TABLE SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Preset parameters
+
+## Input correction (input_correction & ref_partial_correction): token -> stat code position
+
+correction_ignore = frozenset(['sp.', 'ssp.', 'genomosp.', 'genosp.', 'subsp.', 'var.', 'str.', 'f.', 'pv.', 'bv.', 's.', 's.l.',
+'al.', 'sect.', 'subgen.', 'nom.', 'no.', "species"])
+correction_dropout = frozenset(['cf.', 'aff.', 'nr.', 'n.', 's.n.', 'nov.', 'gen.', 'inval.'])
+correction_hybrid = frozenset(['×', 'x'])
+
+correction_table = {j: k for k, m in [[2, correction_hybrid], [1, correction_dropout], [0, correction_ignore]] for j in m} # Later (earlier checked) lists take precedence
+
+## Rule-based screening (tax_rule_screening): token -> screening code, the lowest code wins
+
+screening_codes = [
+[90, ['collection', 'construct', 'library', 'plasmid', 'sequence', 'transposon', 'vector', "<<"]], # Non-organism
+[91, ['unclassified', 'uncultured', 'unidentified']], # Unclassified/Uncultured/Unidentified
+[92, ['environmental', 'sample', 'enrichment', 'culture']], # Environmental sample/Enrichment culture
+[93, ['virus', 'phage']], # Virus
+[94, ['phytoplasma']], # Phytoplasma
+[95, ["symbiont", "endosymbiont", "symbiotic"]], # Endosymbiont
+[96, ["x", "×"]], # Hybrid
+[97, ['lac', 'sal', 'seu']] # Materia medica // complicated input ('massa fermentata' is matched by latin_correction)
+]
+
+screening_table = {j: k[0] for k in reversed(screening_codes) for j in k[1]} # Lower codes take precedence
+
+## Latin correction (latin_correction)
+
+latin_removed = frozenset(["bulbus", "carapax", "caulis", "concha", "cortex", "embryo", "exocarpium",
+"flos", "folium", "fructus", "herba", "lignum", "ligum", "oleum", "ootheca", "pedicellus",
+"pericarpium", "pollen", "radix", "rhizoma", "sanguis", "semen", "strobilus",
+"cum", "et", "radicis", "cornu", "praeparata", "preparata", "succus", "squama",
+"stigma", "oviductus", "acidum", "fel", "stamen", "pulveratum", "resina", "excrementum",
+"periostracum", "plumula", "corium", "dens", "extractum", "liquidum", "fossilia", "gummi",
+"massa", "fermentata", "medulla", "nidus", "penis", "corticis", "folii",
+"nodus", "rhizomatis", "plastrum", "ramulus", "testa", "testis", "exodermis", "germinatus",
+"arillus", "alburnum", "cacumen", "os", "petiolus", "pix", "pulvis", "spina", "receptaculum",
+"leaf", "of", "root", "twig", "the", "family", "from"]) # Parts of materia medica names & filler words
+latin_drop = frozenset(['spp.', 'sp.', "ssp", "spp", "sp", 'var.', 'f.', "L", "L.", "(L.)", "Roxb", "Roxb.", "Fr.", "Fr", "DC", "DC."]) # Dropped as the last word
+
+#### Function definition
+
+def token_correction(string): # Rank/qualifier tokens removed; stat_code = [rank word, uncertainty word, hybrid sign] flags
+	stat_code = [0, 0, 0]
+	tar_temp = []
+	#
+	ssl = string.lower().split()
+	for tc_1 in ssl:
+		tc_code = correction_table.get(tc_1, -1)
+		if tc_code >= 0:
+			stat_code[tc_code] = 1
+		elif '.' in tc_1 or ',' in tc_1:
+			if len(ssl) >= 2:
+				continue
+		elif '<' in tc_1 or '>' in tc_1:
+			tar_temp.append(tc_1.split('>')[0].split('<')[0])
+		else:
+			tar_temp.append(tc_1)
+	#
+	return ' '.join(tar_temp), stat_code
+
+def token_screening(string_list): # Lowest screening code among the tokens, or 0
+	ts_res = 0
+	for ts_1 in string_list:
+		ts_code = screening_table.get(ts_1, 0)
+		if ts_code >= 1 and (ts_res == 0 or ts_code < ts_res):
+			ts_res = ts_code
+	return ts_res
+
+#### END OF SCRIPT
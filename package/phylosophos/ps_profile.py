@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ACCESSORY MODULE - STAGE PROFILE SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import heapq
+import json
+import math
+import os
+import time
+
+#### Preset parameters
+
+profile_stages = ["exact_match", "lowest_taxon", "rule_screening", "intra_generic", "in_depth", "partial_mapping"]
+profile_hist_step = 4 # Latency histogram bins per doubling (bin upper bounds in microseconds: 2^((k+1)/4))
+profile_hist_bins = 128
+profile_slow_max = 50 # Slowest names kept in the report
+
+profile_data = None # Profile of the current analysis (None: profiling off)
+profile_state = None # [name, name start, stage start, open stage, status at stage start, stage times] of the name being mapped
+
+#### Function definition
+
+## Stage profile
+#
+# phylosophos_sequential_mapping() calls profile_begin() once per name, profile_stage() when a stage starts
+# (closing the previous one) and profile_end() when it returns; lev_dist_batch() adds its pair count to the open stage.
+# A stage "hits" when it lowers the mapping status of any reference, and "exits" when the mapping returns right after it.
+# Every call returns at once while profile_data is None, so an analysis without -profile only pays for the calls.
+
+def profile_new(cut_dist=0):
+	pn_res = {"cut_dist": cut_dist, "names": 0, "time": 0.0, "hist": [0 for j in range(profile_hist_bins)], "max": 0.0, "stages": {}, "slow": []}
+	for pn_1 in profile_stages:
+		pn_res["stages"][pn_1] = {"calls": 0, "hits": 0, "exits": 0, "candidates": 0, "time": 0.0, "hist": [0 for j in range(profile_hist_bins)], "max": 0.0}
+	return pn_res
+
+def profile_hist_add(hist, elapsed):
+	if elapsed <= 1e-6:
+		hist[0] += 1
+	else:
+		hist[min(profile_hist_bins-1, int(math.log2(elapsed*1e6)*profile_hist_step))] += 1
+
+def profile_begin(name):
+	global profile_state
+	if profile_data is None:
+		return
+	pb_now = time.perf_counter()
+	profile_state = [name, pb_now, pb_now, "", [], {}]
+
+def profile_stage(stage, map_stat):
+	if profile_state is None:
+		return
+	profile_close(time.perf_counter(), map_stat, False)
+	profile_state[3] = stage
+	profile_state[4] = list(map_stat)
+
+def profile_count(count):
+	if profile_state is None or len(profile_state[3]) == 0:
+		return
+	profile_data["stages"][profile_state[3]]["candidates"] += count
+
+def profile_end(map_stat, early_exit=True):
+	global profile_state
+	if profile_state is None:
+		return
+	pe_now = time.perf_counter()
+	profile_close(pe_now, map_stat, early_exit)
+	pe_time = pe_now-profile_state[1]
+	profile_data["names"] += 1
+	profile_data["time"] += pe_time
+	profile_data["max"] = max(profile_data["max"], pe_time)
+	profile_hist_add(profile_data["hist"], pe_time)
+	pe_slow = (pe_time, profile_state[0], profile_state[5])
+	if len(profile_data["slow"]) < profile_slow_max:
+		heapq.heappush(profile_data["slow"], pe_slow)
+	elif pe_time > profile_data["slow"][0][0]:
+		heapq.heapreplace(profile_data["slow"], pe_slow)
+	profile_state = None
+
+def profile_close(now, map_stat, early_exit): # Closes the open stage of the current name
+	if len(profile_state[3]) == 0:
+		profile_state[2] = now
+		return
+	pc_stage = profile_data["stages"][profile_state[3]]
+	pc_time = now-profile_state[2]
+	pc_stage["calls"] += 1
+	pc_stage["time"] += pc_time
+	pc_stage["max"] = max(pc_stage["max"], pc_time)
+	profile_hist_add(pc_stage["hist"], pc_time)
+	if any(map_stat[j] < profile_state[4][j] for j in range(min(len(map_stat), len(profile_state[4])))):
+		pc_stage["hits"] += 1
+	if early_exit == True:
+		pc_stage["exits"] += 1
+	profile_state[5][profile_state[3]] = pc_time
+	profile_state[2] = now
+	profile_state[3] = ""
+
+## Parallel workers (each worker hands its part over with every chunk)
+
+def profile_take():
+	global profile_data
+	if profile_data is None:
+		return None
+	pt_res = profile_data
+	profile_data = profile_new(pt_res["cut_dist"])
+	return pt_res
+
+def profile_merge(part):
+	if profile_data is None or part is None:
+		return
+	for pm_1 in ["names", "time"]:
+		profile_data[pm_1] += part[pm_1]
+	profile_data["max"] = max(profile_data["max"], part["max"])
+	profile_data["hist"][:] = [profile_data["hist"][j]+part["hist"][j] for j in range(profile_hist_bins)]
+	for pm_2 in profile_stages:
+		pm_stage = profile_data["stages"][pm_2]
+		for pm_3 in ["calls", "hits", "exits", "candidates", "time"]:
+			pm_stage[pm_3] += part["stages"][pm_2][pm_3]
+		pm_stage["max"] = max(pm_stage["max"], part["stages"][pm_2]["max"])
+		pm_stage["hist"][:] = [pm_stage["hist"][j]+part["stages"][pm_2]["hist"][j] for j in range(profile_hist_bins)]
+	for pm_4 in part["slow"]:
+		if len(profile_data["slow"]) < profile_slow_max:
+			heapq.heappush(profile_data["slow"], tuple(pm_4))
+		elif pm_4[0] > profile_data["slow"][0][0]:
+			heapq.heapreplace(profile_data["slow"], tuple(pm_4))
+
+## Report
+
+def profile_percentile(hist, count, max_time, pct): # Upper bound of the histogram bin holding the percentile (seconds)
+	if count == 0:
+		return 0.0
+	pp_rank = math.ceil(count*pct/100.0)
+	pp_sum = 0
+	for pp_1 in range(profile_hist_bins):
+		pp_sum += hist[pp_1]
+		if pp_sum >= pp_rank:
+			return min(max_time, 2**((pp_1+1)/profile_hist_step)/1e6)
+	return max_time
+
+def profile_summary(pr_dict):
+	ps_res = []
+	for ps_1 in profile_stages+["total"]:
+		ps_stage = pr_dict["stages"][ps_1] if ps_1 != "total" else {"calls": pr_dict["names"], "hits": 0, "exits": 0, "candidates": 0,
+		"time": pr_dict["time"], "hist": pr_dict["hist"], "max": pr_dict["max"]}
+		if ps_1 == "total":
+			for ps_2 in ["hits", "exits", "candidates"]:
+				ps_stage[ps_2] = sum([pr_dict["stages"][j][ps_2] for j in profile_stages])
+		ps_res.append({"stage": ps_1, "calls": ps_stage["calls"], "hits": ps_stage["hits"], "early_exits": ps_stage["exits"],
+		"candidates": ps_stage["candidates"], "total_sec": round(ps_stage["time"], 6),
+		"time_share_pct": round(100.0*ps_stage["time"]/pr_dict["time"], 2) if pr_dict["time"] > 0 else 0.0,
+		"mean_ms": round(1000.0*ps_stage["time"]/ps_stage["calls"], 4) if ps_stage["calls"] >= 1 else 0.0,
+		"p50_ms": round(1000.0*profile_percentile(ps_stage["hist"], ps_stage["calls"], ps_stage["max"], 50), 4),
+		"p90_ms": round(1000.0*profile_percentile(ps_stage["hist"], ps_stage["calls"], ps_stage["max"], 90), 4),
+		"p99_ms": round(1000.0*profile_percentile(ps_stage["hist"], ps_stage["calls"], ps_stage["max"], 99), 4),
+		"max_ms": round(1000.0*ps_stage["max"], 4)})
+	return ps_res
+
+def profile_export(export_path): # Writes <result file>_profile.json & <result file>_profile.tsv, then turns profiling off; returns the stage summary
+	global profile_data
+	if profile_data is None:
+		return []
+	pe_summary = profile_summary(profile_data)
+	pe_slow = [{"name": j[1], "total_ms": round(1000.0*j[0], 4), "stage_ms": {k: round(1000.0*j[2][k], 4) for k in j[2]}} for j in sorted(profile_data["slow"], reverse=True)]
+	pe_base = os.path.splitext(export_path)[0]
+	with open(pe_base+"_profile.json", 'w', encoding = 'UTF-8') as res_f:
+		json.dump({"result_file": export_path, "lev_cutoff": profile_data["cut_dist"], "names_mapped": profile_data["names"],
+		"percentile_resolution": "histogram bins of 2^(1/"+str(profile_hist_step)+")", "stages": pe_summary, "slowest_names": pe_slow}, res_f, indent = 1, ensure_ascii = False)
+	with open(pe_base+"_profile.tsv", 'w', encoding = 'UTF-8') as res_f:
+		res_f.write('\t'.join(list(pe_summary[0])) + '\n')
+		for pe_1 in pe_summary:
+			res_f.write('\t'.join([str(pe_1[j]) for j in pe_1]) + '\n')
+	print("## Stage profile:", profile_data["names"], "names mapped //", ', '.join([j["stage"]+" "+str(j["time_share_pct"])+"%" for j in pe_summary[:-1]]))
+	print("## Stage profile exported:", pe_base+"_profile.json")
+	profile_data = None
+	return pe_summary
+
+#### END OF SCRIPT
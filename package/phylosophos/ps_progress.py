@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ACCESSORY MODULE - PROGRESS REPORT SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import os
+import sys
+import time
+
+#### Preset parameters
+
+progress_mode = os.environ.get("PHYLOSOPHOS_PROGRESS", "auto").lower() # auto, console, log, silent
+progress_interval = 0.5 # Seconds between two console updates
+progress_log_interval = 30.0 # Seconds between two log lines (stdout redirected to a file or pipe)
+
+#### Function definition
+
+## Progress report
+#
+# progress_update() is called once per row, so it only compares the clock with the next report time;
+# formatting and printing happen at most once per interval.
+# In "auto" mode, a terminal gets a single self-overwriting line and a redirected stdout gets tab-separated
+# "## progress" lines (label, rows, total, rows/sec, ETA in seconds) every progress_log_interval seconds.
+
+def progress_start(label, total=0, count=0): # total = 0: unknown number of rows (no ETA); count: rows already done (e.g. resumed)
+	ps_mode = progress_mode
+	if ps_mode not in ["console", "log", "silent"]:
+		ps_mode = "console" if sys.stdout.isatty() else "log"
+	ps_now = time.monotonic()
+	ps_interval = progress_interval if ps_mode == "console" else progress_log_interval
+	return {"label": str(label), "total": total, "count": count, "count_start": count, "mode": ps_mode, "interval": ps_interval, "start": ps_now, "next": ps_now+ps_interval}
+
+def progress_update(pr_dict, count, note=""):
+	pr_dict["count"] = count
+	pu_now = time.monotonic()
+	if pu_now < pr_dict["next"]:
+		return
+	pr_dict["next"] = pu_now+pr_dict["interval"]
+	progress_print(pr_dict, pu_now, note)
+
+def progress_end(pr_dict, count=None):
+	if count is not None:
+		pr_dict["count"] = count
+	if pr_dict["mode"] == "console":
+		print(" "*100, end='\r')
+	elif pr_dict["mode"] == "log":
+		progress_print(pr_dict, time.monotonic(), "")
+
+def progress_print(pr_dict, now, note):
+	pp_time = max(now-pr_dict["start"], 1e-9)
+	pp_rate = (pr_dict["count"]-pr_dict["count_start"])/pp_time
+	pp_eta = -1.0
+	if pr_dict["total"] >= 1 and pp_rate > 0:
+		pp_eta = max(pr_dict["total"]-pr_dict["count"], 0)/pp_rate
+	if pr_dict["mode"] == "console":
+		pp_line = pr_dict["label"] + " " + str(pr_dict["count"])
+		if pr_dict["total"] >= 1:
+			pp_line += " / " + str(pr_dict["total"]) + " (" + "%.1f" % (100.0*pr_dict["count"]/pr_dict["total"]) + "%)"
+		pp_line += " // " + "%.0f" % pp_rate + " rows/sec"
+		if pp_eta >= 0:
+			pp_line += " // ETA " + time.strftime("%H:%M:%S", time.gmtime(pp_eta))
+		if len(str(note)) >= 1:
+			pp_line += " // " + str(note)[:40]
+		print(pp_line[:100].ljust(100), end='\r', flush=True)
+	elif pr_dict["mode"] == "log":
+		print('\t'.join(["## progress", pr_dict["label"], str(pr_dict["count"]), str(pr_dict["total"]), "%.1f" % pp_rate, "%.0f" % pp_eta]), flush=True)
+
+#### END OF SCRIPT
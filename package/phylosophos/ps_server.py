@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### ACCESSORY MODULE - MAPPING SERVER SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import collections
+import http.server
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+
+from phylosophos import ps_mapper, ps_profile
+
+#### Preset parameters
+
+server_host = "127.0.0.1" # Local connections only
+server_port = 8765
+server_batch_max = 2048 # Maximum number of names mapped at once
+server_batch_wait = 0.005 # Seconds the batcher waits for more requests after the first one
+server_rate_window = 60.0 # Seconds of the recent throughput window
+server_request_max = 100000 # Maximum number of names per request
+
+#### Function definition
+
+## Mapping server
+#
+# Handler threads put each request ([names, done event, result slot]) into one queue. A single batcher thread takes
+# the first waiting request, collects whatever else arrives within server_batch_wait (up to server_batch_max names),
+# and maps the whole batch with Mapper.map_many(): identical names of concurrent requests are mapped once, and batches
+# are spread over the worker pool when the server runs with -j 2 or more.
+#
+# Endpoints (HTTP on 127.0.0.1, or on a Unix socket with -socket):
+#	GET  /map?name=...          one name
+#	POST /map                   JSON {"names": [...], "input_name": "..."} or one name per line (text)
+#	GET  /metrics               throughput, batch size, queue depth, latency & mapping cache counters
+#	GET  /health
+# Mapping results have the columns of the result file; add ?format=json for {column: value} rows instead of TSV.
+
+def server_metrics_new():
+	return {"start": time.time(), "requests": 0, "names": 0, "batches": 0, "batch_max": 0, "errors": 0, "queue_names": 0, "queue_max": 0,
+	"busy": 0.0, "recent": collections.deque(), "hist": [0 for j in range(ps_profile.profile_hist_bins)], "latency_max": 0.0}
+
+class MappingServer:
+
+	def __init__(self, mapper, batch_max=server_batch_max, batch_wait=server_batch_wait):
+		self.mapper = mapper
+		self.header = mapper.result_header()
+		self.batch_max = batch_max
+		self.batch_wait = batch_wait
+		self.queue = queue.Queue()
+		self.lock = threading.Lock()
+		self.metrics = server_metrics_new()
+		self.listeners = []
+		self.batcher = threading.Thread(target=self.batch_loop, daemon=True)
+		self.batcher.start()
+
+	## Batching
+
+	def submit(self, name_list): # Blocks until the names are mapped; returns the result records
+		sb_req = [name_list, threading.Event(), None]
+		with self.lock:
+			self.metrics["queue_names"] += len(name_list)
+			self.metrics["queue_max"] = max(self.metrics["queue_max"], self.metrics["queue_names"])
+		self.queue.put(sb_req)
+		sb_req[1].wait()
+		if isinstance(sb_req[2], Exception):
+			raise sb_req[2]
+		return sb_req[2]
+
+	def batch_loop(self):
+		while True:
+			bl_batch = [self.queue.get()]
+			if bl_batch[0] is None:
+				return
+			bl_count = len(bl_batch[0][0])
+			bl_end = time.monotonic()+self.batch_wait
+			while bl_count < self.batch_max:
+				try:
+					bl_req = self.queue.get(timeout=max(0.0, bl_end-time.monotonic()))
+				except queue.Empty:
+					break
+				if bl_req is None:
+					self.queue.put(None)
+					break
+				bl_batch.append(bl_req)
+				bl_count += len(bl_req[0])
+			self.batch_map(bl_batch, bl_count)
+
+	def batch_map(self, batch, count):
+		bm_start = time.monotonic()
+		try:
+			bm_res = self.mapper.map_many([j for k in batch for j in k[0]])
+		except Exception as bm_err:
+			bm_res = None
+			for bm_1 in batch:
+				bm_1[2] = bm_err
+		bm_end = time.monotonic()
+		with self.lock:
+			self.metrics["queue_names"] -= count
+			self.metrics["batches"] += 1
+			self.metrics["batch_max"] = max(self.metrics["batch_max"], count)
+			self.metrics["busy"] += bm_end-bm_start
+			if bm_res is not None:
+				self.metrics["names"] += count
+				self.metrics["recent"].append((bm_end, count))
+			else:
+				self.metrics["errors"] += len(batch)
+			while len(self.metrics["recent"]) >= 1 and self.metrics["recent"][0][0] < bm_end-server_rate_window:
+				self.metrics["recent"].popleft()
+		bm_pos = 0
+		for bm_2 in batch:
+			if bm_res is not None:
+				bm_2[2] = bm_res[bm_pos:bm_pos+len(bm_2[0])]
+				bm_pos += len(bm_2[0])
+			bm_2[1].set()
+
+	## Requests
+
+	def request_done(self, elapsed):
+		with self.lock:
+			self.metrics["requests"] += 1
+			self.metrics["latency_max"] = max(self.metrics["latency_max"], elapsed)
+			ps_profile.profile_hist_add(self.metrics["hist"], elapsed)
+
+	def metrics_report(self):
+		with self.lock:
+			mr_now = time.time()
+			mr_mono = time.monotonic()
+			mr_recent = sum([j[1] for j in self.metrics["recent"] if j[0] >= mr_mono-server_rate_window])
+			mr_uptime = mr_now-self.metrics["start"]
+			mr_res = {"uptime_sec": round(mr_uptime, 3), "requests": self.metrics["requests"], "errors": self.metrics["errors"], "names_mapped": self.metrics["names"],
+			"names_per_sec": round(self.metrics["names"]/max(mr_uptime, 1e-9), 2), "names_per_sec_recent": round(mr_recent/min(max(mr_uptime, 1e-9), server_rate_window), 2),
+			"names_per_busy_sec": round(self.metrics["names"]/max(self.metrics["busy"], 1e-9), 2), "batches": self.metrics["batches"],
+			"batch_size_mean": round(self.metrics["names"]/max(self.metrics["batches"], 1), 2), "batch_size_max": self.metrics["batch_max"],
+			"queue_depth_names": self.metrics["queue_names"], "queue_depth_requests": self.queue.qsize(), "queue_depth_max": self.metrics["queue_max"],
+			"latency_p50_ms": round(1000.0*ps_profile.profile_percentile(self.metrics["hist"], self.metrics["requests"], self.metrics["latency_max"], 50), 4),
+			"latency_p99_ms": round(1000.0*ps_profile.profile_percentile(self.metrics["hist"], self.metrics["requests"], self.metrics["latency_max"], 99), 4),
+			"latency_max_ms": round(1000.0*self.metrics["latency_max"], 4)}
+		mr_res["cache"] = self.mapper.cache_stats()
+		return mr_res
+
+	## Listeners
+
+	def listen_tcp(self, host=server_host, port=server_port): # Returns the bound port (port = 0: any free port)
+		lt_server = http.server.ThreadingHTTPServer((host, port), MappingHandler)
+		lt_server.daemon_threads = True
+		lt_server.mapping_server = self
+		self.listen_start(lt_server)
+		return lt_server.server_address[1]
+
+	def listen_unix(self, socket_path):
+		if hasattr(socket, "AF_UNIX") == False:
+			raise OSError("UNIX SOCKETS ARE NOT AVAILABLE ON THIS PLATFORM")
+		if os.path.exists(socket_path):
+			os.remove(socket_path)
+		lu_server = UnixHTTPServer(socket_path, MappingHandler)
+		lu_server.mapping_server = self
+		self.listen_start(lu_server)
+		return socket_path
+
+	def listen_start(self, listener):
+		self.listeners.append(listener)
+		threading.Thread(target=listener.serve_forever, daemon=True).start()
+
+	def close(self):
+		for cl_1 in self.listeners:
+			cl_1.shutdown()
+			cl_1.server_close()
+			if isinstance(cl_1, UnixHTTPServer) and os.path.exists(cl_1.server_address):
+				os.remove(cl_1.server_address)
+		self.listeners = []
+		self.queue.put(None)
+		self.batcher.join()
+		self.mapper.close()
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	daemon_threads = True
+
+	def get_request(self): # BaseHTTPRequestHandler expects a (host, port) client address
+		gr_sock, gr_addr = self.socket.accept()
+		return gr_sock, ("unix", 0)
+
+class MappingHandler(http.server.BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def log_message(self, format, *args): # Requests are counted in /metrics instead of being logged
+		pass
+
+	def send_body(self, code, body, content_type):
+		sb_data = body.encode('UTF-8')
+		self.send_response(code)
+		self.send_header("Content-Type", content_type+"; charset=utf-8")
+		self.send_header("Content-Length", str(len(sb_data)))
+		self.end_headers()
+		self.wfile.write(sb_data)
+
+	def send_json(self, code, obj):
+		self.send_body(code, json.dumps(obj, ensure_ascii = False), "application/json")
+
+	def do_GET(self):
+		dg_url = urllib.parse.urlsplit(self.path)
+		dg_query = urllib.parse.parse_qs(dg_url.query)
+		if dg_url.path == "/health":
+			self.send_json(200, {"status": "ok", "reference": self.server.mapping_server.mapper.ref_type})
+		elif dg_url.path == "/metrics":
+			self.send_json(200, self.server.mapping_server.metrics_report())
+		elif dg_url.path == "/map":
+			if "name" not in dg_query:
+				self.send_json(400, {"error": "NAME PARAMETER IS MISSING"})
+				return
+			self.map_reply(dg_query["name"], dg_query.get("input_name", ["request"])[0], dg_query.get("format", ["tsv"])[0])
+		else:
+			self.send_json(404, {"error": "UNKNOWN PATH: "+dg_url.path})
+
+	def do_POST(self):
+		dp_url = urllib.parse.urlsplit(self.path)
+		dp_query = urllib.parse.parse_qs(dp_url.query)
+		if dp_url.path != "/map":
+			self.send_json(404, {"error": "UNKNOWN PATH: "+dp_url.path})
+			return
+		dp_body = self.rfile.read(int(self.headers.get("Content-Length", "0"))).decode('UTF-8', errors = 'ignore')
+		dp_input = dp_query.get("input_name", ["request"])[0]
+		if "json" in self.headers.get("Content-Type", ""):
+			try:
+				dp_json = json.loads(dp_body)
+				dp_names = [str(j) for j in dp_json["names"]]
+				dp_input = str(dp_json.get("input_name", dp_input))
+			except (ValueError, KeyError, TypeError):
+				self.send_json(400, {"error": "JSON BODY WITH A NAMES LIST IS REQUIRED"})
+				return
+		else:
+			dp_names = [j.rstrip('\r') for j in dp_body.split('\n') if len(j.strip()) >= 1]
+		self.map_reply(dp_names, dp_input, dp_query.get("format", ["tsv"])[0])
+
+	def map_reply(self, name_list, input_name, res_format):
+		mr_server = self.server.mapping_server
+		if len(name_list) > server_request_max:
+			self.send_json(413, {"error": "TOO MANY NAMES IN ONE REQUEST (MAXIMUM: "+str(server_request_max)+")"})
+			return
+		mr_start = time.monotonic()
+		try:
+			mr_res = mr_server.submit(name_list) if len(name_list) >= 1 else []
+		except Exception as mr_err:
+			self.send_json(500, {"error": "MAPPING FAILED: "+repr(mr_err)})
+			return
+		mr_rows = [mr_server.mapper.result_line(input_name, j+1, mr_res[j]) for j in range(len(mr_res))]
+		if res_format == "json":
+			self.send_json(200, {"columns": mr_server.header, "rows": [dict(zip(mr_server.header, j)) for j in mr_rows]})
+		else:
+			self.send_body(200, '\t'.join(mr_server.header) + '\n' + ''.join(['\t'.join(j) + '\n' for j in mr_rows]), "text/tab-separated-values")
+		mr_server.request_done(time.monotonic()-mr_start)
+
+## Main function
+
+def phylosophos_server():
+	ref_path = ""
+	ref_type = "ncbi"
+	cut_dist = 3
+	mc_stat = False
+	job_count = 1
+	cache_size = 0
+	port = server_port
+	socket_path = ""
+	batch_max = server_batch_max
+	batch_wait = server_batch_wait
+	for ps_1 in range(1, len(sys.argv)-1):
+		ps_arg = sys.argv[ps_1].lower()
+		if ps_arg in ["-dir", "-ref_path"]:
+			ref_path = sys.argv[ps_1+1]
+		elif ps_arg in ["-r", "-ref"]:
+			ref_type = sys.argv[ps_1+1].lower()
+		elif ps_arg in ["-l", "-lev", "-cutoff"]:
+			cut_dist = int(sys.argv[ps_1+1])
+		elif ps_arg in ["-m", "-manual", "-curation"]:
+			mc_stat = bool(int(sys.argv[ps_1+1]))
+		elif ps_arg in ["-j", "-jobs"]:
+			job_count = int(sys.argv[ps_1+1])
+		elif ps_arg in ["-cache"]:
+			cache_size = max(0, int(sys.argv[ps_1+1]))
+		elif ps_arg in ["-p", "-port"]:
+			port = int(sys.argv[ps_1+1])
+		elif ps_arg in ["-socket"]:
+			socket_path = sys.argv[ps_1+1]
+		elif ps_arg in ["-batch"]:
+			batch_max = max(1, int(sys.argv[ps_1+1]))
+		elif ps_arg in ["-wait"]:
+			batch_wait = max(0.0, float(sys.argv[ps_1+1])/1000.0)
+	if job_count <= 0:
+		job_count = os.cpu_count() or 1
+	#
+	print("#### PhyloSophos mapping server started ####")
+	try:
+		mapper = ps_mapper.Mapper(ref_path, ref_type, cut_dist, mc_stat, job_count, cache_size)
+	except ValueError as ps_err:
+		print("- ERROR OCCURRED:", ps_err)
+		print("- ANALYSIS TERMINATED")
+		exit()
+	mapper.pool_open()
+	mapping_server = MappingServer(mapper, batch_max, batch_wait)
+	if len(socket_path) >= 1:
+		print("## Listening on Unix socket:", mapping_server.listen_unix(socket_path))
+	else:
+		print("## Listening on: http://"+server_host+":"+str(mapping_server.listen_tcp(server_host, port)))
+	print("## Reference type:", ref_type, "// Levenshtein cutoff:", cut_dist, "// mapping processes:", job_count, "// batch:", batch_max, "names,", "%.1f" % (1000*batch_wait), "ms")
+	try:
+		while True:
+			time.sleep(3600)
+	except KeyboardInterrupt:
+		pass
+	mapping_server.close()
+	print("#### PhyloSophos mapping server stopped ####")
+
+#### END OF SCRIPT
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+################################################################
+####
+#### PROJECT PHYLOSOPHOS: FORMAL VERSION
+####
+#### INITIALIZE MODULE - REFERENCE SNAPSHOT SUBMODULE
+####
+#### ORIGINAL SCRIPT WRITTEN BY MIN HYUNG CHO, PH.D.
+####
+#### BIOINFORMATICS AND MOLECULAR DESIGN RESEARCH CENTER
+####
+################################################################
+
+#### Library import
+
+import gc
+import hashlib
+import numpy
+import os
+import pickle
+import tempfile
+import time
+
+from collections.abc import Mapping
+
+#### Preset parameters
+
+snapshot_dir = "snapshot\\"
+snapshot_version = 5 # Increase whenever the parsed reference layout changes
+node_columns = ["key", "key_row", "offset", "blob", "parent", "broad", "max_rank", "chain", "name_key"]
+node_cache_size = 100000 # Decoded rows kept per node table
+node_clear_age = 3600 # Column files of other builds are removed once they are this old (seconds): a build still being written is never touched
+
+# Broad taxonomic group markers, tested against the lineage string in this order (first match wins)
+broad_type = {
+"|R|": "Archaea", "|B6LM6|": "Bacteria", "|F|": "Fungi", "|N|": "Metazoa", "|P|": "Plant", 
+"|EOL-000000024748|": "Archaea", "|EOL-000000000003|": "Bacteria", "|EOL-000002172573|": "Fungi", "|EOL-000000541397|": "Metazoa", "|EOL-000000097815|": "Plant", 
+"|2|-": "Archaea", "|3|": "Bacteria", "|5|": "Fungi", "|1|": "Metazoa", "|6|": "Plant", 
+"|2157|": "Archaea", "|2|131567|": "Bacteria", "|4751|": "Fungi", "|33208|": "Metazoa", "|33090|": "Plant"
+}
+broad_group = ["(others)", "Archaea", "Bacteria", "Fungi", "Metazoa", "Plant"] # Index = broad column code
+max_rank_unknown = -32768 # Lineage rank codes that are not plain integers (parsed at query time instead)
+
+#### Node table
+
+# Read-only, memory-mapped replacement for the {node_id: [6 fields]} reference dictionary.
+# Every node line is stored once in a shared UTF-8 blob and addressed by row offsets; node IDs are kept
+# as a sorted byte-string column (binary search), parent rows as an integer column.
+# All columns are opened through numpy.memmap, so mapping processes reading the same snapshot share one copy.
+# Column files carry the build ID of their snapshot and are never rewritten: a rebuild writes a new set of files,
+# so tables already mapped by other processes (server, Mapper, concurrent runs) keep reading their own build.
+# The broad group, highest lineage rank code and lineage of every node are precomputed at compile time:
+# "chain" marks nodes whose lineage string is the node ID followed by its parent's (chain-marked) lineage,
+# so the lineage rows are found by following the parent column instead of splitting & looking up every ID.
+# "name_key" holds a 64-bit digest of every lowercase scientific name: the same name gets the same key in every
+# reference, so lineages of different references are compared as integer arrays without decoding any name.
+
+class NodeTable(Mapping):
+
+	def __init__(self, ref_path, ref_type, build):
+		self.ref_path = ref_path
+		self.ref_type = ref_type
+		self.build = build
+		self.cache = {} # Recently decoded rows (lineage nodes are looked up over and over)
+		self.profile_cache = {} # Recently used node profiles (same candidates recur across inputs)
+		for nt_1 in node_columns:
+			setattr(self, nt_1, numpy.load(node_file_name(ref_path, ref_type, build, nt_1), mmap_mode='r'))
+
+	def __reduce__(self): # Worker processes re-open the memory maps instead of copying the table
+		return (NodeTable, (self.ref_path, self.ref_type, self.build))
+
+	def __len__(self):
+		return len(self.key_row)
+
+	def __iter__(self):
+		for nt_1 in range(len(self.key_row)):
+			yield self.row(nt_1)[0]
+
+	def find(self, node_id): # Row index of a node ID, or -1
+		if not isinstance(node_id, bytes):
+			node_id = str(node_id).encode('UTF-8')
+		nt_pos = int(self.key.searchsorted(node_id))
+		if nt_pos < len(self.key) and self.key[nt_pos] == node_id:
+			return int(self.key_row[nt_pos])
+		return -1
+
+	def row(self, row_index):
+		return bytes(self.blob[self.offset[row_index]:self.offset[row_index+1]]).decode('UTF-8').split('\t')
+
+	def __getitem__(self, node_id):
+		if node_id in self.cache:
+			return self.cache[node_id]
+		nt_row = self.find(node_id)
+		if nt_row < 0:
+			raise KeyError(node_id)
+		if len(self.cache) >= node_cache_size:
+			self.cache.clear()
+		self.cache[node_id] = self.row(nt_row)
+		return self.cache[node_id]
+
+	def __contains__(self, node_id):
+		if node_id in self.cache:
+			return True
+		return self.find(node_id) >= 0
+
+	def profile(self, node_id): # [broad group code, highest lineage rank code, lineage rows (node itself first), lineage name keys]
+		if node_id in self.profile_cache:
+			return self.profile_cache[node_id]
+		nt_row = self.find(node_id)
+		if nt_row < 0:
+			raise KeyError(node_id)
+		nt_max = int(self.max_rank[nt_row])
+		if nt_max == max_rank_unknown:
+			nt_max = max([int(j) for j in self[node_id][5].split("|")])
+		nt_lineage = []
+		if self.chain[nt_row] == 1:
+			nt_1 = nt_row
+			while nt_1 >= 0:
+				nt_lineage.append(nt_1)
+				nt_1 = int(self.parent[nt_1])
+		else:
+			for nt_2 in self[node_id][4].split("|"):
+				nt_3 = self.find(nt_2)
+				if nt_3 >= 0:
+					nt_lineage.append(nt_3)
+		if len(self.profile_cache) >= node_cache_size:
+			self.profile_cache.clear()
+		self.profile_cache[node_id] = [int(self.broad[nt_row]), nt_max, nt_lineage, self.name_key[nt_lineage]]
+		return self.profile_cache[node_id]
+
+#### Function definition
+
+def snapshot_source_stat(ref_path, ref_type):
+	ss_res = []
+	for ss_1 in [ref_type+"_node_dict.txt", ref_type+"_genus_dict.txt"]:
+		ss_stat = os.stat(ref_path+ss_1)
+		ss_res.append([ss_1, ss_stat.st_size, ss_stat.st_mtime_ns])
+	return ss_res
+
+def snapshot_file_name(ref_path, ref_type):
+	return ref_path+snapshot_dir+ref_type+"_snapshot.pkl"
+
+def node_file_name(ref_path, ref_type, build, column):
+	return ref_path+snapshot_dir+ref_type+"_node_"+build+"_"+column+".npy"
+
+def node_file_clear(ref_path, ref_type, keep_list): # Removes old column files of other builds (the previous build is kept for processes still opening it)
+	nc_dir, nc_prefix = os.path.split(node_file_name(ref_path, ref_type, "", ""))
+	nc_prefix = nc_prefix[:-len("_.npy")]
+	nc_time = time.time()-node_clear_age
+	for nc_1 in os.listdir(nc_dir):
+		if nc_1.startswith(nc_prefix) and nc_1.endswith(".npy") and nc_1[len(nc_prefix):].split("_")[0] not in keep_list:
+			try:
+				if os.path.getmtime(os.path.join(nc_dir, nc_1)) < nc_time:
+					os.remove(os.path.join(nc_dir, nc_1))
+			except OSError: # Removed by another process, or still open elsewhere (Windows)
+				pass
+
+def name_key(name): # Reference-independent integer key of a scientific name (case-insensitive)
+	return int.from_bytes(hashlib.blake2b(name.lower().encode('UTF-8'), digest_size=8).digest(), 'little')
+
+def node_broad_code(lineage):
+	for nb_1 in broad_type:
+		if nb_1 in lineage:
+			return broad_group.index(broad_type[nb_1])
+	return 0
+
+def node_max_rank(codes):
+	nm_codes = codes.split("|")
+	if all([j.isdigit() for j in nm_codes]) == False:
+		return max_rank_unknown
+	return max([int(j) for j in nm_codes])
+
+def node_table_write(ref_path, ref_type, build, names_dict):
+	nw_keys = list(names_dict.keys())
+	nw_rows = {nw_keys[j]: j for j in range(len(nw_keys))}
+	nw_lines = ['\t'.join(names_dict[j]).encode('UTF-8') for j in nw_keys]
+	nw_col = {}
+	nw_col["offset"] = numpy.zeros(len(nw_lines)+1, dtype=numpy.int64)
+	numpy.cumsum([len(j) for j in nw_lines], out=nw_col["offset"][1:])
+	nw_col["blob"] = numpy.frombuffer(b''.join(nw_lines), dtype=numpy.uint8)
+	nw_col["key"] = numpy.array([j.encode('UTF-8') for j in nw_keys], dtype=bytes)
+	nw_col["key_row"] = numpy.argsort(nw_col["key"], kind='stable').astype(numpy.int32)
+	nw_col["key"] = nw_col["key"][nw_col["key_row"]]
+	nw_parent = []
+	for nw_1 in nw_keys:
+		nw_lineage = names_dict[nw_1][4].split("|", 2)
+		if len(nw_lineage) >= 2 and nw_lineage[1] in nw_rows:
+			nw_parent.append(nw_rows[nw_lineage[1]])
+		else:
+			nw_parent.append(-1)
+	nw_col["parent"] = numpy.array(nw_parent, dtype=numpy.int32)
+	nw_col["broad"] = numpy.array([node_broad_code(names_dict[j][4]) for j in nw_keys], dtype=numpy.int8)
+	nw_col["max_rank"] = numpy.array([node_max_rank(names_dict[j][5]) for j in nw_keys], dtype=numpy.int16)
+	nw_chain = []
+	for nw_3 in range(len(nw_keys)):
+		nw_lineage = names_dict[nw_keys[nw_3]][4]
+		if nw_parent[nw_3] < 0:
+			nw_chain.append(nw_lineage == nw_keys[nw_3])
+		else:
+			nw_chain.append(nw_lineage == nw_keys[nw_3]+"|"+names_dict[nw_keys[nw_parent[nw_3]]][4])
+	nw_col["chain"] = numpy.array(nw_chain, dtype=numpy.int8)
+	nw_step = nw_col["chain"].copy()
+	while True: # A lineage can only be followed through the parent column if every ancestor is chain-marked as well
+		nw_next = nw_step & numpy.where(nw_col["parent"] >= 0, nw_step[nw_col["parent"]], 1).astype(numpy.int8)
+		if numpy.array_equal(nw_next, nw_step):
+			break
+		nw_step = nw_next
+	nw_col["chain"] = nw_step
+	nw_col["name_key"] = numpy.array([name_key(names_dict[j][1]) for j in nw_keys], dtype=numpy.uint64)
+	for nw_2 in node_columns:
+		with open(node_file_name(ref_path, ref_type, build, nw_2), 'wb') as res_f:
+			numpy.save(res_f, nw_col[nw_2])
+
+def snapshot_write(ref_path, ref_type, names_dict, genus_dict, raw_dict): # Returns the written snapshot, as snapshot_load() does
+	os.makedirs(ref_path+snapshot_dir, exist_ok=True)
+	sw_build = os.urandom(6).hex() # Unique per build, so concurrent builders never write the same file
+	node_table_write(ref_path, ref_type, sw_build, names_dict)
+	sw_file = snapshot_file_name(ref_path, ref_type)
+	sw_prev = snapshot_header(ref_path, ref_type)
+	sw_header = {"version": snapshot_version, "ref_type": ref_type, "source": snapshot_source_stat(ref_path, ref_type), "build": sw_build}
+	sw_fd, sw_temp = tempfile.mkstemp(prefix=ref_type+"_snapshot_", suffix=".tmp", dir=ref_path+snapshot_dir)
+	try:
+		with os.fdopen(sw_fd, 'wb') as res_f:
+			pickle.dump(sw_header, res_f, protocol=pickle.HIGHEST_PROTOCOL)
+			pickle.dump([genus_dict, raw_dict], res_f, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(sw_temp, sw_file) # The header is written last: a complete header implies complete node columns
+	except BaseException:
+		if os.path.isfile(sw_temp):
+			os.remove(sw_temp)
+		raise
+	node_file_clear(ref_path, ref_type, [sw_build, sw_prev.get("build", "") if sw_prev is not None else ""])
+	return NodeTable(ref_path, ref_type, sw_build), genus_dict, raw_dict
+
+def snapshot_header(ref_path, ref_type):
+	try:
+		with open(snapshot_file_name(ref_path, ref_type), 'rb') as inp_f:
+			return pickle.load(inp_f)
+	except (OSError, EOFError, pickle.UnpicklingError):
+		return None
+
+def snapshot_fresh(ref_path, ref_type):
+	sf_header = snapshot_header(ref_path, ref_type)
+	if sf_header is None:
+		return False
+	elif sf_header["version"] != snapshot_version:
+		return False
+	return sf_header["source"] == snapshot_source_stat(ref_path, ref_type)
+
+def snapshot_load(ref_path, ref_type): # Returns None if the snapshot is missing or stale
+	gc.disable() # Object tracking slows down unpickling of large containers considerably
+	try:
+		with open(snapshot_file_name(ref_path, ref_type), 'rb') as inp_f: # Header & data of one file (it may be replaced meanwhile)
+			sl_header = pickle.load(inp_f)
+			if sl_header["version"] != snapshot_version or sl_header["source"] != snapshot_source_stat(ref_path, ref_type):
+				return None
+			sl_genus, sl_raw = pickle.load(inp_f)
+		return NodeTable(ref_path, ref_type, sl_header["build"]), sl_genus, sl_raw
+	except (OSError, EOFError, pickle.UnpicklingError): # Missing file, or column files of a build already cleared
+		return None
+	finally:
+		gc.enable()
+
+#### END OF SCRIPT
@@ -14,6 +14,7 @@
 
 #### Library import
 
+import io
 import numpy
 import os
 import ssl
@@ -23,10 +24,82 @@ import zipfile
 
 from urllib import request
 
+from phylosophos import ps_progress
+
 ssl._create_default_https_context = ssl._create_unverified_context
 
 #### Function definition
 
+## Lineage construction
+#
+# lineage_step(node_id) returns [segment IDs, segment rank codes, next node ID (None: end of the walk)].
+# Every node's lineage is its own segment followed by the (memoized) lineage of the next node,
+# so the walk up the parent chain stops at the first ancestor whose lineage is already known.
+
+def lineage_memo(node_id, lineage_step, lineage_dict): # Returns [ID lineage string, rank code string, maximum rank code]
+	lm_stack = []
+	lm_seen = set()
+	lm_id = node_id
+	while lm_id is not None and lm_id not in lineage_dict:
+		if lm_id in lm_seen:
+			raise ValueError("circular lineage found at node " + str(lm_id))
+		lm_seen.add(lm_id)
+		lm_stack.append([lm_id, lineage_step(lm_id)])
+		lm_id = lm_stack[-1][1][2]
+	for lm_1 in reversed(lm_stack):
+		lm_ids = '|'.join(lm_1[1][0])
+		lm_codes = '|'.join([str(j) for j in lm_1[1][1]])
+		lm_max = max(lm_1[1][1])
+		if lm_1[1][2] is not None:
+			lm_next = lineage_dict[lm_1[1][2]]
+			lm_ids += '|' + lm_next[0]
+			lm_codes += '|' + lm_next[1]
+			lm_max = max(lm_max, lm_next[2])
+		lineage_dict[lm_1[0]] = [lm_ids, lm_codes, lm_max]
+	return lineage_dict[node_id]
+
+## Archive member streaming
+#
+# Reference dumps are parsed straight out of the downloaded archive, without extraction to disk.
+# Tar archives are read as one forward stream (wanted members are yielded in archive order, and each must be
+# read to the end before the next one is reached); zip members are opened in place.
+
+class ArchiveStream(io.RawIOBase): # Forward-only view of a tar stream member (tar stream members cannot be wrapped directly)
+
+	def __init__(self, member_f):
+		self.member_f = member_f
+
+	def readable(self):
+		return True
+
+	def readinto(self, buffer):
+		as_data = self.member_f.read(len(buffer))
+		buffer[:len(as_data)] = as_data
+		return len(as_data)
+
+def archive_member_lines(archive_path, member_names, encoding=None, errors=None): # Yields [member name, text line iterator]
+	am_found = set()
+	if zipfile.is_zipfile(archive_path):
+		with zipfile.ZipFile(archive_path) as am_zip:
+			for am_1 in am_zip.infolist():
+				am_name = am_1.filename.split("/")[-1]
+				if am_name in member_names and am_name not in am_found:
+					am_found.add(am_name)
+					with am_zip.open(am_1) as am_f:
+						yield am_name, io.TextIOWrapper(am_f, encoding=encoding, errors=errors)
+	else:
+		with tarfile.open(archive_path, "r|*") as am_tar:
+			for am_1 in am_tar:
+				am_name = am_1.name.split("/")[-1]
+				if am_1.isfile() and am_name in member_names and am_name not in am_found:
+					am_found.add(am_name)
+					yield am_name, io.TextIOWrapper(io.BufferedReader(ArchiveStream(am_tar.extractfile(am_1)), 1048576), encoding=encoding, errors=errors)
+	for am_2 in member_names:
+		if am_2 not in am_found:
+			raise FileNotFoundError(am_2 + " not found in " + archive_path)
+
+## Reference dataset update
+
 def ncbi_tax_update_new(ustat, fdir, rdir):
 
 	# Download step
@@ -44,61 +117,50 @@ def ncbi_tax_update_new(ustat, fdir, rdir):
 		else:
 			print("## NCBI taxonomy file found in local system")
 
-	# Unzip & processing step
-
-	try:
-		os.makedirs(fdir+"ncbi_taxdump")
-	except:
-		pass
-	ncbi_tar = tarfile.open(fdir+tar_ncbi_file, "r:gz")
-	ncbi_tar.extractall(path=fdir+"ncbi_taxdump\\")
-	ncbi_tar.close()
-	print("## NCBI taxonomy file unzip successful")
-
-	# Extraction step
+	# Extraction step (names.dmp & nodes.dmp are read straight from the archive)
 
 	taxid_names_dict = {}
-	with open(fdir+"ncbi_taxdump\\names.dmp") as inp_f:
-		for line in inp_f:
-			ssl = [j.replace('\t', '') for j in line.rstrip('\n').split('|')]
-			if ssl[0] not in taxid_names_dict:
-				taxid_names_dict[ssl[0]] = ["", []]
-			#
-			if ssl[3] == "scientific name":
-				if taxid_names_dict[ssl[0]][0] == "":
-					taxid_names_dict[ssl[0]][0] = ssl[1]
-			elif ssl[3] in ["acronym", "blast name", "common name", "equivalent name", "genbank common name", "genbank synonym", "synonym"]:
-					taxid_names_dict[ssl[0]][1].append(ssl[1])
-	print("## NCBI taxonomy name extraction completed", len(taxid_names_dict))
 	taxid_parent_dict = {}
 	taxid_level_code = {"superkingdom":1, "kingdom":2, "phylum":3, "class":4, "order":5, "family":6, "genus":7, "species":8}
-	with open(fdir+"ncbi_taxdump\\nodes.dmp") as inp_f:
-		for line in inp_f:
-			ssl = [j.replace('\t', '') for j in line.rstrip('\n').split('|')]
-			if ssl[2] in taxid_level_code:
-				taxid_parent_dict[ssl[0]] = [ssl[1], ssl[2], taxid_level_code[ssl[2]]]
-			else:
-				taxid_parent_dict[ssl[0]] = [ssl[1], ssl[2], 0]
-	print("## NCBI taxonomy node extraction completed", len(taxid_parent_dict))
+	for tar_member, inp_f in archive_member_lines(fdir+tar_ncbi_file, ["names.dmp", "nodes.dmp"]):
+		if tar_member == "names.dmp":
+			for line in inp_f:
+				ssl = [j.replace('\t', '') for j in line.rstrip('\n').split('|')]
+				if ssl[0] not in taxid_names_dict:
+					taxid_names_dict[ssl[0]] = ["", []]
+				#
+				if ssl[3] == "scientific name":
+					if taxid_names_dict[ssl[0]][0] == "":
+						taxid_names_dict[ssl[0]][0] = ssl[1]
+				elif ssl[3] in ["acronym", "blast name", "common name", "equivalent name", "genbank common name", "genbank synonym", "synonym"]:
+						taxid_names_dict[ssl[0]][1].append(ssl[1])
+			print("## NCBI taxonomy name extraction completed", len(taxid_names_dict))
+		else:
+			for line in inp_f:
+				ssl = [j.replace('\t', '') for j in line.rstrip('\n').split('|')]
+				if ssl[2] in taxid_level_code:
+					taxid_parent_dict[ssl[0]] = [ssl[1], ssl[2], taxid_level_code[ssl[2]]]
+				else:
+					taxid_parent_dict[ssl[0]] = [ssl[1], ssl[2], 0]
+			print("## NCBI taxonomy node extraction completed", len(taxid_parent_dict))
 
 	# Export step #1: address mapping
 
+	def taxid_step(node_id): # The walk ends at the root node "1" (rank code 0)
+		if taxid_parent_dict[node_id][0] == "1":
+			return [[node_id, "1"], [taxid_parent_dict[node_id][2], 0], None]
+		return [[node_id], [taxid_parent_dict[node_id][2]], taxid_parent_dict[node_id][0]]
+
 	taxid_list = list(taxid_parent_dict.keys())
 	taxid_res = []
 	genus_dict = {}
+	lineage_dict = {}
+	taxid_progress = ps_progress.progress_start("## NCBI taxonomy lineage", len(taxid_list))
 
 	for i_1 in range(len(taxid_list)):
-		taxid_code = [[taxid_list[i_1]], [taxid_parent_dict[taxid_list[i_1]][2]]]
-		t_det = 0
-		while t_det == 0:
-			tar_parent = taxid_parent_dict[taxid_code[0][-1]]
-			taxid_code[0].append(tar_parent[0])
-			taxid_code[1].append(tar_parent[2])
-			if tar_parent[0] == "1":
-				t_det += 1
-		taxid_code[1].append(0)
-		taxid_res.append([taxid_list[i_1], taxid_names_dict[taxid_list[i_1]][0], '|'.join(taxid_names_dict[taxid_list[i_1]][1]), taxid_parent_dict[taxid_list[i_1]][1], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][1:]])])
-		if max(taxid_code[1]) >= 7:
+		taxid_code = lineage_memo(taxid_list[i_1], taxid_step, lineage_dict)
+		taxid_res.append([taxid_list[i_1], taxid_names_dict[taxid_list[i_1]][0], '|'.join(taxid_names_dict[taxid_list[i_1]][1]), taxid_parent_dict[taxid_list[i_1]][1], taxid_code[0], taxid_code[1]])
+		if taxid_code[2] >= 7:
 			taxid_parse = [j.lower() for j in taxid_names_dict[taxid_list[i_1]][0].split()]
 			if taxid_parse[0] not in genus_dict:
 				genus_dict[taxid_parse[0]] = []
@@ -109,8 +171,9 @@ def ncbi_tax_update_new(ustat, fdir, rdir):
 					if taxid_px[0] not in genus_dict:
 						genus_dict[taxid_px[0]] = []
 					genus_dict[taxid_px[0]].append(taxid_list[i_1])				
-		print(i_1, taxid_list[i_1], taxid_names_dict[taxid_list[i_1]][0][0:min(20, len(taxid_names_dict[taxid_list[i_1]][0]))], "                        ", end='\r')
+		ps_progress.progress_update(taxid_progress, i_1+1, taxid_names_dict[taxid_list[i_1]][0])
 
+	ps_progress.progress_end(taxid_progress)
 	print("## NCBI taxonomy parent mapping completed // file exported")
 
 	with open(rdir+"ncbi_node_dict.txt", 'w') as res_f:
@@ -149,24 +212,26 @@ def col_tax_update_new(ustat, fdir, rdir, f_vname):
 		else:
 			print("## CoL taxonomy file found in local system")
 
-	# Unzip & processing step
-
-	try:
-		os.makedirs(fdir+"col_taxdump")
-	except:
-		pass
-	col_tar = zipfile.ZipFile(fdir+tar_col_file)
-	col_tar.extractall(path=fdir+"col_taxdump\\")
-	col_tar.close()
-	print("## CoL taxonomy file unzip successful")
-
-	# Extraction step
+	# Extraction step (single pass over Taxon.tsv, read straight from the archive)
 
 	taxid_dict = {}
+	taxid_synonyms = {} # Synonym rows read before their accepted taxon
 	taxid_level_code = {"domain":1, "kingdom":2, "phylum":3, "class":4, "order":5, "family":6, "genus":7, "species":8}
 	tax_types = []
 
-	with open(fdir+"col_taxdump\\Taxon.tsv", errors="ignore") as inp_f:
+	def taxid_synonym_add(ssl):
+		if len(ssl[11]) == 0:
+			taxid_dict[ssl[2]][4].append(ssl[8])
+		else:
+			if len(ssl[12]) >= 1 and ssl[7] == "subgenus":
+				t_temp = [ssl[12]]
+				taxid_dict[ssl[2]][4] += ' '.join([j for j in t_temp if len(j) >= 1])
+			else:
+				t_temp = [ssl[11]]
+				t_temp.extend(ssl[13:16])
+				taxid_dict[ssl[2]][4].append(' '.join([j for j in t_temp if len(j) >= 1]))
+
+	for tar_member, inp_f in archive_member_lines(fdir+tar_col_file, ["Taxon.tsv"], errors="ignore"):
 		inp_f.readline()
 		for line in inp_f:
 			ssl = line.rstrip('\n').split('\t')
@@ -177,6 +242,8 @@ def col_tax_update_new(ustat, fdir, rdir, f_vname):
 			#
 			if ssl[0] not in taxid_dict and ssl[6] in ["accepted" , "provisionally accepted"]:
 				taxid_dict[ssl[0]] = [ssl[0], ssl[1], clade_code, "", [], ssl[7]]
+				for t_syn in taxid_synonyms.pop(ssl[0], []):
+					taxid_synonym_add(t_syn)
 			#
 			if ssl[6] in ["accepted" , "provisionally accepted"]:
 				if len(ssl[11]) == 0:
@@ -189,53 +256,39 @@ def col_tax_update_new(ustat, fdir, rdir, f_vname):
 						t_temp = [ssl[11]]
 						t_temp.extend(ssl[13:16])
 						taxid_dict[ssl[0]][3] += ' '.join([j for j in t_temp if len(j) >= 1])
-	print("## CoL taxonomic accepted data extraction completed", len(taxid_dict))
-	with open(fdir+"col_taxdump\\Taxon.tsv", errors="ignore") as inp_f:
-		inp_f.readline()
-		for line in inp_f:
-			ssl = line.rstrip('\n').split('\t')
-			if ssl[6] == "synonym":
+			elif ssl[6] == "synonym":
 				if ssl[2] in taxid_dict:
-					if len(ssl[11]) == 0:
-						taxid_dict[ssl[2]][4].append(ssl[8])
-					else:
-						if len(ssl[12]) >= 1 and ssl[7] == "subgenus":
-							t_temp = [ssl[12]]
-							taxid_dict[ssl[2]][4] += ' '.join([j for j in t_temp if len(j) >= 1])
-						else:
-							t_temp = [ssl[11]]
-							t_temp.extend(ssl[13:16])
-							taxid_dict[ssl[2]][4].append(' '.join([j for j in t_temp if len(j) >= 1]))
-	print("## CoL taxonomic information extraction completed", len(taxid_dict))
+					taxid_synonym_add(ssl)
+				else:
+					if ssl[2] not in taxid_synonyms:
+						taxid_synonyms[ssl[2]] = []
+					taxid_synonyms[ssl[2]].append(ssl)
+	print("## CoL taxonomic information extraction completed", len(taxid_dict), "// unresolved synonyms:", sum([len(j) for j in taxid_synonyms.values()]))
 
 	# Export step
 	
+	def taxid_step(node_id): # The walk ends at a parentless node (rank code set to 1)
+		if len(taxid_dict[node_id][1]) < 1:
+			return [[node_id], [1], None]
+		return [[node_id], [taxid_dict[node_id][2]], taxid_dict[node_id][1]]
+
 	taxid_list = list(taxid_dict.keys())
 	taxid_res = []
 	genus_dict = {}
+	lineage_dict = {}
+	taxid_progress = ps_progress.progress_start("## CoL taxonomy lineage", len(taxid_list))
 
 	for i_1 in range(len(taxid_list)):
-		taxid_code = [[taxid_list[i_1]], [taxid_dict[taxid_list[i_1]][2]]]
-		t_det = 0
-		while t_det < 1:
-			if len(taxid_dict[taxid_code[0][-1]][1]) < 1:
-				t_det += 1
-				break
-			target_tax = taxid_dict[taxid_dict[taxid_code[0][-1]][1]]
-			taxid_code[0].append(target_tax[0])
-			taxid_code[1].append(target_tax[2])
-			if len(target_tax[1]) < 1:
-				t_det += 1
-		taxid_code[1][-1] = 1
+		taxid_code = lineage_memo(taxid_list[i_1], taxid_step, lineage_dict)
 		#
-		if max(taxid_code[1]) <= 7:
-			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1]])])
+		if taxid_code[2] <= 7:
+			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 		elif taxid_dict[taxid_list[i_1]][5] == "species" and " " in taxid_dict[taxid_list[i_1]][3] and taxid_dict[taxid_list[i_1]][3][0].isupper() == True:
-			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0] + " " + taxid_dict[taxid_list[i_1]][3].split()[1], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1]])])
+			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0] + " " + taxid_dict[taxid_list[i_1]][3].split()[1], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 		else:
-			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1]])])
+			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 		#
-		if max(taxid_code[1]) >= 7:
+		if taxid_code[2] >= 7:
 			taxid_parse = [j.lower() for j in taxid_dict[taxid_list[i_1]][3].split()]
 			if taxid_parse[0] not in genus_dict:
 				genus_dict[taxid_parse[0]] = []
@@ -247,8 +300,9 @@ def col_tax_update_new(ustat, fdir, rdir, f_vname):
 						if taxid_px[0] not in genus_dict:
 							genus_dict[taxid_px[0]] = []
 						genus_dict[taxid_px[0]].append(taxid_list[i_1])
-		print(i_1, taxid_list[i_1], taxid_dict[taxid_list[i_1]][3][0:min(20, len(taxid_dict[taxid_list[i_1]][3]))], "                        ", end='\r')
+		ps_progress.progress_update(taxid_progress, i_1+1, taxid_dict[taxid_list[i_1]][3])
 
+	ps_progress.progress_end(taxid_progress)
 	print("## CoL taxonomy parent mapping completed // file exported")
 
 	with open(rdir+"col_node_dict.txt", 'w') as res_f:
@@ -287,29 +341,18 @@ def eol_tax_update_new(ustat, fdir, rdir, f_vname):
 		else:
 			print("## EoL taxonomy file found in local system")
 
-	# Unzip & processing step
-
-	try:
-		os.makedirs(fdir+"eol_taxdump")
-	except:
-		pass
-	
-	if tar_eol_file[-3:] == ".gz":
-		eol_tar = tarfile.open(fdir+tar_eol_file, "r:gz")
-		eol_tar.extractall(path=fdir+"eol_taxdump\\")
-		eol_tar.close()
-	elif tar_eol_file[-3:] == "zip":
-		with zipfile.ZipFile(fdir+tar_eol_file) as zip_ref:
-			zip_ref.extractall(path=fdir+"eol_taxdump\\")
-
-	print("## EoL taxonomy file unzip successful")
-
-	# Extraction step
+	# Extraction step (taxon.tab is read straight from the archive)
 
 	taxid_dict = {}
+	taxid_synonyms = {} # Synonym rows read before their accepted taxon
 	taxid_level_code = {"domain":1, "kingdom":2, "phylum":3, "class":4, "order":5, "family":6, "genus":7, "species":8}
 
-	with open(fdir+"eol_taxdump\\taxon.tab", errors="ignore") as inp_f:
+	def taxid_synonym_add(ssl):
+		taxid_dict[ssl[3]][4].append(ssl[5])
+		if ssl[9] != ssl[5] and ssl[9] != taxid_dict[ssl[3]][3] and len(ssl[9]) >= 1:
+			taxid_dict[ssl[3]][4].append(ssl[9])
+
+	for tar_member, inp_f in archive_member_lines(fdir+tar_eol_file, ["taxon.tab"], errors="ignore"):
 		inp_f.readline()
 		for line in inp_f:
 			ssl = line.rstrip('\n').split('\t')
@@ -329,47 +372,48 @@ def eol_tax_update_new(ustat, fdir, rdir, f_vname):
 						taxid_dict[tar_code][4].append(ssl[5])
 				else:
 					taxid_dict[tar_code][3] = ssl[5]
+				for t_syn in taxid_synonyms.pop(tar_code, []):
+					taxid_synonym_add(t_syn)
 			elif ssl[7] in ["synonym", "ambiguous synonym"]:
-				taxid_dict[ssl[3]][4].append(ssl[5])
-				if ssl[9] != ssl[5] and ssl[9] != taxid_dict[ssl[3]][3] and len(ssl[9]) >= 1:
-					taxid_dict[ssl[3]][4].append(ssl[9])
-	print("## EoL taxonomic information extraction completed", len(taxid_dict))
+				if ssl[3] in taxid_dict:
+					taxid_synonym_add(ssl)
+				else:
+					if ssl[3] not in taxid_synonyms:
+						taxid_synonyms[ssl[3]] = []
+					taxid_synonyms[ssl[3]].append(ssl)
+	print("## EoL taxonomic information extraction completed", len(taxid_dict), "// unresolved synonyms:", sum([len(j) for j in taxid_synonyms.values()]))
 
 	# Export step
 	
+	def taxid_step(node_id): # The walk ends at a parentless node
+		if len(taxid_dict[node_id][1]) < 1:
+			return [[node_id], [taxid_dict[node_id][2]], None]
+		return [[node_id], [taxid_dict[node_id][2]], taxid_dict[node_id][1]]
+
 	taxid_list = list(taxid_dict.keys())
 	taxid_res = []
 	genus_dict = {}
+	lineage_dict = {}
+	taxid_progress = ps_progress.progress_start("## EoL taxonomy lineage", len(taxid_list))
 
 	for i_1 in range(len(taxid_list)):
-		taxid_code = [[taxid_list[i_1]], [taxid_dict[taxid_list[i_1]][2]]]
-		t_det = 0
-		while t_det < 1:
-			if len(taxid_dict[taxid_code[0][-1]][1]) < 1:
-				t_det += 1
-				break
-			target_tax = taxid_dict[taxid_dict[taxid_code[0][-1]][1]]
-			taxid_code[0].append(target_tax[0])
-			taxid_code[1].append(target_tax[2])
-			if len(target_tax[1]) < 1:
-				t_det += 1
-		taxid_code[1].append(0)
-		if max(taxid_code[1]) <= 7:
+		taxid_code = lineage_memo(taxid_list[i_1], taxid_step, lineage_dict)
+		if taxid_code[2] <= 7:
 			if "'" in taxid_dict[taxid_list[i_1]][3]:
-				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 			elif ' group' in taxid_dict[taxid_list[i_1]][3] or ' subgroup' in taxid_dict[taxid_list[i_1]][3] or ' clade' in taxid_dict[taxid_list[i_1]][3] or ' complex' in taxid_dict[taxid_list[i_1]][3] or ' cluster' in taxid_dict[taxid_list[i_1]][3] or ' subcluster' in taxid_dict[taxid_list[i_1]][3]:
-				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 			elif 'Candidatus ' in taxid_dict[taxid_list[i_1]][3] or 'unclassified ' in taxid_dict[taxid_list[i_1]][3]:
-				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 			elif ' subgen. ' in taxid_dict[taxid_list[i_1]][3]:
-				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[-1], '|'.join(taxid_dict[taxid_list[i_1]][4])+"|"+taxid_dict[taxid_list[i_1]][3], taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[-1], '|'.join(taxid_dict[taxid_list[i_1]][4])+"|"+taxid_dict[taxid_list[i_1]][3], taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 			else:
-				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+				taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 		#elif taxid_dict[taxid_list[i_1]][5] == "species" and " " in taxid_dict[taxid_list[i_1]][3] and taxid_dict[taxid_list[i_1]][3][0].isupper() == True:
-			#taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0] + " " + taxid_dict[taxid_list[i_1]][3].split()[1], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
+			#taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3].split()[0] + " " + taxid_dict[taxid_list[i_1]][3].split()[1], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
 		else:
-			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], '|'.join(taxid_code[0]), '|'.join([str(j) for j in taxid_code[1][:-1]])])
-		if max(taxid_code[1]) >= 7:
+			taxid_res.append([taxid_list[i_1], taxid_dict[taxid_list[i_1]][3], '|'.join(taxid_dict[taxid_list[i_1]][4]), taxid_dict[taxid_list[i_1]][5], taxid_code[0], taxid_code[1]])
+		if taxid_code[2] >= 7:
 			taxid_parse = [j.lower() for j in taxid_dict[taxid_list[i_1]][3].split()]
 			if taxid_parse[0] not in genus_dict:
 				genus_dict[taxid_parse[0]] = []
@@ -380,8 +424,9 @@ def eol_tax_update_new(ustat, fdir, rdir, f_vname):
 					if taxid_px[0] not in genus_dict:
 						genus_dict[taxid_px[0]] = []
 					genus_dict[taxid_px[0]].append(taxid_list[i_1])
-		print(i_1, taxid_list[i_1], taxid_dict[taxid_list[i_1]][3][0:min(20, len(taxid_dict[taxid_list[i_1]][3]))], "                        ", end='\r')
+		ps_progress.progress_update(taxid_progress, i_1+1, taxid_dict[taxid_list[i_1]][3])
 
+	ps_progress.progress_end(taxid_progress)
 	print("## EoL taxonomy parent mapping completed // file exported")
 
 	with open(rdir+"eol_node_dict.txt", 'w') as res_f:
@@ -0,0 +1,6 @@
+#!/usr/bin/env python
+
+from phylosophos.ps_benchmark import phylosophos_benchmark
+
+phylosophos_benchmark()
+
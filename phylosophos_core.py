@@ -2,5 +2,6 @@
 
 from phylosophos.phylosophos_core import phylosophos
 
-phylosophos()
+if __name__ == "__main__": # Required for spawned mapping processes (-j option on Windows)
+	phylosophos()
 
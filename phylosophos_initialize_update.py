@@ -2,5 +2,5 @@
 
 from phylosophos import phylosophos_initialize_update
 
-phylosophos_initialize_update.initialize_update()
-
+if __name__ == "__main__": # Required for spawned reference builders (parallel update on Windows)
+	phylosophos_initialize_update.initialize_update()
@@ -0,0 +1,6 @@
+#!/usr/bin/env python
+
+from phylosophos.ps_server import phylosophos_server
+
+if __name__ == "__main__": # Required for spawned mapping processes (-j option on Windows)
+	phylosophos_server()